@@ -0,0 +1,88 @@
+"""
+Non-interactive CheckMyGrade commands: run one operation and exit.
+    
+    python cli.py student get EMAIL
+    python cli.py course report COURSE_ID
+    python cli.py stats
+    python cli.py import FILE [--password DEFAULT]
+
+The application and its models are imported only once a command runs, and
+tables load lazily, so a command reads only the tables it needs. Exit
+status is 0 on success and 1 if the student or course is not found or an
+import rejected rows.
+"""
+import argparse
+import sys
+import time
+
+def build_parser():
+    """Argument parser with one subcommand per operation"""
+    parser = argparse.ArgumentParser(prog='checkmygrade', description=__doc__.split('\n')[1])
+    parser.add_argument('--data-dir', default='data', help="directory with the data files")
+    parser.add_argument('--storage', choices=('csv', 'mmap', 'sqlite'), default='csv')
+    parser.add_argument('--journal', action='store_true', help="replay and write the journal")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes for parsing a large students.csv and hashing imported passwords")
+    parser.add_argument('--time', action='store_true', help="print wall-clock time to stderr")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    student = commands.add_parser('student', help="student lookups")
+    student_commands = student.add_subparsers(dest='action', required=True)
+    get = student_commands.add_parser('get', help="show one student's record, average and GPA")
+    get.add_argument('email')
+    get.set_defaults(run=run_student_get)
+    
+    course = commands.add_parser('course', help="course reports")
+    course_commands = course.add_subparsers(dest='action', required=True)
+    report = course_commands.add_parser('report', help="show a course and its enrolled students")
+    report.add_argument('course_id')
+    report.set_defaults(run=run_course_report)
+    
+    stats = commands.add_parser('stats', help="marks statistics over all students")
+    stats.set_defaults(run=run_stats)
+    
+    bulk_import = commands.add_parser('import', help="bulk import students from CSV or JSONL")
+    bulk_import.add_argument('file')
+    bulk_import.add_argument('--password', help="password for rows without one")
+    bulk_import.set_defaults(run=run_import)
+    return parser
+
+def run_student_get(app, args):
+    """student get EMAIL: reads one student without loading the table"""
+    return 0 if app.print_student_report(args.email) else 1
+
+def run_course_report(app, args):
+    """course report COURSE_ID: loads courses and streams students once"""
+    return 0 if app.print_course_report(args.course_id) else 1
+
+def run_stats(app, args):
+    """stats: marks statistics from one pass over the students"""
+    app.display_student_statistics()
+    return 0
+
+def run_import(app, args):
+    """import FILE: bulk import with one save at the end"""
+    report = app.import_students(args.file, args.password, args.workers)
+    return 0 if report is not None and not report['rejected'] else 1
+
+def main(argv=None):
+    """Run one command; returns the exit status"""
+    start_time = time.perf_counter()
+    args = build_parser().parse_args(argv)
+    
+    # Deferred so --help and argument errors never load the application
+    from main import CheckMyGradeApp
+    app = CheckMyGradeApp(args.data_dir, journaled=args.journal, storage=args.storage,
+                          workers=args.workers)
+    try:
+        status = args.run(app, args)
+    finally:
+        app.close()
+    
+    if args.time:
+        print(f"{args.command}: {time.perf_counter() - start_time:.3f} s "
+              f"(tables loaded: {', '.join(sorted(app.loaded_tables)) or 'none'})", file=sys.stderr)
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
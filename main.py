@@ -1,44 +1,446 @@
+import csv
+import os
+import sys
 import time
-import statistics
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, nullcontext
 from models.student import Student
 from models.course import Course
 from models.professor import Professor
 from models.login_user import LoginUser
-from models.grades import Grades
+from models.grades import Grades, GradeScale
 from utils.csv_handler import CSVHandler
+from utils.repository import Repository, SynchronizedRepository
+from utils.rw_lock import ReadWriteLock
+from utils.journal import Journal
+from utils.snapshot import SnapshotStore
+from utils.gc_pause import paused_gc
+from utils.mmap_store import MmapStudentStore
+from utils.sqlite_handler import SQLiteHandler
+from utils.save_scheduler import SaveScheduler
+from utils.enrollment_index import EnrollmentIndex
+from utils.trigram_index import TrigramIndex
+from utils.prefix_index import PrefixIndex
+from utils.sorted_view import SortedView
+from utils.marks_histogram import Histogram, MarksHistogram
+from utils.bulk_import import iter_import_rows, iter_marks_rows, student_from_row, hash_passwords
 
 class CheckMyGradeApp:
     """Main application class for CheckMyGrade system"""
     
-    def __init__(self):
-        self.csv_handler = CSVHandler()
-        self.students = []
-        self.courses = []
-        self.professors = []
-        self.users = []
+    # On close, fold the journal back into the CSV files once it holds this many records
+    JOURNAL_COMPACT_THRESHOLD = 1000
+    
+    TABLES = ('students', 'courses', 'professors', 'users')
+    
+    TABLE_KEYS = {
+        'students': 'email_address',
+        'courses': 'course_id',
+        'professors': 'professor_id',
+        'users': 'email_id',
+    }
+    
+    ROW_BUILDERS = {
+        'students': CSVHandler.row_to_student,
+        'courses': CSVHandler.row_to_course,
+        'professors': CSVHandler.row_to_professor,
+        'users': CSVHandler.row_to_user,
+    }
+    
+    STORAGE_BACKENDS = ('csv', 'mmap', 'sqlite')
+    
+    def __init__(self, data_dir='data', journaled=False, save_delay=0.0, save_batch=1,
+                 storage='csv', lazy=True, workers=1, thread_safe=False):
+        if storage not in self.STORAGE_BACKENDS:
+            raise ValueError(f"Unknown storage backend: {storage}")
+        # thread_safe guards every table and index with one reader-writer lock.
+        # A save window commits on the scheduler's timer thread, which must not
+        # read the tables while this thread is changing them, so it needs one too.
+        self.rwlock = ReadWriteLock() if thread_safe or save_delay else None
+        self.csv_handler = CSVHandler(data_dir, workers)
+        # 'mmap' keeps students in a fixed-width students.dat updated in place
+        self.student_store = MmapStudentStore(data_dir) if storage == 'mmap' else None
+        # 'sqlite' keeps every table in checkmygrade.db and saves changed rows only
+        self.database = SQLiteHandler(data_dir) if storage == 'sqlite' else None
+        self.journal = None
+        if journaled:
+            # Appends are fsynced once per group commit, not per record
+            self.journal = Journal(os.path.join(self.csv_handler.data_dir, 'journal.log'),
+                                   sync=False)
+        self.scheduler = SaveScheduler(self.commit_changes, save_delay, save_batch)
+        self.snapshots = SnapshotStore(data_dir)
+        self.csv_files = {
+            'students': self.csv_handler.students_file,
+            'courses': self.csv_handler.courses_file,
+            'professors': self.csv_handler.professors_file,
+            'users': self.csv_handler.login_file,
+        }
+        # Tables whose snapshot is missing or older than their CSV file
+        self.stale_snapshots = set()
+        self.loaded_tables = set()
+        self.load_times = {}  # table -> seconds spent reading it
+        # Tables that loaded with bad rows skipped: table -> rows skipped.
+        # They are never saved, since that would drop the skipped rows for good.
+        self.partial_tables = {}
         self.current_user = None
         
-        # Load data from CSV files
-        self.load_all_data()
+        # Keys changed since the last save, per table
+        self.dirty = {table: set() for table in self.TABLES}
+        
+        # The scale is process-wide, since students derive grades from it on
+        # every read; each app installs its own, the default without grades.csv
+        Grades.set_scale(self.load_grade_scale() or GradeScale.default())
+        if self.database is not None and self.database.is_new:
+            self.migrate_to_database()
+        
+        # Tables with journaled changes are loaded now so the journal can be
+        # replayed (and later truncated) safely; the rest wait for first use.
+        # A thread-safe app loads everything up front, since a lazy load
+        # would have to take the write lock inside some reader's read lock.
+        pending = set()
+        if self.journal is not None and len(self.journal):
+            pending = {entry['table'] for entry in self.journal.replay()}
+        if lazy and self.rwlock is None:
+            self.load_tables(pending)
+        else:
+            self.load_all_data()
+        if pending:
+            self.replay_journal()
+    
+    # Attributes that only exist once their table has been loaded
+    LAZY_ATTRIBUTES = {
+        'students': 'students',
+        'enrollments': 'students',
+        'search_index': 'students',
+        'marks_histogram': 'students',
+        'prefix_indexes': 'students',
+        'sorted_views': 'students',
+        'courses': 'courses',
+        'professors': 'professors',
+        'users': 'users',
+    }
+    
+    def __getattr__(self, name):
+        """Load a table the first time it (or one of its indexes) is used"""
+        table = self.LAZY_ATTRIBUTES.get(name)
+        # Before __init__ has set loaded_tables nothing can be loaded yet
+        if table is None or table in self.__dict__.get('loaded_tables', (table,)):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        self.load_tables([table])
+        return getattr(self, name)
     
     def load_all_data(self):
-        """Load all data from CSV files"""
-        print("Loading data from CSV files...")
-        self.students = self.csv_handler.load_students()
-        self.courses = self.csv_handler.load_courses()
-        self.professors = self.csv_handler.load_professors()
-        self.users = self.csv_handler.load_users()
+        """Load every table that is not loaded yet, reading the files concurrently"""
+        print("Loading data...")
+        start_time = time.perf_counter()
+        self.load_tables(self.TABLES)
+        elapsed = time.perf_counter() - start_time
+        from_csv = ', '.join(t for t in self.TABLES if t in self.stale_snapshots) or 'none'
         print(f"Loaded: {len(self.students)} students, {len(self.courses)} courses, "
-              f"{len(self.professors)} professors, {len(self.users)} users")
+              f"{len(self.professors)} professors, {len(self.users)} users "
+              f"in {elapsed:.2f} seconds (parsed from CSV: {from_csv})")
+    
+    def load_tables(self, tables):
+        """Load the given tables, in parallel through a thread pool if more than one"""
+        tables = [table for table in self.TABLES if table in tables and table not in self.loaded_tables]
+        if not tables:
+            return
+        
+        # Loading creates objects but no garbage; skip cyclic GC passes meanwhile
+        with paused_gc():
+            if len(tables) == 1:
+                results = [self.read_table(tables[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=len(tables)) as pool:
+                    results = list(pool.map(self.read_table, tables))
+            
+            for table, (items, source, elapsed) in zip(tables, results):
+                if self.rwlock is not None:
+                    repository = SynchronizedRepository(self.TABLE_KEYS[table], items, self.rwlock)
+                else:
+                    repository = Repository(self.TABLE_KEYS[table], items)
+                setattr(self, table, repository)
+                if table == 'students':
+                    self.build_student_indexes()
+                if source == 'CSV':
+                    self.stale_snapshots.add(table)
+                self.loaded_tables.add(table)
+                self.load_times[table] = elapsed
+                print(f"  {table}: {len(items)} rows from {source} in {elapsed:.2f} seconds")
+                errors = self.csv_handler.load_errors.get(table)
+                if errors:
+                    self.partial_tables[table] = len(errors)
+                    print(f"  {table}: {len(errors)} bad row(s) skipped, changes to {table} will not be saved")
+    
+    def read_table(self, table):
+        """Read one table's records; return (items, source, seconds)"""
+        start_time = time.perf_counter()
+        self.csv_handler.load_errors.pop(table, None)
+        if self.database is not None:
+            items, source = getattr(self.database, f"load_{table}")(), 'SQLite'
+        elif table == 'students' and self.student_store is not None:
+            items = self.load_student_store()
+            source = 'students.dat' if self.student_store.exists() else 'CSV'
+        else:
+            items, source = self.snapshots.load(table, self.csv_files[table]), 'snapshot'
+            if items is None:
+                items, source = getattr(self.csv_handler, f"load_{table}")(), 'CSV'
+        return items, source, time.perf_counter() - start_time
+    
+    def load_student_store(self):
+        """Load students from students.dat, importing students.csv on first use"""
+        store = self.student_store
+        if store.exists():
+            return store.load_students()
+        
+        students = self.csv_handler.load_students()
+        # An incomplete roster stays in students.csv until its bad rows are fixed
+        if not self.csv_handler.load_errors.get('students') and store.save_students(students):
+            print(f"Imported {len(students)} students into {store.path}")
+        return students
+    
+    def save_student_store(self, force=False):
+        """Write changed students in place in students.dat (rewrite it if force)"""
+        store = self.student_store
+        if force or not store.exists():
+            # Until students.csv has been imported there is no store to update in place
+            return store.save_students(self.students)
+        try:
+            for email in self.dirty['students']:
+                student = self.students.get(email)
+                if student is None:
+                    store.delete_student(email)
+                else:
+                    store.put_student(student)
+            store.flush()
+            return True
+        except ValueError as e:
+            print(f"Error saving students: {e}")
+            return False
+    
+    def check_storable(self, student, first_name=None, last_name=None, course_id=None):
+        """Raise ValueError if the storage backend could not save student after a change
+        
+        students.dat has fixed-width records, so a name, email or course list
+        that does not fit is rejected before the change is made instead of
+        failing every later save.
+        """
+        if self.student_store is None:
+            return
+        courses = student.courses
+        if course_id is not None and not student.has_course(course_id):
+            courses.append(course_id)
+        self.student_store.check(student.email_address,
+                                 student.first_name if first_name is None else first_name,
+                                 student.last_name if last_name is None else last_name,
+                                 courses)
+    
+    def migrate_to_database(self):
+        """Import the CSV files into the SQLite database, replacing its contents"""
+        counts = self.database.import_csv(self.csv_handler)
+        print("Imported into " + self.database.path + ": " +
+              ', '.join(f"{rows} {table}" for table, rows in counts.items()))
+        return counts
     
-    def save_all_data(self):
-        """Save all data to CSV files"""
-        print("Saving data to CSV files...")
-        self.csv_handler.save_students(self.students)
-        self.csv_handler.save_courses(self.courses)
-        self.csv_handler.save_professors(self.professors)
-        self.csv_handler.save_users(self.users)
-        print("Data saved successfully!")
+    def save_database_table(self, table, force=False):
+        """Upsert/delete a table's changed rows in SQLite (replace the table if force)"""
+        repository = getattr(self, table)
+        if force:
+            return getattr(self.database, f"save_{table}")(repository)
+        keys = self.dirty[table]
+        items = [repository.get(key) for key in keys if key in repository]
+        deleted = [key for key in keys if key not in repository]
+        return self.database.save_changes(table, items, deleted)
+    
+    def load_grade_scale(self):
+        """Read the grade bands in grades.csv; return the scale, or None if absent or invalid"""
+        bands = self.csv_handler.load_grades()
+        if not bands:
+            return None
+        try:
+            scale = GradeScale(bands)
+        except ValueError as e:
+            print(f"Error: Invalid grade scale in grades.csv: {e}")
+            return None
+        return scale
+    
+    def build_student_indexes(self):
+        """Attach secondary indexes to the students repository"""
+        self.enrollments = EnrollmentIndex()
+        self.search_index = TrigramIndex()
+        self.marks_histogram = MarksHistogram()
+        self.students.add_index(self.enrollments)
+        self.students.add_index(self.search_index)
+        self.students.add_index(self.marks_histogram)
+        
+        # Sorted keys for prefix and range lookups
+        self.prefix_indexes = {
+            'email': PrefixIndex('email_address'),
+            'first_name': PrefixIndex('first_name'),
+            'last_name': PrefixIndex('last_name'),
+        }
+        for index in self.prefix_indexes.values():
+            self.students.add_index(index)
+        
+        # Maintained orderings read by sort_students
+        self.sorted_views = {
+            'email': SortedView(lambda s: s.email_address),
+            'first_name': SortedView(lambda s: s.first_name),
+            'average_marks': SortedView(lambda s: s.get_average_marks()),
+        }
+        for view in self.sorted_views.values():
+            self.students.add_index(view)
+    
+    def save_all_data(self, force=False):
+        """Save changed tables to CSV files (all tables if force is True)"""
+        savers = {
+            'students': self.csv_handler.save_students,
+            'courses': self.csv_handler.save_courses,
+            'professors': self.csv_handler.save_professors,
+            'users': self.csv_handler.save_users,
+        }
+        
+        # Writers wait until the tables are written out
+        with self.reading():
+            print("Saving data...")
+            written = {}
+            for table in self.TABLES:
+                if not force and not self.dirty[table]:
+                    continue
+                if table in self.partial_tables:
+                    print(f"  Not saving {table}: {self.partial_tables[table]} row(s) could not be loaded, "
+                          f"fix them and restart")
+                    continue
+                if self.database is not None:
+                    rows = len(getattr(self, table)) if force else len(self.dirty[table])
+                    if self.save_database_table(table, force):
+                        self.dirty[table].clear()
+                        written[table] = (rows, None)
+                    continue
+                if table == 'students' and self.student_store is not None:
+                    rows = len(self.students) if force else len(self.dirty[table])
+                    if self.save_student_store(force):
+                        self.dirty[table].clear()
+                        written[table] = (rows, rows * MmapStudentStore.RECORD_SIZE)
+                    continue
+                if savers[table](getattr(self, table)):
+                    self.dirty[table].clear()
+                    stats = self.csv_handler.get_write_stats(table)
+                    written[table] = (stats['last_rows'], stats['last_bytes'])
+            
+            for table, (rows, size) in written.items():
+                print(f"  {table}: {rows} rows" + (f", {size} bytes" if size is not None else ""))
+            
+            # Snapshot every rewritten table, and any table still loaded from CSV
+            for table in self.TABLES:
+                if self.database is not None or (table == 'students' and self.student_store is not None):
+                    continue  # the database and students.dat are already binary
+                if table in self.partial_tables:
+                    continue  # a snapshot would hide the bad rows on the next start
+                if table in written or (table in self.stale_snapshots and not self.dirty[table]):
+                    if self.snapshots.save(table, getattr(self, table), self.csv_files[table]):
+                        self.stale_snapshots.discard(table)
+            
+            # The CSV files now contain every journaled change
+            if self.journal is not None and not any(self.dirty.values()):
+                self.journal.truncate()
+            print("Data saved successfully!")
+            return written
+    
+    def reading(self):
+        """Context manager holding the tables shared, a no-op unless thread_safe"""
+        return self.rwlock.read() if self.rwlock is not None else nullcontext()
+    
+    def writing(self):
+        """Context manager holding the tables exclusively, a no-op unless thread_safe
+        
+        Never call record_changes or commit while writing: commits take the
+        save scheduler's lock first and the tables' lock second.
+        """
+        return self.rwlock.write() if self.rwlock is not None else nullcontext()
+    
+    def mark_dirty(self, table, key):
+        """Flag a record as changed so the next save rewrites its table"""
+        self.dirty[table].add(key)
+    
+    # ==================== JOURNAL & GROUP COMMIT ====================
+    
+    def record_change(self, table, key, op='upsert'):
+        """Persist a single-record change to students, courses, professors or users"""
+        self.record_changes((table, key, op))
+    
+    def record_changes(self, *changes):
+        """Persist several (table, key, op) changes as one operation"""
+        with self.scheduler.lock:
+            for table, key, op in changes:
+                self.mark_dirty(table, key)
+            if self.journal is not None:
+                with self.reading():
+                    records = [(table, op, key,
+                                getattr(self, table).get(key).to_dict() if op == 'upsert' else None)
+                               for table, key, op in changes]
+                self.journal.append_many(records)
+            
+            try:
+                self.scheduler.notify()
+            except OSError as e:
+                # The changes stay dirty, so the next commit retries them
+                print(f"Error: {e}")
+    
+    def commit_changes(self):
+        """Durably write everything recorded since the last commit, OSError if it could not"""
+        if self.journal is None:
+            self.save_all_data()
+            unsaved = [table for table in self.TABLES if self.dirty[table]]
+            if unsaved:
+                raise OSError(f"Changes to {', '.join(unsaved)} could not be saved")
+            return
+        
+        # Compaction rewrites whole tables, so it waits for close() instead of
+        # landing on whichever change happens to cross the threshold
+        self.journal.flush()
+    
+    def flush_changes(self):
+        """Commit pending changes immediately and report commit statistics"""
+        try:
+            self.scheduler.flush()
+        except OSError as e:
+            print(f"Error: {e}")
+        stats = self.scheduler.stats()
+        if stats['commits']:
+            print(f"Commits: {stats['commits']} for {stats['operations']} change(s), "
+                  f"avg batch {stats['avg_batch']:.1f} (max {stats['max_batch']}), "
+                  f"avg latency {stats['avg_latency_ms']:.2f} ms "
+                  f"(max {stats['max_latency_ms']:.2f} ms)")
+    
+    def replay_journal(self):
+        """Apply journaled changes on top of the data loaded from CSV"""
+        applied = 0
+        for entry in self.journal.replay():
+            repository = getattr(self, entry['table'])
+            if entry['op'] == 'delete':
+                repository.remove(entry['key'])
+            else:
+                repository.put(self.ROW_BUILDERS[entry['table']](entry['record']))
+            self.mark_dirty(entry['table'], entry['key'])
+            applied += 1
+        print(f"Replayed {applied} journal record(s)")
+    
+    def compact_journal(self):
+        """Fold the journal into the CSV files and truncate it"""
+        print(f"Compacting {len(self.journal)} journal record(s)...")
+        self.save_all_data()
+    
+    def close(self):
+        """Commit pending changes and compact a long journal before exiting"""
+        with self.scheduler.lock:
+            try:
+                self.scheduler.flush()
+            except OSError as e:
+                print(f"Error: {e}")
+            if self.journal is not None and len(self.journal) >= self.JOURNAL_COMPACT_THRESHOLD:
+                self.compact_journal()
     
     # ==================== STUDENT OPERATIONS ====================
     
@@ -48,7 +450,7 @@ class CheckMyGradeApp:
         email = input("Enter student email: ").strip()
         
         # Check if student already exists
-        if any(s.email_address == email for s in self.students):
+        if email in self.students:
             print("Error: Student with this email already exists!")
             return
         
@@ -56,34 +458,128 @@ class CheckMyGradeApp:
         last_name = input("Enter last name: ").strip()
         
         student = Student(email, first_name, last_name)
-        self.students.append(student)
+        try:
+            self.check_storable(student)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
         
         # Also create login user
         password = input("Enter password for this student: ").strip()
         encrypted_pass = LoginUser.encrypt_password(password)
         user = LoginUser(email, encrypted_pass, 'student')
-        self.users.append(user)
+        with self.writing():
+            self.students.add(student)
+            self.users.add(user)
         
-        self.save_all_data()
+        self.record_changes(('students', email, 'upsert'), ('users', email, 'upsert'))
         print(f"Student {first_name} {last_name} added successfully!")
     
+    def import_students(self, path, default_password=None, workers=1):
+        """Add every valid student in a CSV/JSONL file and persist them with one save
+        
+        Rows are validated and checked against the student and login indexes
+        (and earlier rows) for duplicates. Passwords are hashed in a pool of
+        `workers` processes. Returns a report with counts, rows per second and
+        the rejected rows as (line, email, reason) tuples, or None if the
+        file cannot be read.
+        """
+        start_time = time.perf_counter()
+        students, passwords, rejected = [], [], []
+        seen = set()
+        rows = 0
+        try:
+            for line_no, row in iter_import_rows(path):
+                rows += 1
+                email = str(row.get('email_address') or row.get('email') or '') if row else ''
+                try:
+                    if row is None:
+                        raise ValueError("Malformed JSON")
+                    student, password = student_from_row(row)
+                    email = student.email_address
+                    if email in seen or email in self.students or email in self.users:
+                        raise ValueError("Duplicate email address")
+                    self.check_storable(student)
+                    unknown = [c for c in student.courses if c not in self.courses]
+                    if unknown:
+                        raise ValueError(f"Unknown course(s): {', '.join(unknown)}")
+                    password = password or default_password
+                    if not password:
+                        raise ValueError("Missing password")
+                except (ValueError, TypeError) as e:
+                    rejected.append((line_no, email, str(e)))
+                    continue
+                seen.add(email)
+                students.append(student)
+                passwords.append(str(password))
+        except (OSError, csv.Error, UnicodeDecodeError) as e:
+            print(f"Error: cannot read {path}: {e}")
+            return None
+        
+        hashed = hash_passwords(passwords, workers)
+        with self.scheduler.lock:
+            with self.writing():
+                self.students.add_all(students)
+                self.users.add_all(LoginUser(student.email_address, encrypted_pass, 'student')
+                                   for student, encrypted_pass in zip(students, hashed))
+            emails = [student.email_address for student in students]
+            self.dirty['students'].update(emails)
+            self.dirty['users'].update(emails)
+            if students:
+                self.save_all_data()
+        
+        elapsed = time.perf_counter() - start_time
+        report = {
+            'rows': rows,
+            'imported': len(students),
+            'rejected': rejected,
+            'seconds': elapsed,
+            'rows_per_second': rows / elapsed if elapsed else 0.0,
+        }
+        print(f"Imported {len(students)} of {rows} rows in {elapsed:.2f} seconds "
+              f"({report['rows_per_second']:.0f} rows/sec), {len(rejected)} rejected")
+        for line_no, email, reason in rejected[:20]:
+            print(f"  line {line_no}: {email or '(no email)'}: {reason}")
+        if len(rejected) > 20:
+            print(f"  ... and {len(rejected) - 20} more")
+        return report
+    
+    def bulk_import_students(self):
+        """Import students from a CSV or JSONL file"""
+        print("\n=== Bulk Import Students ===")
+        path = input("Enter path to CSV or JSONL file: ").strip()
+        default_password = input("Default password for rows without one (blank for none): ").strip()
+        self.import_students(path, default_password or None, workers=os.cpu_count() or 1)
+    
     def delete_student(self):
         """Delete a student"""
         print("\n=== Delete Student ===")
         email = input("Enter student email to delete: ").strip()
         
-        # Find and remove student
-        original_count = len(self.students)
-        self.students = [s for s in self.students if s.email_address != email]
-        
-        if len(self.students) < original_count:
-            # Also remove from users
-            self.users = [u for u in self.users if u.email_id != email]
-            self.save_all_data()
+        if self.remove_student(email):
             print(f"Student {email} deleted successfully!")
         else:
             print(f"Student {email} not found!")
     
+    def remove_student(self, email):
+        """Delete a student and their login; return False if there is no such student"""
+        with self.writing():
+            if not self.students.remove(email):
+                return False
+            # Also remove from users
+            self.users.remove(email)
+        self.record_changes(('students', email, 'delete'), ('users', email, 'delete'))
+        return True
+    
+    def set_marks(self, email, course_id, marks):
+        """Update one student's marks; return False if not found or not enrolled"""
+        with self.writing():
+            student = self.students.get(email)
+            if student is None or not student.update_marks(course_id, marks):
+                return False
+        self.record_change('students', email)
+        return True
+    
     def update_student_record(self):
         """Update student record"""
         print("\n=== Update Student Record ===")
@@ -98,34 +594,51 @@ class CheckMyGradeApp:
         print("1. Add course")
         print("2. Remove course")
         print("3. Update marks")
+        print("4. Rename student")
         choice = input("Enter choice: ").strip()
         
-        if choice == '1':
-            course_id = input("Enter course ID: ").strip()
-            if self.find_course(course_id):
-                marks = int(input("Enter marks: "))
-                student.add_course(course_id, marks)
-                self.save_all_data()
-                print("Course added successfully!")
-            else:
-                print("Course not found!")
-        
-        elif choice == '2':
-            course_id = input("Enter course ID to remove: ").strip()
-            if student.remove_course(course_id):
-                self.save_all_data()
-                print("Course removed successfully!")
-            else:
-                print("Course not found in student's record!")
-        
-        elif choice == '3':
-            course_id = input("Enter course ID: ").strip()
-            marks = int(input("Enter new marks: "))
-            if student.update_marks(course_id, marks):
-                self.save_all_data()
-                print("Marks updated successfully!")
-            else:
-                print("Course not found in student's record!")
+        try:
+            if choice == '1':
+                course_id = input("Enter course ID: ").strip()
+                if self.find_course(course_id):
+                    marks = int(input("Enter marks: "))
+                    self.check_storable(student, course_id=course_id)
+                    with self.writing():
+                        student.add_course(course_id, marks)
+                    self.record_change('students', email)
+                    print("Course added successfully!")
+                else:
+                    print("Course not found!")
+            
+            elif choice == '2':
+                course_id = input("Enter course ID to remove: ").strip()
+                with self.writing():
+                    removed = student.remove_course(course_id)
+                if removed:
+                    self.record_change('students', email)
+                    print("Course removed successfully!")
+                else:
+                    print("Course not found in student's record!")
+            
+            elif choice == '3':
+                course_id = input("Enter course ID: ").strip()
+                marks = int(input("Enter new marks: "))
+                if self.set_marks(email, course_id, marks):
+                    print("Marks updated successfully!")
+                else:
+                    print("Course not found in student's record!")
+            
+            elif choice == '4':
+                first_name = input("Enter new first name (blank to keep): ").strip()
+                last_name = input("Enter new last name (blank to keep): ").strip()
+                self.check_storable(student, first_name or None, last_name or None)
+                with self.writing():
+                    student.rename(first_name or None, last_name or None)
+                self.record_change('students', email)
+                print("Student renamed successfully!")
+        except ValueError as e:
+            # Non-numeric or out of range marks
+            print(f"Error: {e}")
     
     def search_student(self):
         """Search for students"""
@@ -133,20 +646,40 @@ class CheckMyGradeApp:
         search_term = input("Enter email or name to search: ").strip().lower()
         
         start_time = time.time()
+        results = self.find_students(search_term)
+        end_time = time.time()
+        search_time = (end_time - start_time) * 1000  # Convert to milliseconds
         
-        results = []
-        for student in self.students:
-            if (search_term in student.email_address.lower() or
-                search_term in student.first_name.lower() or
-                search_term in student.last_name.lower()):
-                results.append(student)
+        print(f"\nFound {len(results)} student(s) in {search_time:.4f} ms:")
+        with self.reading():
+            for student in results:
+                student.display_records()
         
+        return search_time
+    
+    def prefix_search_students(self):
+        """Search students by email or name prefix"""
+        print("\n=== Prefix Search ===")
+        print("1. Email")
+        print("2. First name")
+        print("3. Last name")
+        fields = {'1': 'email', '2': 'first_name', '3': 'last_name'}
+        field = fields.get(input("Enter choice: ").strip())
+        if field is None:
+            print("Invalid choice!")
+            return
+        
+        prefix = input("Enter prefix: ").strip()
+        
+        start_time = time.time()
+        results = self.prefix_search(field, prefix)
         end_time = time.time()
-        search_time = (end_time - start_time) * 1000  # Convert to milliseconds
+        search_time = (end_time - start_time) * 1000
         
         print(f"\nFound {len(results)} student(s) in {search_time:.4f} ms:")
-        for student in results:
-            student.display_records()
+        with self.reading():
+            for student in results:
+                student.display_records()
         
         return search_time
     
@@ -161,26 +694,23 @@ class CheckMyGradeApp:
         order = input("Ascending (a) or Descending (d)? ").strip().lower()
         reverse = (order == 'd')
         
-        start_time = time.time()
-        
-        if choice == '1':
-            self.students.sort(key=lambda s: s.email_address, reverse=reverse)
-        elif choice == '2':
-            self.students.sort(key=lambda s: s.first_name, reverse=reverse)
-        elif choice == '3':
-            self.students.sort(key=lambda s: s.get_average_marks(), reverse=reverse)
-        else:
+        views = {'1': 'email', '2': 'first_name', '3': 'average_marks'}
+        if choice not in views:
             print("Invalid choice!")
             return
         
+        # Read from the maintained view, the roster order is left untouched
+        start_time = time.time()
+        first_students = self.sorted_students(views[choice], reverse, limit=10)
         end_time = time.time()
         sort_time = (end_time - start_time) * 1000
         
         print(f"\nStudents sorted in {sort_time:.4f} ms")
         print("\nFirst 10 students:")
-        for student in self.students[:10]:
-            print(f"{student.email_address}: {student.first_name} {student.last_name} "
-                  f"(Avg: {student.get_average_marks():.2f})")
+        with self.reading():
+            for student in first_students:
+                print(f"{student.email_address}: {student.first_name} {student.last_name} "
+                      f"(Avg: {student.get_average_marks():.2f})")
         
         return sort_time
     
@@ -188,27 +718,67 @@ class CheckMyGradeApp:
         """Display statistics for all students"""
         print("\n=== Student Statistics ===")
         
-        if not self.students:
+        # Statistics come from the live marks histogram, or one pass over storage
+        if 'students' in self.loaded_tables:
+            with self.reading():
+                total = len(self.students)
+                histogram = self.marks_histogram.overall.copy()
+        else:
+            total = 0
+            histogram = Histogram()
+            for student in self.iter_students():
+                total += 1
+                for marks in student.marks:
+                    histogram.add(marks)
+        
+        if not total:
             print("No students in the system!")
             return
         
-        # Calculate statistics
-        all_marks = []
-        for student in self.students:
-            all_marks.extend(student.marks)
-        
-        if all_marks:
-            avg_marks = statistics.mean(all_marks)
-            median_marks = statistics.median(all_marks)
-            
-            print(f"Total Students: {len(self.students)}")
-            print(f"Average Marks (All Courses): {avg_marks:.2f}")
-            print(f"Median Marks (All Courses): {median_marks:.2f}")
-            print(f"Highest Marks: {max(all_marks)}")
-            print(f"Lowest Marks: {min(all_marks)}")
+        if histogram.count:
+            print(f"Total Students: {total}")
+            print(f"Average Marks (All Courses): {histogram.mean():.2f}")
+            print(f"Median Marks (All Courses): {histogram.median():.2f}")
+            print(f"90th Percentile Marks: {histogram.percentile(90)}")
+            print(f"Highest Marks: {histogram.max()}")
+            print(f"Lowest Marks: {histogram.min()}")
         else:
             print("No marks data available!")
     
+    def display_course_analytics(self):
+        """Display per-course analytics computed with NumPy"""
+        print("\n=== Course Analytics ===")
+        
+        # NumPy is optional, only this report needs it
+        try:
+            from utils.analytics import MarksMatrix
+            # The matrix copies every mark, so later steps need no lock
+            with self.reading():
+                matrix = MarksMatrix(self.students, self.courses)
+        except ImportError as e:
+            print(f"Error: {e}")
+            return
+        
+        course_stats = matrix.course_statistics()
+        if not course_stats:
+            print("No marks data available!")
+            return
+        
+        distribution = matrix.grade_distribution()
+        for course_id, stats in course_stats.items():
+            grades = ', '.join(f"{g}: {distribution[course_id][g]}"
+                               for g in reversed(Grades.scale.letters))
+            print(f"\n{course_id}: {stats['count']} enrolled")
+            print(f"  Mean {stats['mean']:.2f}, Median {stats['median']:.2f}, "
+                  f"Std Dev {stats['std']:.2f}, P25 {stats['p25']:.0f}, "
+                  f"P75 {stats['p75']:.0f}, P90 {stats['p90']:.0f}")
+            print(f"  Grades: {grades}")
+        
+        # Students without courses have no GPA
+        gpa = matrix.student_gpa()[matrix.mask.any(axis=1)]
+        if gpa.size:
+            print(f"\nMean GPA: {gpa.mean():.2f}")
+    
     # ==================== COURSE OPERATIONS ====================
     
     def add_new_course(self):
@@ -225,8 +795,8 @@ class CheckMyGradeApp:
         description = input("Enter description: ").strip()
         
         course = Course(course_id, course_name, credits, description)
-        self.courses.append(course)
-        self.save_all_data()
+        self.courses.add(course)
+        self.record_change('courses', course_id)
         print(f"Course {course_name} added successfully!")
     
     def delete_course(self):
@@ -234,11 +804,8 @@ class CheckMyGradeApp:
         print("\n=== Delete Course ===")
         course_id = input("Enter course ID to delete: ").strip()
         
-        original_count = len(self.courses)
-        self.courses = [c for c in self.courses if c.course_id != course_id]
-        
-        if len(self.courses) < original_count:
-            self.save_all_data()
+        if self.courses.remove(course_id):
+            self.record_change('courses', course_id, 'delete')
             print(f"Course {course_id} deleted successfully!")
         else:
             print(f"Course {course_id} not found!")
@@ -253,6 +820,35 @@ class CheckMyGradeApp:
         for course in self.courses:
             course.display_courses()
     
+    def apply_grade_scale(self, scale):
+        """Regrade every student with a new grade scale in one pass"""
+        with self.scheduler.lock:
+            with self.writing():
+                Grades.set_scale(scale)
+                for student in self.students:
+                    student.invalidate_aggregates()
+            
+            # Grades are derived from marks, so one rewrite of students.csv
+            # replaces a journal entry per student
+            self.dirty['students'].update(self.students.keys())
+            self.save_all_data()
+        return len(self.students)
+    
+    def reload_grade_scale(self):
+        """Re-read grades.csv and regrade all students"""
+        print("\n=== Reload Grade Scale ===")
+        start_time = time.perf_counter()
+        scale = self.load_grade_scale()
+        if scale is None:
+            print("No valid grade scale found in grades.csv!")
+            return
+        
+        count = self.apply_grade_scale(scale)
+        elapsed = time.perf_counter() - start_time
+        bands = ', '.join(f"{band.grade}: {band.min_marks}-{band.max_marks}" for band in scale.bands)
+        print(f"Grade scale: {bands}")
+        print(f"Regraded {count} students in {elapsed:.2f} seconds")
+    
     # ==================== PROFESSOR OPERATIONS ====================
     
     def add_new_professor(self):
@@ -260,7 +856,7 @@ class CheckMyGradeApp:
         print("\n=== Add New Professor ===")
         prof_id = input("Enter professor ID (email): ").strip()
         
-        if any(p.professor_id == prof_id for p in self.professors):
+        if prof_id in self.professors:
             print("Error: Professor with this ID already exists!")
             return
         
@@ -269,15 +865,19 @@ class CheckMyGradeApp:
         rank = input("Enter rank: ").strip()
         
         professor = Professor(prof_id, name, email, rank)
-        self.professors.append(professor)
+        self.professors.add(professor)
         
         # Also create login user
         password = input("Enter password for this professor: ").strip()
         encrypted_pass = LoginUser.encrypt_password(password)
         user = LoginUser(email, encrypted_pass, 'professor')
-        self.users.append(user)
+        changes = [('professors', prof_id, 'upsert')]
+        if self.users.add(user):
+            changes.append(('users', email, 'upsert'))
+        else:
+            print(f"Warning: Login for {email} already exists, keeping existing account")
         
-        self.save_all_data()
+        self.record_changes(*changes)
         print(f"Professor {name} added successfully!")
     
     def delete_professor(self):
@@ -285,11 +885,8 @@ class CheckMyGradeApp:
         print("\n=== Delete Professor ===")
         prof_id = input("Enter professor ID to delete: ").strip()
         
-        original_count = len(self.professors)
-        self.professors = [p for p in self.professors if p.professor_id != prof_id]
-        
-        if len(self.professors) < original_count:
-            self.save_all_data()
+        if self.professors.remove(prof_id):
+            self.record_change('professors', prof_id, 'delete')
             print(f"Professor {prof_id} deleted successfully!")
         else:
             print(f"Professor {prof_id} not found!")
@@ -304,6 +901,90 @@ class CheckMyGradeApp:
         for professor in self.professors:
             professor.professors_details()
     
+    def upload_course_marks(self, course_id, path):
+        """Apply a file of (email, marks) rows to one course as a single commit
+        
+        Every row is checked before any marks change; unknown students,
+        students not enrolled in the course and invalid marks are reported
+        and skipped. The rest get update_marks semantics (a later row for the
+        same student wins), sorted views are re-sorted once for the batch and
+        all changes are written in one durable commit. Returns a summary, or
+        None if the course or the file cannot be found.
+        """
+        start_time = time.perf_counter()
+        if self.find_course(course_id) is None:
+            print("Error: Course not found!")
+            return None
+        
+        updates = {}  # email -> (student, marks)
+        unknown, unenrolled, invalid = [], [], []
+        rows = 0
+        try:
+            for line_no, email, marks in iter_marks_rows(path):
+                rows += 1
+                if email is None:
+                    invalid.append((line_no, '', "Malformed JSON"))
+                    continue
+                student = self.students.get(email)
+                if student is None:
+                    unknown.append(email)
+                elif not student.has_course(course_id):
+                    unenrolled.append(email)
+                else:
+                    try:
+                        updates[email] = (student, Student.validate_marks(marks))
+                    except (ValueError, TypeError):
+                        invalid.append((line_no, email, f"Invalid marks: {marks!r}"))
+        except (OSError, csv.Error, UnicodeDecodeError) as e:
+            print(f"Error: cannot read {path}: {e}")
+            return None
+        
+        # The batch allocates many short-lived tuples; a full collection over
+        # a large roster would cost more than the upload itself
+        with paused_gc():
+            with self.scheduler.lock:
+                with self.writing(), ExitStack() as stack:
+                    for view in self.sorted_views.values():
+                        stack.enter_context(view.deferred())
+                    for student, marks in updates.values():
+                        student.update_marks(course_id, marks)
+                self.record_changes(*(('students', email, 'upsert') for email in updates))
+                try:
+                    self.scheduler.flush()
+                except OSError as e:
+                    # The marks stay dirty, so the next commit retries them
+                    print(f"Error: {e}")
+        
+        letters, _ = Grades.scale.grade_many([marks for _, marks in updates.values()])
+        elapsed = time.perf_counter() - start_time
+        summary = {
+            'course_id': course_id,
+            'rows': rows,
+            'updated': len(updates),
+            'unknown': unknown,
+            'unenrolled': unenrolled,
+            'invalid': invalid,
+            'grades': dict(Counter(str(letter) for letter in letters)),
+            'seconds': elapsed,
+        }
+        print(f"Updated {len(updates)} student(s) in {course_id} from {rows} rows "
+              f"in {elapsed:.3f} seconds")
+        print("Grades: " + ', '.join(f"{letter} {count}" for letter, count in sorted(summary['grades'].items())))
+        for label, emails in (("Unknown students", unknown), ("Not enrolled", unenrolled)):
+            if emails:
+                more = f" ... and {len(emails) - 10} more" if len(emails) > 10 else ''
+                print(f"{label} ({len(emails)}): {', '.join(emails[:10])}{more}")
+        for line_no, email, reason in invalid[:10]:
+            print(f"  line {line_no}: {email or '(no email)'}: {reason}")
+        return summary
+    
+    def upload_marks(self):
+        """Upload a marks file for one course"""
+        print("\n=== Upload Course Marks ===")
+        course_id = input("Enter course ID: ").strip()
+        path = input("Enter path to marks file (email,marks rows): ").strip()
+        self.upload_course_marks(course_id, path)
+    
     # ==================== REPORTS ====================
     
     def generate_reports(self):
@@ -325,33 +1006,48 @@ class CheckMyGradeApp:
         """Generate course-wise report"""
         print("\n=== Course-wise Report ===")
         course_id = input("Enter course ID: ").strip()
-        
+        self.print_course_report(course_id)
+    
+    def print_course_report(self, course_id):
+        """Print a course with its enrolled students; return False if not found"""
         course = self.find_course(course_id)
         if not course:
             print("Course not found!")
-            return
+            return False
         
         course.display_courses()
         
         # Find students enrolled in this course
-        enrolled_students = [s for s in self.students if course_id in s.courses]
-        print(f"\nStudents enrolled: {len(enrolled_students)}")
-        
-        for student in enrolled_students:
-            idx = student.courses.index(course_id)
-            marks = student.marks[idx] if idx < len(student.marks) else 'N/A'
-            grade = student.grades[idx] if idx < len(student.grades) else 'N/A'
-            print(f"  {student.first_name} {student.last_name}: Marks {marks}, Grade {grade}")
+        if 'students' in self.loaded_tables:
+            # Rows are read under the lock, so a concurrent change is never seen half done
+            with self.reading():
+                rows = [self.course_report_row(student, course_id)
+                        for student in self.enrollments.students_in(course_id)]
+                histogram = self.marks_histogram.course(course_id).copy()
+        else:
+            # One pass over storage instead of loading and indexing every student
+            rows = [self.course_report_row(student, course_id)
+                    for student in self.iter_students() if student.has_course(course_id)]
+            histogram = Histogram()
+            for _, marks, _ in rows:
+                histogram.add(marks)
+        print(f"\nStudents enrolled: {len(rows)}")
         
-        # Calculate course statistics
-        course_marks = [s.marks[s.courses.index(course_id)] 
-                       for s in enrolled_students 
-                       if course_id in s.courses and s.marks]
+        for name, marks, grade in rows:
+            print(f"  {name}: Marks {marks}, Grade {grade}")
         
-        if course_marks:
+        # Course statistics from the per-course marks histogram
+        if histogram.count:
             print(f"\nCourse Statistics:")
-            print(f"  Average Marks: {statistics.mean(course_marks):.2f}")
-            print(f"  Median Marks: {statistics.median(course_marks):.2f}")
+            print(f"  Average Marks: {histogram.mean():.2f}")
+            print(f"  Median Marks: {histogram.median():.2f}")
+        return True
+    
+    @staticmethod
+    def course_report_row(student, course_id):
+        """(name, marks, grade) for one student's line in a course report"""
+        return (f"{student.first_name} {student.last_name}",
+                student.get_marks(course_id), student.get_grade(course_id))
     
     def professor_wise_report(self):
         """Generate professor-wise report"""
@@ -370,38 +1066,81 @@ class CheckMyGradeApp:
         """Generate student-wise report"""
         print("\n=== Student-wise Report ===")
         email = input("Enter student email: ").strip()
-        
-        student = self.find_student(email)
+        self.print_student_report(email)
+    
+    def print_student_report(self, email):
+        """Print one student's record, average and GPA; return False if not found"""
+        student = self.lookup_student(email)
         if not student:
             print("Student not found!")
-            return
+            return False
         
-        student.display_records()
-        print(f"\nAverage Marks: {student.get_average_marks():.2f}")
-        print(f"GPA: {student.get_gpa():.2f}")
+        # Printed under the lock so a concurrent change is never seen half done
+        with self.reading():
+            student.display_records()
+            print(f"\nAverage Marks: {student.get_average_marks():.2f}")
+            print(f"GPA: {student.get_gpa():.2f}")
+        return True
     
     # ==================== HELPER METHODS ====================
     
     def find_student(self, email):
         """Find student by email"""
-        for student in self.students:
-            if student.email_address == email:
-                return student
-        return None
+        return self.students.get(email)
+    
+    def lookup_student(self, email):
+        """Find one student, reading just that student from storage if the table is not loaded"""
+        if 'students' in self.loaded_tables:
+            return self.students.get(email)
+        if self.database is not None:
+            return self.database.find_student(email)
+        if self.student_store is not None:
+            return self.student_store.find_student(email)
+        return self.csv_handler.find_student(email)
+    
+    def iter_students(self):
+        """Yield every student, streamed from storage if the table is not loaded
+        
+        Streaming skips building the secondary indexes, which dominate a full
+        load, so one-shot commands that read each student once stay fast.
+        """
+        if 'students' in self.loaded_tables:
+            yield from self.students
+        elif self.database is not None:
+            yield from self.database.load_students()
+        elif self.student_store is not None:
+            yield from self.student_store.iter_students()
+        else:
+            students = self.snapshots.load('students', self.csv_files['students'])
+            yield from students if students is not None else self.csv_handler.iter_students()
+    
+    def find_students(self, search_term):
+        """Find students whose email, first or last name contains search_term"""
+        with self.reading():
+            return self.search_index.search(search_term)
+    
+    def prefix_search(self, field, prefix):
+        """Find students whose email, first_name or last_name starts with prefix"""
+        with self.reading():
+            return self.prefix_indexes[field].prefix(prefix)
+    
+    def range_search(self, field, low, high):
+        """Find students whose field value is in [low, high), case-insensitive"""
+        with self.reading():
+            return self.prefix_indexes[field].range(low, high)
+    
+    def sorted_students(self, order_by, reverse=False, limit=None):
+        """Students ordered by email, first_name or average_marks"""
+        with self.reading():
+            return self.sorted_views[order_by].students(reverse, limit)
     
     def find_course(self, course_id):
         """Find course by ID"""
-        for course in self.courses:
-            if course.course_id == course_id:
-                return course
-        return None
+        return self.courses.get(course_id)
     
     def find_professor(self, prof_id):
         """Find professor by ID"""
-        for professor in self.professors:
-            if professor.professor_id == prof_id:
-                return professor
-        return None
+        return self.professors.get(prof_id)
     
     # ==================== MAIN MENU ====================
     
@@ -432,6 +1171,7 @@ class CheckMyGradeApp:
             elif choice == '5':
                 self.reports_menu()
             elif choice == '6':
+                self.flush_changes()
                 self.save_all_data()
                 print("Thank you for using CheckMyGrade!")
                 break
@@ -445,6 +1185,7 @@ class CheckMyGradeApp:
         print("2. Delete student")
         print("3. Update student record")
         print("4. Display all students")
+        print("5. Bulk import students")
         choice = input("Enter choice: ").strip()
         
         if choice == '1':
@@ -454,8 +1195,11 @@ class CheckMyGradeApp:
         elif choice == '3':
             self.update_student_record()
         elif choice == '4':
-            for student in self.students[:10]:  # Display first 10
-                student.display_records()
+            with self.reading():
+                for student in self.students.head(10):  # Display first 10
+                    student.display_records()
+        elif choice == '5':
+            self.bulk_import_students()
     
     def course_menu(self):
         """Course management menu"""
@@ -463,6 +1207,7 @@ class CheckMyGradeApp:
         print("1. Add new course")
         print("2. Delete course")
         print("3. Display all courses")
+        print("4. Reload grade scale")
         choice = input("Enter choice: ").strip()
         
         if choice == '1':
@@ -471,6 +1216,8 @@ class CheckMyGradeApp:
             self.delete_course()
         elif choice == '3':
             self.display_courses()
+        elif choice == '4':
+            self.reload_grade_scale()
     
     def professor_menu(self):
         """Professor management menu"""
@@ -478,6 +1225,7 @@ class CheckMyGradeApp:
         print("1. Add new professor")
         print("2. Delete professor")
         print("3. Display all professors")
+        print("4. Upload course marks")
         choice = input("Enter choice: ").strip()
         
         if choice == '1':
@@ -486,35 +1234,84 @@ class CheckMyGradeApp:
             self.delete_professor()
         elif choice == '3':
             self.display_professors()
+        elif choice == '4':
+            self.upload_marks()
     
     def search_sort_menu(self):
         """Search and sort menu"""
         print("\n=== Search & Sort ===")
         print("1. Search students")
         print("2. Sort students")
+        print("3. Prefix search")
         choice = input("Enter choice: ").strip()
         
         if choice == '1':
             self.search_student()
         elif choice == '2':
             self.sort_students()
+        elif choice == '3':
+            self.prefix_search_students()
     
     def reports_menu(self):
         """Reports and statistics menu"""
         print("\n=== Reports & Statistics ===")
         print("1. Generate reports")
         print("2. Display student statistics")
+        print("3. Course analytics")
         choice = input("Enter choice: ").strip()
         
         if choice == '1':
             self.generate_reports()
         elif choice == '2':
             self.display_student_statistics()
+        elif choice == '3':
+            self.display_course_analytics()
+
+def option_value(name, convert, default):
+    """Converted value following a command line option, default if it is absent"""
+    if name not in sys.argv:
+        return default
+    return convert(sys.argv[sys.argv.index(name) + 1])
 
 def main():
     """Main entry point"""
-    app = CheckMyGradeApp()
-    app.main_menu()
+    if '--migrate-sqlite' in sys.argv:
+        try:
+            counts = SQLiteHandler('data').import_csv(CSVHandler('data'))
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print("Imported into data/checkmygrade.db: " +
+              ', '.join(f"{rows} {table}" for table, rows in counts.items()))
+        return
+    
+    storage = 'sqlite' if '--sqlite' in sys.argv else 'mmap' if '--mmap' in sys.argv else 'csv'
+    try:
+        # Processes for parsing a large students.csv and hashing imported passwords
+        workers = option_value('--workers', int, 1)
+        # Group commit: save once per N changes or SECONDS after the first one;
+        # with only --save-batch, a partial batch is saved on exit
+        save_delay = option_value('--save-delay', float, 0.0)
+        save_batch = option_value('--save-batch', int, 1)
+    except (IndexError, ValueError):
+        print("Usage: main.py [--workers N] [--save-delay SECONDS] [--save-batch N]")
+        return
+    app = CheckMyGradeApp(journaled='--journal' in sys.argv, storage=storage, workers=workers,
+                          save_delay=save_delay, save_batch=save_batch)
+    if '--import-students' in sys.argv:
+        index = sys.argv.index('--import-students') + 1
+        if index >= len(sys.argv):
+            print("Usage: main.py --import-students FILE")
+            return
+        report = app.import_students(sys.argv[index], workers=os.cpu_count() or 1)
+        if report is None or report['rejected']:
+            sys.exit(1)
+        return
+    try:
+        app.main_menu()
+    finally:
+        # Never lose changes still waiting in a group commit
+        app.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
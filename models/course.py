@@ -1,6 +1,8 @@
 class Course:
     """Class to manage course information"""
     
+    __slots__ = ('course_id', 'course_name', 'credits', 'description', 'enrolled_students')
+    
     def __init__(self, course_id, course_name, credits=3, description=""):
         if not course_id:
             raise ValueError("Course ID cannot be null or empty")
@@ -24,4 +26,13 @@ class Course:
             'course_name': self.course_name,
             'credits': self.credits,
             'description': self.description
-        }
\ No newline at end of file
+        }
+    
+    def to_record(self):
+        """Plain tuple of the constructor arguments, for binary snapshots"""
+        return (self.course_id, self.course_name, self.credits, self.description)
+    
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild a course from to_record() output"""
+        return cls(*record)
\ No newline at end of file
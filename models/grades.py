@@ -1,28 +1,113 @@
+from bisect import bisect_right
+
+_np = False  # NumPy module once imported, None if it is not installed
+
+def _numpy():
+    """Import NumPy on first use, so starting the app does not pay for it"""
+    global _np
+    if _np is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _np = numpy
+    return _np
+
 class Grades:
     """Class to manage grade mappings and grade reports"""
     
-    def __init__(self, grade_id=None, grade=None, min_marks=None, max_marks=None):
+    __slots__ = ('grade_id', 'grade', 'min_marks', 'max_marks', 'grade_points')
+    
+    def __init__(self, grade_id=None, grade=None, min_marks=None, max_marks=None, grade_points=None):
         self.grade_id = grade_id
         self.grade = grade
         self.min_marks = min_marks
         self.max_marks = max_marks
+        self.grade_points = grade_points
     
     @staticmethod
     def calculate_grade(marks):
         """Calculate letter grade based on marks"""
-        if marks >= 90:
-            return 'A'
-        elif marks >= 80:
-            return 'B'
-        elif marks >= 70:
-            return 'C'
-        elif marks >= 60:
-            return 'D'
-        else:
-            return 'F'
+        return Grades.scale.grade_for(marks)
+    
+    @staticmethod
+    def set_scale(scale):
+        """Make scale the grade scale used by calculate_grade and Student"""
+        Grades.scale = scale
     
     def display_grade_report(self):
         """Display grade information"""
         print(f"Grade ID: {self.grade_id}")
         print(f"Grade: {self.grade}")
-        print(f"Marks Range: {self.min_marks} - {self.max_marks}")
\ No newline at end of file
+        print(f"Marks Range: {self.min_marks} - {self.max_marks}")
+        print(f"Grade Points: {self.grade_points}")
+    
+    def to_dict(self):
+        """Convert grade band to dictionary for CSV"""
+        return {
+            'grade_id': self.grade_id,
+            'grade': self.grade,
+            'min_marks': self.min_marks,
+            'max_marks': self.max_marks,
+            'grade_points': self.grade_points
+        }
+
+class GradeScale:
+    """Ordered Grades bands that map marks to letter grades and grade points"""
+    
+    def __init__(self, bands):
+        bands = sorted(bands, key=lambda band: band.min_marks)
+        if not bands:
+            raise ValueError("Grade scale needs at least one band")
+        if bands[0].min_marks > 0 or bands[-1].max_marks < 100:
+            raise ValueError("Grade bands must cover marks 0 to 100")
+        for lower, upper in zip(bands, bands[1:]):
+            if upper.min_marks != lower.max_marks + 1:
+                raise ValueError(f"Grade bands {lower.grade} and {upper.grade} overlap or leave a gap")
+        
+        self.bands = bands
+        self.letters = [band.grade for band in bands]
+        self.points = [float(band.grade_points or 0) for band in bands]
+        # Lower bounds of every band but the lowest, for bisect/searchsorted
+        self.thresholds = [band.min_marks for band in bands[1:]]
+        self.points_by_letter = dict(zip(self.letters, self.points))
+        # Marks are 0-100, so single lookups are a table read
+        self.letter_table = [self.letters[bisect_right(self.thresholds, m)] for m in range(101)]
+    
+    @classmethod
+    def default(cls):
+        """The A/B/C/D/F scale with 10-mark bands"""
+        return cls([
+            Grades('F', 'F', 0, 59, 0.0),
+            Grades('D', 'D', 60, 69, 1.0),
+            Grades('C', 'C', 70, 79, 2.0),
+            Grades('B', 'B', 80, 89, 3.0),
+            Grades('A', 'A', 90, 100, 4.0),
+        ])
+    
+    def grade_for(self, marks):
+        """Letter grade for one mark"""
+        if 0 <= marks <= 100:
+            return self.letter_table[int(marks)]
+        return self.letters[bisect_right(self.thresholds, marks)]
+    
+    def grade_points(self, grade):
+        """Grade points for a letter grade (0 if unknown)"""
+        return self.points_by_letter.get(grade, 0.0)
+    
+    def bucket(self, marks):
+        """Band index for every mark in an array or sequence (searchsorted)"""
+        np = _numpy()
+        if np is not None:
+            return np.searchsorted(self.thresholds, np.asarray(marks), side='right')
+        return [bisect_right(self.thresholds, m) for m in marks]
+    
+    def grade_many(self, marks):
+        """Letter grades and grade points for a whole array of marks in one call"""
+        buckets = self.bucket(marks)
+        np = _numpy()
+        if np is not None:
+            return np.asarray(self.letters)[buckets], np.asarray(self.points)[buckets]
+        return [self.letters[b] for b in buckets], [self.points[b] for b in buckets]
+
+Grades.scale = GradeScale.default()
\ No newline at end of file
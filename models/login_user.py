@@ -4,6 +4,8 @@ import base64
 class LoginUser:
     """Class to manage user authentication"""
     
+    __slots__ = ('email_id', 'password', 'role', 'is_logged_in')
+    
     def __init__(self, email_id, password, role='student'):
         if not email_id:
             raise ValueError("Email ID cannot be null or empty")
@@ -76,6 +78,15 @@ class LoginUser:
             'role': self.role
         }
     
+    def to_record(self):
+        """Plain tuple of the constructor arguments, for binary snapshots"""
+        return (self.email_id, self.password, self.role)
+    
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild a login user from to_record() output"""
+        return cls(*record)
+    
     def __str__(self):
         return f"User: {self.email_id} (Role: {self.role})"
     
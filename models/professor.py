@@ -1,6 +1,8 @@
 class Professor:
     """Class to manage professor information"""
     
+    __slots__ = ('professor_id', 'name', 'email_address', 'rank', 'course_ids')
+    
     def __init__(self, professor_id, name, email_address, rank, course_ids=None):
         if not professor_id:
             raise ValueError("Professor ID cannot be null or empty")
@@ -36,4 +38,13 @@ class Professor:
             'email_address': self.email_address,
             'rank': self.rank,
             'course_ids': ','.join(self.course_ids)
-        }
\ No newline at end of file
+        }
+    
+    def to_record(self):
+        """Plain tuple of the constructor arguments, for binary snapshots"""
+        return (self.professor_id, self.name, self.email_address, self.rank, list(self.course_ids))
+    
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild a professor from to_record() output"""
+        return cls(*record)
\ No newline at end of file
@@ -1,8 +1,40 @@
+import sys
+from array import array
 from models.grades import Grades
 
+class StudentObserver:
+    """Base class for indexes that follow changes to a student's enrollments"""
+    
+    def on_course_added(self, student, course_id, marks):
+        pass
+    
+    def on_course_removed(self, student, course_id, marks):
+        pass
+    
+    def on_marks_updated(self, student, course_id, old_marks, new_marks):
+        pass
+    
+    def on_renamed(self, student, old_first_name, old_last_name):
+        pass
+    
+    def joined(self, observers):
+        """observers + (self,), one shared tuple for every student with the same observers"""
+        try:
+            cache = self._joined
+        except AttributeError:
+            cache = self._joined = {}
+        joined = cache.get(observers)
+        if joined is None:
+            joined = cache[observers] = observers + (self,)
+        return joined
+
 class Student:
     """Class to manage student information"""
     
+    # Fixed attribute layout (no per-instance __dict__) keeps large rosters compact
+    __slots__ = ('email_address', 'first_name', 'last_name', '_course_slots', 'marks',
+                 '_observers', '_average', '_gpa', '_gpa_scale')
+    
     def __init__(self, email_address, first_name, last_name, courses=None, grades=None, marks=None):
         if not email_address:
             raise ValueError("Email address cannot be null or empty")
@@ -10,19 +42,62 @@ class Student:
         self.email_address = email_address  # Using as unique ID
         self.first_name = first_name
         self.last_name = last_name
-        self.courses = courses if courses else []  # HAS-A relationship with courses
-        self.grades = grades if grades else []
-        self.marks = marks if marks else []
+        # HAS-A relationship with courses: course ID -> position in marks.
+        # Course IDs are interned so they are shared between students.
+        self._course_slots, marks = self.pair_courses(courses, marks)
+        # Marks 0-100 fit in one unsigned byte each
+        self.marks = array('B', marks)
+        # grades are derived from marks, the argument is accepted for compatibility
+        self._observers = ()
+        # Cached aggregates, reset whenever marks change
+        self._average = None
+        self._gpa = None
+        self._gpa_scale = None  # the grade scale _gpa was computed with
+    
+    @property
+    def courses(self):
+        """Enrolled course IDs in enrollment order"""
+        return list(self._course_slots)
+    
+    @property
+    def grades(self):
+        """Letter grades derived from marks with the active grade scale"""
+        letter_table = Grades.scale.letter_table  # marks are validated 0-100
+        return [letter_table[m] for m in self.marks]
+    
+    @staticmethod
+    def validate_marks(marks):
+        """Check that marks are an integer between 0 and 100"""
+        marks = int(marks)
+        if not 0 <= marks <= 100:
+            raise ValueError("Marks must be between 0 and 100")
+        return marks
+    
+    @staticmethod
+    def pair_courses(courses, marks):
+        """Course slots and validated marks; a repeated course is dropped with its mark"""
+        courses = courses or []
+        marks = marks or []
+        if len(courses) != len(marks):
+            raise ValueError(f"{len(courses)} course(s) but {len(marks)} mark(s)")
+        slots = {}
+        kept = []
+        for course_id, mark in zip(courses, marks):
+            if course_id not in slots:
+                slots[sys.intern(course_id)] = len(kept)
+                kept.append(Student.validate_marks(mark))
+        return slots, kept
     
     def display_records(self):
         """Display student record"""
         print(f"\n{'='*50}")
         print(f"Student Email: {self.email_address}")
         print(f"Name: {self.first_name} {self.last_name}")
-        print(f"Courses Enrolled: {len(self.courses)}")
-        if self.courses:
+        print(f"Courses Enrolled: {len(self._course_slots)}")
+        if self._course_slots:
+            grades = self.grades
             for i, course in enumerate(self.courses):
-                grade = self.grades[i] if i < len(self.grades) else 'N/A'
+                grade = grades[i] if i < len(grades) else 'N/A'
                 mark = self.marks[i] if i < len(self.marks) else 'N/A'
                 print(f"  {course}: Grade {grade}, Marks {mark}")
         print(f"{'='*50}")
@@ -30,9 +105,10 @@ class Student:
     def check_my_grades(self):
         """Display student grades"""
         print(f"\nGrades for {self.first_name} {self.last_name}:")
-        if self.courses:
+        if self._course_slots:
+            grades = self.grades
             for i, course in enumerate(self.courses):
-                grade = self.grades[i] if i < len(self.grades) else 'N/A'
+                grade = grades[i] if i < len(grades) else 'N/A'
                 print(f"  {course}: {grade}")
         else:
             print("  No courses enrolled")
@@ -40,55 +116,119 @@ class Student:
     def check_my_marks(self):
         """Display student marks"""
         print(f"\nMarks for {self.first_name} {self.last_name}:")
-        if self.courses:
+        if self._course_slots:
             for i, course in enumerate(self.courses):
                 mark = self.marks[i] if i < len(self.marks) else 'N/A'
                 print(f"  {course}: {mark}")
         else:
             print("  No courses enrolled")
     
+    def attach(self, observer):
+        """Register a StudentObserver to be told about enrollment changes"""
+        if observer not in self._observers:
+            # Students indexed alike share one tuple rather than holding a copy each
+            self._observers = observer.joined(self._observers)
+    
+    def detach(self, observer):
+        """Stop notifying a StudentObserver"""
+        self._observers = tuple(o for o in self._observers if o is not observer)
+    
+    def rename(self, first_name=None, last_name=None):
+        """Change the student's first and/or last name"""
+        old_first_name, old_last_name = self.first_name, self.last_name
+        if first_name is not None:
+            self.first_name = first_name
+        if last_name is not None:
+            self.last_name = last_name
+        for observer in self._observers:
+            observer.on_renamed(self, old_first_name, old_last_name)
+    
+    def has_course(self, course_id):
+        """Check enrollment in O(1)"""
+        return course_id in self._course_slots
+    
+    def course_slot(self, course_id):
+        """Return the position of a course in marks/grades, or None"""
+        return self._course_slots.get(course_id)
+    
+    def get_marks(self, course_id):
+        """Return marks for a course, or None if not enrolled"""
+        idx = self._course_slots.get(course_id)
+        return self.marks[idx] if idx is not None else None
+    
+    def get_grade(self, course_id):
+        """Return the letter grade for a course, or None if not enrolled"""
+        marks = self.get_marks(course_id)
+        return Grades.calculate_grade(marks) if marks is not None else None
+    
     def add_course(self, course_id, marks=0):
         """Add a course to student's record"""
-        if course_id not in self.courses:
-            self.courses.append(course_id)
+        if course_id not in self._course_slots:
+            marks = self.validate_marks(marks)
+            course_id = sys.intern(course_id)
+            self._course_slots[course_id] = len(self.marks)
             self.marks.append(marks)
-            grade = Grades.calculate_grade(marks)
-            self.grades.append(grade)
+            self.invalidate_aggregates()
+            for observer in self._observers:
+                observer.on_course_added(self, course_id, marks)
             return True
         return False
     
     def remove_course(self, course_id):
         """Remove a course from student's record"""
-        if course_id in self.courses:
-            idx = self.courses.index(course_id)
-            self.courses.pop(idx)
-            self.marks.pop(idx)
-            self.grades.pop(idx)
+        idx = self._course_slots.pop(course_id, None)
+        if idx is not None:
+            marks = self.marks.pop(idx)
+            self.invalidate_aggregates()
+            # Courses after the removed one move up one slot
+            for other, slot in self._course_slots.items():
+                if slot > idx:
+                    self._course_slots[other] = slot - 1
+            for observer in self._observers:
+                observer.on_course_removed(self, course_id, marks)
             return True
         return False
     
     def update_marks(self, course_id, new_marks):
         """Update marks for a specific course"""
-        if course_id in self.courses:
-            idx = self.courses.index(course_id)
+        idx = self._course_slots.get(course_id)
+        if idx is not None:
+            new_marks = self.validate_marks(new_marks)
+            old_marks = self.marks[idx]
             self.marks[idx] = new_marks
-            self.grades[idx] = Grades.calculate_grade(new_marks)
+            self.invalidate_aggregates()
+            for observer in self._observers:
+                observer.on_marks_updated(self, course_id, old_marks, new_marks)
             return True
         return False
     
+    def invalidate_aggregates(self):
+        """Forget cached average and GPA so they are recomputed on next access"""
+        self._average = None
+        self._gpa = None
+    
+    def get_course_count(self):
+        """Number of enrolled courses"""
+        return len(self._course_slots)
+    
     def get_average_marks(self):
         """Calculate average marks across all courses"""
-        if self.marks:
-            return sum(self.marks) / len(self.marks)
-        return 0
+        if self._average is None:
+            self._average = sum(self.marks) / len(self.marks) if self.marks else 0
+        return self._average
     
     def get_gpa(self):
         """Calculate GPA based on grades"""
-        grade_points = {'A': 4.0, 'B': 3.0, 'C': 2.0, 'D': 1.0, 'F': 0.0}
-        if self.grades:
-            total_points = sum(grade_points.get(g, 0) for g in self.grades)
-            return total_points / len(self.grades)
-        return 0.0
+        # Another app may have switched the process-wide scale since
+        if self._gpa is None or self._gpa_scale is not Grades.scale:
+            self._gpa_scale = Grades.scale
+            grades = self.grades
+            if grades:
+                total_points = sum(Grades.scale.grade_points(g) for g in grades)
+                self._gpa = total_points / len(grades)
+            else:
+                self._gpa = 0.0
+        return self._gpa
     
     def to_dict(self):
         """Convert student object to dictionary for CSV"""
@@ -101,6 +241,27 @@ class Student:
             'marks': ','.join(map(str, self.marks))
         }
     
+    def to_record(self):
+        """Plain tuple for binary snapshots: names, course IDs and raw marks bytes"""
+        return (self.email_address, self.first_name, self.last_name,
+                tuple(self._course_slots), self.marks.tobytes())
+    
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild a student from to_record() output without re-validating marks"""
+        email_address, first_name, last_name, courses, marks = record
+        student = cls.__new__(cls)
+        student.email_address = email_address
+        student.first_name = first_name
+        student.last_name = last_name
+        student._course_slots = {sys.intern(c): i for i, c in enumerate(courses)}
+        student.marks = array('B', marks)
+        student._observers = ()
+        student._average = None
+        student._gpa = None
+        student._gpa_scale = None
+        return student
+    
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.email_address})"
     
@@ -0,0 +1,382 @@
+"""
+Asyncio HTTP/JSON API over the in-memory CheckMyGrade store (standard library only).
+    
+    python server.py [--data-dir DIR] [--storage csv|mmap|sqlite] [--journal] [--port 8080]
+
+Read endpoints are answered from the loaded tables:
+    
+    GET  /students/<email>          record with per-course marks, grades, average and GPA
+    GET  /students/<email>/grades   letter grade per course and GPA
+    GET  /courses/<course_id>       course, enrolled students and marks statistics
+    GET  /stats                     marks statistics over all students
+
+Write endpoints need a token from POST /login for a professor or admin:
+    
+    POST /login                     {"email", "password"} -> {"token", "role"}
+    POST /students                  {"email_address", "first_name", "last_name",
+                                     "password", "courses", "marks"}
+    PUT  /students/<email>/marks    {"course_id", "marks"}
+
+Writes are sent as "Authorization: Bearer <token>".
+"""
+import argparse
+import asyncio
+import json
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote
+from models.student import Student
+from models.login_user import LoginUser
+from utils.bulk_import import student_from_row
+from main import CheckMyGradeApp
+
+class HTTPError(Exception):
+    """A request that fails with an HTTP status and a message"""
+    
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class GradeServer:
+    """HTTP server answering reads concurrently and serializing writes
+    
+    Every request runs on one event loop. Reads only look at the in-memory
+    models, so any number are served while a commit is being written.
+    Writes are queued to a single writer task, which applies each waiting
+    change to the models and then commits the whole batch with one save
+    on a dedicated persistence thread. A write is answered once its batch
+    is durable. The app should be created with save_delay=None, so changes
+    are committed only by the writer task and never on the event loop.
+    """
+    
+    MAX_BODY = 1 << 20
+    WRITE_ROLES = ('professor', 'admin')
+    STATUS_TEXT = {
+        200: 'OK', 201: 'Created', 400: 'Bad Request', 401: 'Unauthorized', 403: 'Forbidden',
+        404: 'Not Found', 405: 'Method Not Allowed', 409: 'Conflict', 413: 'Payload Too Large',
+        500: 'Internal Server Error',
+    }
+    
+    def __init__(self, app):
+        self.app = app
+        self.sessions = {}  # token -> LoginUser
+        self.writes = None  # queue of (change, future), created on the running loop
+        self.persist_executor = ThreadPoolExecutor(max_workers=1)  # the one persistence path
+        self.requests = 0
+        self.commits = 0
+        self._server = None
+        self._writer_task = None
+        self._connections = set()
+    
+    # ==================== LIFECYCLE ====================
+    
+    async def start(self, host='127.0.0.1', port=8080):
+        """Load every table, start the writer task and listen; return the bound port"""
+        # A lazy table load inside a request would stall every other request
+        self.app.load_all_data()
+        self.writes = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._write_loop())
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[1]
+    
+    async def stop(self):
+        """Stop listening, close connections and commit anything still pending"""
+        self._server.close()
+        for writer in list(self._connections):
+            writer.close()
+        await self._server.wait_closed()
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+        await asyncio.get_running_loop().run_in_executor(self.persist_executor,
+                                                         self.app.close)
+        self.persist_executor.shutdown()
+    
+    # ==================== HTTP ====================
+    
+    async def _handle_connection(self, reader, writer):
+        """Serve requests on one keep-alive connection until it closes"""
+        self._connections.add(writer)
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as e:
+                    self._write_response(writer, e.status, {'error': str(e)}, False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, target, headers, body, keep_alive = request
+                status, payload = await self.dispatch(method, target, headers, body)
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+    
+    async def _read_request(self, reader):
+        """Parse one request; return (method, target, headers, body, keep_alive) or None at EOF"""
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, version = line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > self.MAX_BODY:
+            raise HTTPError(413, "Request body is too large")
+        body = await reader.readexactly(length) if length > 0 else b''
+        
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+        return method, target, headers, body, keep_alive
+    
+    def _write_response(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {self.STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+    
+    # ==================== ROUTING ====================
+    
+    async def dispatch(self, method, target, headers, body):
+        """Route one request; return (status, JSON payload)"""
+        self.requests += 1
+        path = target.split('?', 1)[0]
+        parts = [unquote(part) for part in path.strip('/').split('/')]
+        try:
+            if method == 'GET':
+                return 200, self.read(parts)
+            if method == 'POST' and parts == ['login']:
+                return 200, self.login(self._json(body))
+            if method == 'POST' and parts == ['students']:
+                self.authorize(headers)
+                data = self._json(body)
+                return 201, await self.submit(lambda: self.add_student(data))
+            if method == 'PUT' and len(parts) == 3 and parts[0] == 'students' and parts[2] == 'marks':
+                self.authorize(headers)
+                data = self._json(body)
+                return 200, await self.submit(lambda: self.update_marks(parts[1], data))
+            if method in ('POST', 'PUT'):
+                raise HTTPError(404, "Not found")
+            raise HTTPError(405, f"Method {method} is not allowed")
+        except HTTPError as e:
+            return e.status, {'error': str(e)}
+        except (ValueError, TypeError) as e:
+            # Invalid field values rejected by the models
+            return 400, {'error': str(e)}
+        except Exception as e:
+            print(f"Error handling {method} {path}: {e}")
+            return 500, {'error': "Internal server error"}
+    
+    @staticmethod
+    def _json(body):
+        try:
+            data = json.loads(body or b'{}')
+        except ValueError:
+            raise HTTPError(400, "Request body is not valid JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return data
+    
+    # ==================== READS ====================
+    
+    def read(self, parts):
+        """Answer a GET from the in-memory tables"""
+        if parts[0] == 'students' and len(parts) in (2, 3):
+            student = self.app.find_student(parts[1])
+            if student is None:
+                raise HTTPError(404, "Student not found")
+            if len(parts) == 2:
+                return self.student_json(student)
+            if parts[2] == 'grades':
+                return {'email_address': student.email_address,
+                        'grades': dict(zip(student.courses, student.grades)),
+                        'gpa': round(student.get_gpa(), 2)}
+        elif parts[0] == 'courses' and len(parts) == 2:
+            return self.course_report(parts[1])
+        elif parts == ['stats']:
+            return self.statistics()
+        raise HTTPError(404, "Not found")
+    
+    @staticmethod
+    def student_json(student):
+        """A student's record with marks, grades and aggregates"""
+        return {
+            'email_address': student.email_address,
+            'first_name': student.first_name,
+            'last_name': student.last_name,
+            'courses': [{'course_id': course_id, 'marks': marks, 'grade': grade}
+                        for course_id, marks, grade in zip(student.courses, student.marks, student.grades)],
+            'average_marks': round(student.get_average_marks(), 2),
+            'gpa': round(student.get_gpa(), 2),
+        }
+    
+    def course_report(self, course_id):
+        """A course with its enrolled students from the enrollment index"""
+        course = self.app.find_course(course_id)
+        if course is None:
+            raise HTTPError(404, "Course not found")
+        histogram = self.app.marks_histogram.course(course_id)
+        return {
+            'course': course.to_dict(),
+            'students': [{'email_address': s.email_address,
+                          'name': f"{s.first_name} {s.last_name}",
+                          'marks': s.get_marks(course_id),
+                          'grade': s.get_grade(course_id)}
+                         for s in self.app.enrollments.students_in(course_id)],
+            'average_marks': histogram.mean(),
+            'median_marks': histogram.median(),
+        }
+    
+    def statistics(self):
+        """Marks statistics from the live histogram"""
+        histogram = self.app.marks_histogram.overall
+        return {
+            'students': len(self.app.students),
+            'average_marks': histogram.mean(),
+            'median_marks': histogram.median(),
+            'p90_marks': histogram.percentile(90),
+            'highest_marks': histogram.max(),
+            'lowest_marks': histogram.min(),
+        }
+    
+    # ==================== AUTHENTICATION ====================
+    
+    def login(self, data):
+        """Check a password and issue a session token"""
+        user = self.app.users.get(str(data.get('email') or ''))
+        if user is None or not LoginUser.verify_password(str(data.get('password') or ''), user.password):
+            raise HTTPError(401, "Invalid email or password")
+        token = secrets.token_urlsafe(24)
+        self.sessions[token] = user
+        return {'token': token, 'role': user.role}
+    
+    def authorize(self, headers):
+        """The logged-in user behind a Bearer token, who must be allowed to write"""
+        scheme, _, token = headers.get('authorization', '').partition(' ')
+        user = self.sessions.get(token.strip()) if scheme.lower() == 'bearer' else None
+        if user is None:
+            raise HTTPError(401, "Login required")
+        if user.role not in self.WRITE_ROLES:
+            raise HTTPError(403, "Only professors and admins can change records")
+        return user
+    
+    # ==================== WRITES ====================
+    
+    async def submit(self, change):
+        """Queue a change for the writer task; return its result once committed"""
+        future = asyncio.get_running_loop().create_future()
+        await self.writes.put((change, future))
+        return await future
+    
+    async def _write_loop(self):
+        """Apply queued changes in batches, one durable commit per batch"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.writes.get()]
+            while not self.writes.empty():
+                batch.append(self.writes.get_nowait())
+            
+            results = []
+            for change, future in batch:
+                try:
+                    results.append((future, change(), None))
+                except Exception as e:
+                    results.append((future, None, e))
+            
+            try:
+                await loop.run_in_executor(self.persist_executor, self.app.scheduler.flush)
+                self.commits += 1
+            except Exception as e:
+                print(f"Error committing changes: {e}")
+                failure = HTTPError(500, "Changes could not be saved")
+                results = [(future, None, error or failure) for future, _, error in results]
+            
+            for future, result, error in results:
+                if future.done():
+                    continue  # the client went away
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+    
+    def add_student(self, data):
+        """Validate and add a student with a login"""
+        student, password = student_from_row(data)
+        email = student.email_address
+        if email in self.app.students or email in self.app.users:
+            raise HTTPError(409, "A student with this email already exists")
+        unknown = [c for c in student.courses if c not in self.app.courses]
+        if unknown:
+            raise HTTPError(400, f"Unknown course(s): {', '.join(unknown)}")
+        if not password:
+            raise HTTPError(400, "Missing password")
+        self.app.check_storable(student)
+        
+        self.app.students.add(student)
+        self.app.users.add(LoginUser(email, LoginUser.encrypt_password(str(password)), 'student'))
+        self.app.record_changes(('students', email, 'upsert'), ('users', email, 'upsert'))
+        return self.student_json(student)
+    
+    def update_marks(self, email, data):
+        """Set one student's marks for one course"""
+        student = self.app.find_student(email)
+        if student is None:
+            raise HTTPError(404, "Student not found")
+        marks = Student.validate_marks(data.get('marks'))
+        if not student.update_marks(str(data.get('course_id') or ''), marks):
+            raise HTTPError(404, "Student is not enrolled in this course")
+        self.app.record_change('students', email)
+        return self.student_json(student)
+
+def main(argv=None):
+    """Serve the API until interrupted"""
+    parser = argparse.ArgumentParser(description="CheckMyGrade HTTP/JSON API")
+    parser.add_argument('--data-dir', default='data')
+    parser.add_argument('--storage', choices=CheckMyGradeApp.STORAGE_BACKENDS, default='csv')
+    parser.add_argument('--journal', action='store_true')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    args = parser.parse_args(argv)
+    
+    app = CheckMyGradeApp(args.data_dir, journaled=args.journal, storage=args.storage, save_delay=None)
+    server = GradeServer(app)
+    
+    async def serve():
+        port = await server.start(args.host, args.port)
+        print(f"Serving on http://{args.host}:{port}", flush=True)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+    
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print("Server stopped")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
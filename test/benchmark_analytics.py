@@ -0,0 +1,66 @@
+"""
+Script to compare NumPy analytics against the per-object Python loops
+"""
+import os
+import sys
+import time
+import statistics
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.student import Student
+from utils.analytics import MarksMatrix
+
+COURSES = ['DATA200', 'CS146', 'CS149', 'MATH161', 'PHYS50', 'ENGL1A']
+
+def build_students(num_students):
+    """Students with three courses each and spread-out marks"""
+    students = []
+    for i in range(num_students):
+        courses = [COURSES[(i + j) % len(COURSES)] for j in range(3)]
+        marks = [(i * 7 + j * 13) % 101 for j in range(3)]
+        students.append(Student(f"student{i}@mycsu.edu", f"First{i}", f"Last{i}",
+                                courses=courses, marks=marks))
+    return students
+
+def loop_analytics(students):
+    """Course statistics and GPA the way main.py computes them per object"""
+    for course_id in COURSES:
+        course_marks = [s.get_marks(course_id) for s in students if s.has_course(course_id)]
+        statistics.mean(course_marks)
+        statistics.median(course_marks)
+        statistics.pstdev(course_marks)
+    for student in students:
+        student.invalidate_aggregates()
+        student.get_average_marks()
+        student.get_gpa()
+
+def numpy_analytics(matrix):
+    """The same results from the marks matrix"""
+    matrix.course_statistics()
+    matrix.grade_distribution()
+    matrix.student_averages()
+    matrix.student_gpa()
+
+def run_benchmark(num_students):
+    """Time both approaches for one roster size"""
+    students = build_students(num_students)
+    
+    start_time = time.perf_counter()
+    loop_analytics(students)
+    loop_time = time.perf_counter() - start_time
+    
+    start_time = time.perf_counter()
+    matrix = MarksMatrix(students)
+    build_time = time.perf_counter() - start_time
+    
+    start_time = time.perf_counter()
+    numpy_analytics(matrix)
+    numpy_time = time.perf_counter() - start_time
+    
+    print(f"{num_students} students: Python loops {loop_time:.2f} s, "
+          f"matrix build {build_time:.2f} s, NumPy analytics {numpy_time:.3f} s "
+          f"({loop_time / numpy_time:.0f}x)")
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100000, 1000000]
+    for size in sizes:
+        run_benchmark(size)
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""
+Script to compare the wall-clock time of one-shot CLI commands with the interactive app
+"""
+import os
+import sys
+import time
+import shutil
+import subprocess
+import tempfile
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from models.student import Student
+from models.course import Course
+from utils.csv_handler import CSVHandler
+
+COURSES = ['DATA200', 'CS146', 'CS149', 'MATH161', 'PHYS50', 'ENGL1A']
+
+def wall_clock(command, stdin=None, cwd=None):
+    """Seconds for one process run, output discarded"""
+    start_time = time.perf_counter()
+    subprocess.run(command, input=stdin, cwd=cwd, text=True, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start_time
+
+def run_benchmark(num_students):
+    """Time a student lookup through the menus, then the CLI commands"""
+    work_dir = tempfile.mkdtemp()
+    data_dir = os.path.join(work_dir, 'data')
+    try:
+        handler = CSVHandler(data_dir)
+        handler.save_courses([Course(course_id, course_id, 3) for course_id in COURSES])
+        handler.save_students(
+            Student(f"student{i}@mycsu.edu", f"First{i}", f"Last{i}",
+                    courses=[COURSES[(i + j) % len(COURSES)] for j in range(3)],
+                    marks=[(i * 7 + j * 13) % 101 for j in range(3)])
+            for i in range(num_students))
+        email = f"student{num_students // 2}@mycsu.edu"
+        cli = [sys.executable, os.path.join(ROOT, 'cli.py'), '--data-dir', data_dir]
+        
+        print(f"\n{num_students} students:")
+        # The interactive app's startup before lazy loading: every table and index
+        full_load = wall_clock([sys.executable, '-c',
+                                f"import sys; sys.path.insert(0, {ROOT!r}); "
+                                f"from main import CheckMyGradeApp; "
+                                f"CheckMyGradeApp({data_dir!r}, lazy=False).print_student_report({email!r})"])
+        print(f"  full load + student report {full_load:7.2f} s")
+        # Reports > Generate reports > Student-wise report, then Save & Exit (writes snapshots)
+        interactive = wall_clock([sys.executable, os.path.join(ROOT, 'main.py')],
+                                 stdin=f"5\n1\n3\n{email}\n6\n", cwd=work_dir)
+        print(f"  interactive student report {interactive:7.2f} s")
+        for name, args in (('student get', ['student', 'get', email]),
+                           ('course report', ['course', 'report', 'DATA200']),
+                           ('stats', ['stats'])):
+            elapsed = wall_clock(cli + args)
+            print(f"  cli {name:22s} {elapsed:7.2f} s ({full_load / elapsed:.1f}x)")
+    finally:
+        shutil.rmtree(work_dir)
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+    for size in sizes:
+        run_benchmark(size)
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Script to measure thread-safe app throughput as the number of reader/writer threads grows
+"""
+import io
+import os
+import random
+import sys
+import time
+import shutil
+import tempfile
+import threading
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.student import Student
+from models.course import Course
+from utils.csv_handler import CSVHandler
+from main import CheckMyGradeApp
+
+COURSES = ['DATA200', 'CS146', 'CS149', 'MATH161', 'PHYS50', 'ENGL1A']
+
+def worker(app, seed, num_students, write_ratio, deadline, counts):
+    """Run a mix of lookups, searches, rankings and marks updates until the deadline"""
+    rng = random.Random(seed)
+    reads = writes = 0
+    while time.perf_counter() < deadline:
+        i = rng.randrange(num_students)
+        email = f"student{i}@mycsu.edu"
+        roll = rng.random()
+        if roll < write_ratio:
+            app.set_marks(email, COURSES[i % len(COURSES)], rng.randrange(101))
+            writes += 1
+            continue
+        if roll < 0.6:
+            app.find_student(email).get_average_marks()
+        elif roll < 0.8:
+            app.prefix_search('email', f"student{i // 10}")
+        elif roll < 0.95:
+            app.sorted_students('average_marks', reverse=True, limit=10)
+        else:
+            app.find_students(f"Last{i}")
+        reads += 1
+    counts.append((reads, writes))
+
+def measure(app, num_threads, num_students, write_ratio, seconds):
+    """Operations per second with num_threads threads sharing the app"""
+    counts = []
+    deadline = time.perf_counter() + seconds
+    threads = [threading.Thread(target=worker, args=(app, t, num_students, write_ratio, deadline, counts))
+               for t in range(num_threads)]
+    start_time = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start_time
+    reads = sum(r for r, _ in counts)
+    writes = sum(w for _, w in counts)
+    return (reads + writes) / elapsed, reads, writes
+
+def run_benchmark(num_students, thread_counts=(1, 2, 4, 8), write_ratio=0.05, seconds=3):
+    """Throughput of the unlocked app on one thread, then the locked app on 1..N threads"""
+    work_dir = tempfile.mkdtemp()
+    try:
+        handler = CSVHandler(work_dir)
+        handler.save_courses([Course(course_id, course_id, 3) for course_id in COURSES])
+        handler.save_students(
+            Student(f"student{i}@mycsu.edu", f"First{i}", f"Last{i}",
+                    courses=[COURSES[(i + j) % len(COURSES)] for j in range(3)],
+                    marks=[(i * 7 + j * 13) % 101 for j in range(3)])
+            for i in range(num_students))
+        
+        print(f"\n{num_students} students, {write_ratio:.0%} writes, {seconds} s per run:")
+        # save_delay=None: changes are only marked dirty, so no run waits on disk
+        with redirect_stdout(io.StringIO()):
+            plain = CheckMyGradeApp(work_dir, save_delay=None, lazy=False)
+            locked = CheckMyGradeApp(work_dir, save_delay=None, thread_safe=True)
+        baseline, _, _ = measure(plain, 1, num_students, write_ratio, seconds)
+        print(f"  unlocked, 1 thread  {baseline:10.0f} ops/s")
+        for num_threads in thread_counts:
+            rate, reads, writes = measure(locked, num_threads, num_students, write_ratio, seconds)
+            print(f"  locked, {num_threads} thread{'s' if num_threads > 1 else ' '}  {rate:10.0f} ops/s "
+                  f"({reads} reads, {writes} writes, {rate / baseline:.2f}x unlocked)")
+    finally:
+        shutil.rmtree(work_dir)
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000]
+    for size in sizes:
+        run_benchmark(size)
\ No newline at end of file
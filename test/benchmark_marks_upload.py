@@ -0,0 +1,56 @@
+"""
+Script to time a bulk marks upload for one course against the roster size
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+import shutil
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.student import Student
+from models.course import Course
+from utils.csv_handler import CSVHandler
+from main import CheckMyGradeApp
+
+COURSES = ['DATA200', 'CS146', 'CS149', 'MATH161', 'PHYS50', 'ENGL1A']
+
+def run_benchmark(num_students, course_size, storage, journaled=False):
+    """Upload course_size marks for DATA200 in a roster of num_students"""
+    data_dir = tempfile.mkdtemp()
+    try:
+        handler = CSVHandler(data_dir)
+        handler.save_courses([Course(course_id, course_id, 3) for course_id in COURSES])
+        handler.save_students(
+            Student(f"student{i}@mycsu.edu", f"First{i}", f"Last{i}",
+                    courses=['DATA200' if i < course_size else COURSES[1 + i % 5]],
+                    marks=[(i * 7) % 101])
+            for i in range(num_students))
+        path = os.path.join(data_dir, 'marks.csv')
+        with open(path, 'w') as file:
+            file.write("email,marks\n")
+            for i in range(course_size):
+                file.write(f"student{i}@mycsu.edu,{(i * 13) % 101}\n")
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            app = CheckMyGradeApp(data_dir, journaled=journaled, storage=storage)
+            app.students  # load outside the timed upload
+            start_time = time.perf_counter()
+            summary = app.upload_course_marks('DATA200', path)
+            elapsed = time.perf_counter() - start_time
+        assert summary['updated'] == course_size
+        mode = 'journal' if journaled else storage
+        print(f"  {num_students:8d} students, {course_size} marks, {mode:7s}: {elapsed * 1000:8.1f} ms")
+        if app.database is not None:
+            app.database.close()
+        if app.student_store is not None:
+            app.student_store.close()
+    finally:
+        shutil.rmtree(data_dir)
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [5000, 100000]
+    for size in sizes:
+        for storage, journaled in (('csv', False), ('csv', True), ('sqlite', False), ('mmap', False)):
+            run_benchmark(size, min(size, 5000), storage, journaled)
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""
+Script to measure memory used per Student object
+"""
+import os
+import sys
+import tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.csv_handler import CSVHandler
+
+COURSES = ['DATA200', 'CS146', 'CS149', 'MATH161', 'PHYS50', 'ENGL1A']
+
+def measure_bytes_per_student(num_students=100000, courses_per_student=3):
+    """Build students the way load_students does and return traced bytes per student"""
+    rows = []
+    for i in range(num_students):
+        courses = [COURSES[(i + j) % len(COURSES)] for j in range(courses_per_student)]
+        marks = [str(60 + (i + j) % 40) for j in range(courses_per_student)]
+        rows.append({
+            'email_address': f"student{i}@mycsu.edu",
+            'first_name': f"First{i}",
+            'last_name': f"Last{i}",
+            'courses': ','.join(courses),
+            'grades': ','.join('C' for _ in courses),
+            'marks': ','.join(marks),
+        })
+    
+    tracemalloc.start()
+    students = [CSVHandler.row_to_student(row) for row in rows]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return current / len(students)
+
+if __name__ == "__main__":
+    num_students = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    per_student = measure_bytes_per_student(num_students)
+    print(f"{num_students} students with 3 courses each: {per_student:.0f} bytes per student")
\ No newline at end of file
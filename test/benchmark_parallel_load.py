@@ -0,0 +1,52 @@
+"""
+Script to measure multiprocess students.csv parsing against the number of workers
+"""
+import gc
+import os
+import sys
+import time
+import shutil
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.student import Student
+from utils.csv_handler import CSVHandler
+
+COURSES = ['DATA200', 'CS146', 'CS149', 'MATH161', 'PHYS50', 'ENGL1A']
+
+def run_benchmark(num_students):
+    """Time sequential parsing, then the process pool at 1, 2, 4, ... workers"""
+    data_dir = tempfile.mkdtemp()
+    try:
+        handler = CSVHandler(data_dir)
+        handler.save_students(
+            Student(f"student{i}@mycsu.edu", f"First{i}", f"Last{i}",
+                    courses=[COURSES[(i + j) % len(COURSES)] for j in range(3)],
+                    marks=[(i * 7 + j * 13) % 101 for j in range(3)])
+            for i in range(num_students))
+        
+        # CheckMyGradeApp pauses cyclic GC while loading, so do the same here
+        gc.disable()
+        cores = os.cpu_count() or 1
+        print(f"\n{num_students} students, {os.path.getsize(handler.students_file) / 1e6:.0f} MB, "
+              f"{cores} CPU core(s):")
+        start_time = time.perf_counter()
+        expected = handler.load_students()
+        sequential = time.perf_counter() - start_time
+        print(f"  sequential   {sequential:6.2f} s")
+        
+        workers = 1
+        while workers <= max(cores, 2):
+            start_time = time.perf_counter()
+            students = handler.load_students_parallel(workers)
+            elapsed = time.perf_counter() - start_time
+            assert [s.email_address for s in students] == [s.email_address for s in expected]
+            print(f"  {workers:2d} worker(s) {elapsed:6.2f} s ({sequential / elapsed:.1f}x)")
+            workers *= 2
+    finally:
+        gc.enable()
+        shutil.rmtree(data_dir)
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000000]
+    for size in sizes:
+        run_benchmark(size)
\ No newline at end of file
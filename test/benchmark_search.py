@@ -0,0 +1,54 @@
+"""
+Script to compare trigram-indexed student search against a full scan
+"""
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.student import Student
+from utils.trigram_index import TrigramIndex
+
+FIRST_NAMES = ['James', 'Mary', 'John', 'Patricia', 'Robert', 'Jennifer', 'Michael', 'Linda',
+               'William', 'Barbara', 'David', 'Elizabeth', 'Richard', 'Susan', 'Joseph', 'Jessica']
+LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis',
+              'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson']
+QUERIES = ['garcia12345', 'mary.lopez9', 'ernand', 'son9999', 'william']
+
+def scan(students, term):
+    """The original search_student loop"""
+    return [s for s in students
+            if term in s.email_address.lower()
+            or term in s.first_name.lower()
+            or term in s.last_name.lower()]
+
+def run_benchmark(num_students):
+    """Build num_students students and time both search strategies"""
+    students = []
+    for i in range(num_students):
+        first_name = FIRST_NAMES[i % len(FIRST_NAMES)]
+        last_name = LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        email = f"{first_name.lower()}.{last_name.lower()}{i}@mycsu.edu"
+        students.append(Student(email, first_name, last_name))
+    
+    index = TrigramIndex()
+    start_time = time.perf_counter()
+    for student in students:
+        index.add(student)
+    build_time = time.perf_counter() - start_time
+    print(f"{num_students} students: index built in {build_time:.2f} s")
+    
+    for term in QUERIES:
+        start_time = time.perf_counter()
+        expected = scan(students, term)
+        scan_ms = (time.perf_counter() - start_time) * 1000
+        
+        start_time = time.perf_counter()
+        found = index.search(term)
+        index_ms = (time.perf_counter() - start_time) * 1000
+        
+        assert len(found) == len(expected)
+        print(f"  '{term}': {len(found)} match(es), scan {scan_ms:.2f} ms, "
+              f"trigram index {index_ms:.3f} ms")
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
\ No newline at end of file
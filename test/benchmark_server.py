@@ -0,0 +1,126 @@
+"""
+Script to load-test the HTTP server and report requests per second and latency percentiles
+"""
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import shutil
+import subprocess
+import tempfile
+import threading
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from models.student import Student
+from models.course import Course
+from models.login_user import LoginUser
+from utils.csv_handler import CSVHandler
+
+COURSES = ['DATA200', 'CS146', 'CS149', 'MATH161', 'PHYS50', 'ENGL1A']
+
+def build_data(data_dir, num_students):
+    """Students with three courses each, plus one professor login"""
+    handler = CSVHandler(data_dir)
+    handler.save_courses([Course(course_id, course_id, 3) for course_id in COURSES])
+    handler.save_students(
+        Student(f"student{i}@mycsu.edu", f"First{i}", f"Last{i}",
+                courses=[COURSES[(i + j) % len(COURSES)] for j in range(3)],
+                marks=[(i * 7 + j * 13) % 101 for j in range(3)])
+        for i in range(num_students))
+    handler.save_users([LoginUser('prof@mycsu.edu', LoginUser.encrypt_password('secret'), 'professor')])
+
+async def send(reader, writer, method, path, body=None, token=None):
+    """One keep-alive request; return (status, payload)"""
+    data = json.dumps(body).encode() if body is not None else b''
+    head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n"
+    if token:
+        head += f"Authorization: Bearer {token}\r\n"
+    writer.write(head.encode() + b"\r\n" + data)
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b"\r\n":
+            break
+        name, _, value = line.decode().partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+async def client(port, seed, num_students, token, write_ratio, deadline, latencies):
+    """Send requests on one connection until the deadline"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        i = rng.randrange(num_students)
+        email = f"student{i}@mycsu.edu"
+        roll = rng.random()
+        if roll < write_ratio:
+            kind, request = 'write', ('PUT', f"/students/{email}/marks",
+                                      {'course_id': COURSES[i % len(COURSES)], 'marks': rng.randrange(101)})
+        elif roll < 0.5:
+            kind, request = 'student', ('GET', f"/students/{email}", None)
+        elif roll < 0.95:
+            kind, request = 'grades', ('GET', f"/students/{email}/grades", None)
+        else:
+            kind, request = 'stats', ('GET', "/stats", None)
+        start_time = time.perf_counter()
+        status, _ = await send(reader, writer, *request, token=token)
+        latencies.setdefault(kind, []).append(time.perf_counter() - start_time)
+        assert status == 200, (request, status)
+    writer.close()
+
+def percentile(values, p):
+    """Nearest-rank percentile of a list of latencies"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+async def load_test(port, num_students, connections, seconds, write_ratio):
+    """Log in as the professor, then run all connections against the server"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    _, login = await send(reader, writer, 'POST', '/login', {'email': 'prof@mycsu.edu', 'password': 'secret'})
+    writer.close()
+    
+    latencies = {}
+    start_time = time.perf_counter()
+    await asyncio.gather(*(client(port, c, num_students, login['token'], write_ratio,
+                                  start_time + seconds, latencies)
+                           for c in range(connections)))
+    elapsed = time.perf_counter() - start_time
+    all_latencies = [x for values in latencies.values() for x in values]
+    print(f"  {connections} connections, {seconds} s, {write_ratio:.0%} writes: "
+          f"{len(all_latencies) / elapsed:8.0f} requests/s")
+    for kind, values in sorted(latencies.items()) + [('all', all_latencies)]:
+        print(f"    {kind:8s} {len(values):7d} requests  p50 {percentile(values, 50) * 1000:7.2f} ms  "
+              f"p99 {percentile(values, 99) * 1000:7.2f} ms")
+
+def run_benchmark(num_students, storage='csv', connections=50, seconds=5, write_ratio=0.05):
+    """Start server.py on a generated data set and load-test it"""
+    work_dir = tempfile.mkdtemp()
+    server = None
+    try:
+        build_data(work_dir, num_students)
+        server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'server.py'),
+                                   '--data-dir', work_dir, '--storage', storage, '--port', '0'],
+                                  stdout=subprocess.PIPE, text=True)
+        for line in server.stdout:
+            if line.startswith('Serving on'):
+                port = int(line.rsplit(':', 1)[1])
+                break
+        # Keep reading the commit log so a full pipe never blocks the server
+        threading.Thread(target=server.stdout.read, daemon=True).start()
+        print(f"\n{num_students} students, {storage} storage:")
+        asyncio.run(load_test(port, num_students, connections, seconds, write_ratio))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        shutil.rmtree(work_dir)
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000]
+    for size in sizes:
+        for storage in ('csv', 'sqlite'):
+            run_benchmark(size, storage)
\ No newline at end of file
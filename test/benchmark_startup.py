@@ -0,0 +1,73 @@
+"""
+Script to compare startup from CSV files against startup from binary snapshots
+"""
+import gc
+import os
+import sys
+import time
+import shutil
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.student import Student
+from models.login_user import LoginUser
+from utils.csv_handler import CSVHandler
+from utils.snapshot import SnapshotStore
+from main import CheckMyGradeApp
+
+COURSES = ['DATA200', 'CS146', 'CS149', 'MATH161', 'PHYS50', 'ENGL1A']
+
+def write_roster(data_dir, num_students):
+    """Students with three courses each, plus one login per student"""
+    handler = CSVHandler(data_dir)
+    password = LoginUser.encrypt_password("password123")
+    handler.save_students(
+        Student(f"student{i}@mycsu.edu", f"First{i}", f"Last{i}",
+                courses=[COURSES[(i + j) % len(COURSES)] for j in range(3)],
+                marks=[(i * 7 + j * 13) % 101 for j in range(3)])
+        for i in range(num_students))
+    handler.save_users(LoginUser(f"student{i}@mycsu.edu", password) for i in range(num_students))
+    return handler
+
+def timed(fn):
+    """Seconds taken by fn(); the result is dropped and collected before returning"""
+    start_time = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start_time
+    gc.collect()  # students and their indexes reference each other
+    return elapsed
+
+def run_benchmark(num_students):
+    """Time table loads and full (eager) app startup for one roster size"""
+    data_dir = tempfile.mkdtemp()
+    try:
+        handler = write_roster(data_dir, num_students)
+        snapshots = SnapshotStore(data_dir)
+        
+        csv_time = timed(lambda: (handler.load_students(), handler.load_users()))
+        start_time = time.perf_counter()
+        app = CheckMyGradeApp(data_dir, lazy=False)
+        csv_startup = time.perf_counter() - start_time
+        app.save_all_data()  # the first save after a CSV startup writes the snapshots
+        del app
+        gc.collect()
+        
+        snapshot_time = timed(lambda: (snapshots.load('students', handler.students_file),
+                                       snapshots.load('users', handler.login_file)))
+        snapshot_startup = timed(lambda: CheckMyGradeApp(data_dir, lazy=False))
+        
+        csv_bytes = os.path.getsize(handler.students_file) + os.path.getsize(handler.login_file)
+        snapshot_bytes = (os.path.getsize(snapshots.path('students')) +
+                          os.path.getsize(snapshots.path('users')))
+        print(f"\n{num_students} students:")
+        print(f"  Table loads: CSV {csv_time:.2f} s ({csv_bytes / 1e6:.0f} MB), "
+              f"snapshot {snapshot_time:.2f} s ({snapshot_bytes / 1e6:.0f} MB), "
+              f"{csv_time / snapshot_time:.1f}x")
+        print(f"  App startup (including indexes): CSV {csv_startup:.2f} s, "
+              f"snapshot {snapshot_startup:.2f} s")
+    finally:
+        shutil.rmtree(data_dir)
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100000, 1000000]
+    for size in sizes:
+        run_benchmark(size)
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+Script to compare the latency of persisting one changed student per storage backend
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.student import Student
+from utils.csv_handler import CSVHandler
+from utils.mmap_store import MmapStudentStore
+from utils.sqlite_handler import SQLiteHandler
+
+COURSES = ['DATA200', 'CS146', 'CS149', 'MATH161', 'PHYS50', 'ENGL1A']
+MUTATIONS = 20
+
+def build_students(num_students):
+    """Students with three courses each"""
+    return [Student(f"student{i}@mycsu.edu", f"First{i}", f"Last{i}",
+                    courses=[COURSES[(i + j) % len(COURSES)] for j in range(3)],
+                    marks=[(i * 7 + j * 13) % 101 for j in range(3)])
+            for i in range(num_students)]
+
+def time_mutations(students, persist):
+    """Average ms to change one student's marks and persist the change"""
+    start_time = time.perf_counter()
+    for i in range(MUTATIONS):
+        student = students[(i * 7919) % len(students)]
+        course_id = student.courses[0]
+        student.update_marks(course_id, (student.get_marks(course_id) + 1) % 101)
+        persist(student)
+    return (time.perf_counter() - start_time) / MUTATIONS * 1000
+
+def run_benchmark(num_students):
+    """Time loads and single-student saves for CSV, SQLite and the mmap store"""
+    students = build_students(num_students)
+    data_dir = tempfile.mkdtemp()
+    try:
+        csv_handler = CSVHandler(data_dir)
+        database = SQLiteHandler(data_dir)
+        store = MmapStudentStore(data_dir)
+        csv_handler.save_students(students)
+        database.save_students(students)
+        store.save_students(students)
+        
+        print(f"\n{num_students} students:")
+        for name, load in (('CSV', csv_handler.load_students),
+                           ('SQLite', database.load_students),
+                           ('mmap', store.load_students)):
+            start_time = time.perf_counter()
+            load()
+            print(f"  {name:7s} load all: {time.perf_counter() - start_time:8.2f} s")
+        
+        def persist_mmap(student):
+            store.put_student(student)
+            store.flush()
+        
+        for name, persist in (('CSV', lambda s: csv_handler.save_students(students)),
+                              ('SQLite', lambda s: database.save_changes('students', [s], [])),
+                              ('mmap', persist_mmap)):
+            print(f"  {name:7s} save one change: {time_mutations(students, persist):8.2f} ms")
+        database.close()
+        store.close()
+    finally:
+        shutil.rmtree(data_dir)
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100000, 1000000]
+    for size in sizes:
+        run_benchmark(size)
\ No newline at end of file
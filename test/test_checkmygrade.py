@@ -1,15 +1,37 @@
 import unittest
+import asyncio
+import contextlib
+import io
+import json
+import statistics
 import time
 import os
 import shutil
 import sys
+import threading
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models.student import Student
 from models.course import Course
 from models.professor import Professor
 from models.login_user import LoginUser
-from models.grades import Grades
+from models.grades import Grades, GradeScale
 from utils.csv_handler import CSVHandler
+from utils.repository import Repository
+from utils.rw_lock import ReadWriteLock
+from utils.journal import Journal
+from utils.snapshot import SnapshotStore
+from utils.mmap_store import MmapStudentStore
+from utils.sqlite_handler import SQLiteHandler
+from utils.save_scheduler import SaveScheduler
+from utils.enrollment_index import EnrollmentIndex
+from utils.trigram_index import TrigramIndex
+from utils.prefix_index import PrefixIndex
+from utils.sorted_view import SortedView
+from utils.marks_histogram import MarksHistogram
+from utils import analytics
+from main import CheckMyGradeApp
+import cli
+from server import GradeServer
 
 class TestCheckMyGrade(unittest.TestCase):
     """Comprehensive unit tests for CheckMyGrade application"""
@@ -381,6 +403,1249 @@ class TestCheckMyGrade(unittest.TestCase):
         self.assertEqual(Grades.calculate_grade(75), 'C')
         self.assertEqual(Grades.calculate_grade(65), 'D')
         self.assertEqual(Grades.calculate_grade(55), 'F')
+    
+    # ==================== REPOSITORY TESTS ====================
+    
+    def test_repository_add_and_find(self):
+        """Test indexed lookup in repository"""
+        repo = Repository('email_address')
+        for i in range(1000):
+            repo.add(Student(f"student{i}@test.com", f"First{i}", f"Last{i}"))
+        
+        self.assertEqual(len(repo), 1000)
+        self.assertIn('student500@test.com', repo)
+        self.assertEqual(repo.get('student500@test.com').first_name, 'First500')
+        self.assertIsNone(repo.get('missing@test.com'))
+    
+    def test_repository_rejects_duplicates(self):
+        """Test that repository keys are unique"""
+        repo = Repository('course_id')
+        self.assertTrue(repo.add(Course('DATA200', 'Data Science')))
+        self.assertFalse(repo.add(Course('DATA200', 'Duplicate')))
+        self.assertEqual(repo.get('DATA200').course_name, 'Data Science')
+    
+    def test_repository_remove_keeps_order(self):
+        """Test removing from repository keeps index consistent"""
+        repo = Repository('email_id')
+        for i in range(5):
+            repo.add(LoginUser(f"user{i}@test.com", 'pass', 'student'))
+        
+        removed = repo.remove('user2@test.com')
+        self.assertEqual(removed.email_id, 'user2@test.com')
+        self.assertNotIn('user2@test.com', repo)
+        self.assertIsNone(repo.remove('user2@test.com'))
+        self.assertEqual([u.email_id for u in repo],
+                         ['user0@test.com', 'user1@test.com', 'user3@test.com', 'user4@test.com'])
+    
+    # ==================== JOURNAL TESTS ====================
+    
+    def test_journal_append_and_replay(self):
+        """Test that journal records replay in write order"""
+        journal = Journal(os.path.join(self.test_data_dir, 'test_journal.log'))
+        journal.truncate()
+        journal.append('courses', 'upsert', 'DATA200', {'course_id': 'DATA200'})
+        journal.append('courses', 'delete', 'DATA200')
+        
+        self.assertEqual(len(journal), 2)
+        entries = list(journal.replay())
+        self.assertEqual([e['op'] for e in entries], ['upsert', 'delete'])
+        
+        journal.truncate()
+        self.assertEqual(len(journal), 0)
+        self.assertEqual(list(journal.replay()), [])
+    
+    def test_journaled_app_replays_changes(self):
+        """Test that journaled changes survive a restart without a CSV rewrite"""
+        data_dir = os.path.join(self.test_data_dir, 'journaled')
+        app = CheckMyGradeApp(data_dir, journaled=True)
+        app.students.add(Student('j@test.com', 'Jo', 'Doe'))
+        app.students.get('j@test.com').add_course('DATA200', 91)
+        app.record_change('students', 'j@test.com')
+        
+        # Nothing was written to the CSV snapshot yet
+        self.assertEqual(len(app.csv_handler.load_students()), 0)
+        self.assertEqual(len(app.journal), 1)
+        
+        reloaded = CheckMyGradeApp(data_dir, journaled=True)
+        self.assertEqual(list(reloaded.find_student('j@test.com').marks), [91])
+        
+        # Compaction folds the journal into the CSV files
+        reloaded.compact_journal()
+        self.assertEqual(len(reloaded.journal), 0)
+        self.assertEqual(len(reloaded.csv_handler.load_students()), 1)
+    
+    def test_journal_compacts_on_close(self):
+        """Test commits only append to a long journal and close() folds it into the CSV files"""
+        app = CheckMyGradeApp(os.path.join(self.test_data_dir, 'journal_close'), journaled=True)
+        app.JOURNAL_COMPACT_THRESHOLD = 3
+        for i in range(5):
+            app.courses.add(Course(f"COURSE{i}", f"Course {i}"))
+            app.record_change('courses', f"COURSE{i}")
+        self.assertEqual(len(app.journal), 5)
+        self.assertNotIn('courses', app.csv_handler.get_write_stats())
+        
+        app.close()
+        self.assertEqual(len(app.journal), 0)
+        self.assertEqual(len(app.csv_handler.load_courses()), 5)
+    
+    def test_failed_compaction_keeps_csv_and_journal(self):
+        """Test a save that fails mid-write leaves the old CSV file and the journal intact"""
+        app_dir = os.path.join(self.test_data_dir, 'journal_failed_compaction')
+        app = CheckMyGradeApp(app_dir, journaled=True)
+        app.courses.add(Course('DATA200', 'Data Science'))
+        app.mark_dirty('courses', 'DATA200')
+        app.save_all_data()
+        app.courses.add(Course('CS146', 'Data Structures'))
+        app.record_change('courses', 'CS146')
+        
+        class Unwritable(Course):
+            def to_dict(self):
+                raise OSError("disk full")
+        app.courses.add(Unwritable('CS149', 'Operating Systems'))
+        app.mark_dirty('courses', 'CS149')
+        app.compact_journal()
+        
+        self.assertEqual([c.course_id for c in app.csv_handler.load_courses()], ['DATA200'])
+        self.assertFalse(os.path.exists(app.csv_handler.courses_file + '.tmp'))
+        self.assertEqual(len(app.journal), 1)
+    
+    # ==================== DIRTY TRACKING TESTS ====================
+    
+    def test_write_stats_counters(self):
+        """Test that saves report rows and bytes written"""
+        courses = [Course(f'COURSE{i}', f'Course {i}', 3) for i in range(10)]
+        self.csv_handler.save_courses(courses)
+        
+        stats = self.csv_handler.get_write_stats('courses')
+        self.assertEqual(stats['last_rows'], 10)
+        self.assertEqual(stats['last_bytes'], os.path.getsize(self.csv_handler.courses_file))
+    
+    def test_save_skips_clean_tables(self):
+        """Test that only changed tables are rewritten"""
+        app = CheckMyGradeApp(os.path.join(self.test_data_dir, 'dirty'))
+        app.courses.add(Course('DATA200', 'Data Science'))
+        app.record_change('courses', 'DATA200')
+        
+        stats = app.csv_handler.get_write_stats()
+        self.assertIn('courses', stats)
+        self.assertNotIn('students', stats)
+        self.assertNotIn('users', stats)
+        self.assertEqual(app.dirty['courses'], set())
+        
+        # Nothing changed since, so nothing is written
+        self.assertEqual(app.save_all_data(), {})
+    
+    # ==================== SAVE SCHEDULER TESTS ====================
+    
+    def test_scheduler_batches_by_operation_count(self):
+        """Test that the scheduler commits once per batch of operations"""
+        commits = []
+        scheduler = SaveScheduler(lambda: commits.append(1), max_delay=60, max_ops=10)
+        for i in range(25):
+            scheduler.notify()
+        
+        self.assertEqual(len(commits), 2)
+        self.assertEqual(scheduler.pending, 5)
+        
+        self.assertTrue(scheduler.flush())
+        self.assertFalse(scheduler.flush())
+        stats = scheduler.stats()
+        self.assertEqual(stats['commits'], 3)
+        self.assertEqual(stats['operations'], 25)
+        self.assertEqual(stats['max_batch'], 10)
+    
+    def test_scheduler_batches_by_count_only(self):
+        """Test that max_delay=0 with max_ops > 1 commits only full batches"""
+        commits = []
+        scheduler = SaveScheduler(lambda: commits.append(1), max_delay=0, max_ops=10)
+        for i in range(15):
+            scheduler.notify()
+        
+        self.assertEqual(len(commits), 1)
+        self.assertEqual(scheduler.pending, 5)
+        self.assertIsNone(scheduler._timer)
+        self.assertTrue(scheduler.flush())
+        self.assertEqual(len(commits), 2)
+    
+    def test_scheduler_flushes_after_delay(self):
+        """Test that pending operations are committed when the window closes"""
+        commits = []
+        scheduler = SaveScheduler(lambda: commits.append(1), max_delay=0.05, max_ops=100)
+        scheduler.notify()
+        scheduler.notify()
+        self.assertEqual(commits, [])
+        
+        time.sleep(0.3)
+        self.assertEqual(commits, [1])
+        self.assertGreaterEqual(scheduler.stats()['max_latency_ms'], 50)
+    
+    def test_app_group_commit(self):
+        """Test that marks entered for a section are written in one save"""
+        app = CheckMyGradeApp(os.path.join(self.test_data_dir, 'group'),
+                              save_delay=60, save_batch=1000)
+        for i in range(20):
+            student = Student(f"s{i}@test.com", 'S', f"{i}")
+            student.add_course('DATA200', 70)
+            app.students.add(student)
+            app.record_change('students', student.email_address)
+        
+        self.assertNotIn('students', app.csv_handler.get_write_stats())
+        app.flush_changes()
+        self.assertEqual(app.csv_handler.get_write_stats('students')['saves'], 1)
+        self.assertEqual(len(app.csv_handler.load_students()), 20)
+    
+    def test_failed_commit_raises_and_stays_pending(self):
+        """Test a commit whose save fails raises and keeps its changes for the next one"""
+        app = CheckMyGradeApp(os.path.join(self.test_data_dir, 'failed_commit'), save_delay=None)
+        app.courses.add(Course('DATA200', 'Data Science'))
+        app.record_change('courses', 'DATA200')
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            app.csv_handler.save_courses = lambda courses: False
+            with self.assertRaises(OSError):
+                app.scheduler.flush()
+            self.assertEqual(app.scheduler.pending, 1)
+            self.assertEqual(app.dirty['courses'], {'DATA200'})
+            
+            del app.csv_handler.save_courses
+            self.assertTrue(app.scheduler.flush())
+        self.assertEqual(len(app.csv_handler.load_courses()), 1)
+    
+    def test_app_save_window_waits_for_writers(self):
+        """Test the timer commit of a save window never reads tables mid-change"""
+        app_dir = os.path.join(self.test_data_dir, 'save_window')
+        CSVHandler(app_dir).save_students([Student('a@test.com', 'A', 'Able', courses=['DATA200'], marks=[50])])
+        app = CheckMyGradeApp(app_dir, save_delay=0.05, save_batch=100)
+        self.assertIsNotNone(app.rwlock)
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(app.set_marks('a@test.com', 'DATA200', 60))
+            with app.writing():
+                time.sleep(0.3)
+                self.assertEqual(app.scheduler.commits, 0)
+            deadline = time.perf_counter() + 5
+            while app.scheduler.commits == 0 and time.perf_counter() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(app.scheduler.commits, 1)
+        self.assertEqual(CSVHandler(app_dir).find_student('a@test.com').get_marks('DATA200'), 60)
+    
+    # ==================== STREAMING TESTS ====================
+    
+    def test_iter_students_is_lazy(self):
+        """Test that iter_students yields students one at a time"""
+        students = [Student(f"student{i}@test.com", f"First{i}", f"Last{i}") for i in range(100)]
+        self.csv_handler.save_students(students)
+        
+        iterator = self.csv_handler.iter_students()
+        first = next(iterator)
+        self.assertIsInstance(first, Student)
+        self.assertEqual(first.email_address, 'student0@test.com')
+        self.assertEqual(sum(1 for _ in iterator), 99)
+    
+    def test_iter_students_column_projection(self):
+        """Test that projected iteration only materializes requested columns"""
+        student = Student('p@test.com', 'Pat', 'Lee')
+        student.add_course('DATA200', 88)
+        student.add_course('CS146', 72)
+        self.csv_handler.save_students([student])
+        
+        rows = list(self.csv_handler.iter_students(columns=['email_address', 'marks']))
+        self.assertEqual(rows, [{'email_address': 'p@test.com', 'marks': [88, 72]}])
+        
+        with self.assertRaises(ValueError):
+            list(self.csv_handler.iter_students(columns=['gpa']))
+    
+    # ==================== COMPACT MODEL TESTS ====================
+    
+    def test_models_have_no_instance_dict(self):
+        """Test that models use __slots__ instead of a per-instance __dict__"""
+        entities = [
+            Student('test@test.com', 'Test', 'User'),
+            Course('DATA200', 'Data Science'),
+            Professor('prof@test.com', 'Prof', 'prof@test.com', 'Professor'),
+            LoginUser('test@test.com', 'pass'),
+            Grades('1', 'A', 90, 100),
+        ]
+        for entity in entities:
+            self.assertFalse(hasattr(entity, '__dict__'))
+    
+    def test_student_grades_derived_from_marks(self):
+        """Test that grades always follow the stored marks"""
+        student = Student('test@test.com', 'Test', 'User',
+                          courses=['DATA200', 'CS146'], grades=['F', 'F'], marks=[91, 65])
+        self.assertEqual(student.grades, ['A', 'D'])
+        student.update_marks('CS146', 85)
+        self.assertEqual(student.grades, ['A', 'B'])
+    
+    def test_student_marks_out_of_range(self):
+        """Test that marks outside 0-100 are rejected"""
+        student = Student('test@test.com', 'Test', 'User')
+        with self.assertRaises(ValueError):
+            student.add_course('DATA200', 101)
+        with self.assertRaises(ValueError):
+            student.add_course('DATA200', -1)
+        self.assertEqual(student.courses, [])
+    
+    def test_bad_student_row_is_skipped_and_never_saved(self):
+        """Test a row with bad marks is skipped and its table is not rewritten without it"""
+        app_dir = os.path.join(self.test_data_dir, 'bad_row')
+        handler = CSVHandler(app_dir)
+        handler.save_courses([Course('DATA200', 'Data Science', 4)])
+        handler.save_students(Student(f"s{i}@test.com", 'F', 'L', courses=['DATA200'], marks=[70])
+                              for i in range(6))
+        with open(handler.students_file) as f:
+            lines = f.readlines()
+        lines[3] = lines[3].replace(',70', ',105')
+        with open(handler.students_file, 'w') as f:
+            f.writelines(lines)
+        
+        app = CheckMyGradeApp(app_dir)
+        self.assertEqual(len(app.students), 5)
+        self.assertEqual(app.partial_tables, {'students': 1})
+        self.assertEqual([line for line, _ in app.csv_handler.load_errors['students']], [3])
+        self.assertTrue(app.set_marks('s0@test.com', 'DATA200', 90))
+        with open(handler.students_file) as f:
+            self.assertEqual(f.readlines(), lines)
+        
+        with self.assertRaises(ValueError):
+            CheckMyGradeApp(app_dir, storage='sqlite')
+        self.assertFalse(os.path.exists(os.path.join(app_dir, 'checkmygrade.db')))
+    
+    # ==================== COURSE SLOT TESTS ====================
+    
+    def test_student_course_slots_after_remove(self):
+        """Test that course positions stay consistent after removing a course"""
+        student = Student('test@test.com', 'Test', 'User')
+        student.add_course('DATA200', 90)
+        student.add_course('CS146', 80)
+        student.add_course('CS149', 70)
+        
+        student.remove_course('DATA200')
+        self.assertEqual(student.courses, ['CS146', 'CS149'])
+        self.assertEqual(student.course_slot('CS149'), 1)
+        self.assertEqual(student.get_marks('CS149'), 70)
+        self.assertEqual(student.get_grade('CS146'), 'B')
+        
+        self.assertTrue(student.update_marks('CS149', 95))
+        self.assertEqual(list(student.marks), [80, 95])
+        self.assertIsNone(student.get_marks('DATA200'))
+        self.assertFalse(student.has_course('DATA200'))
+    
+    def test_student_add_duplicate_course(self):
+        """Test that a course can only be added once"""
+        student = Student('test@test.com', 'Test', 'User', courses=['DATA200'], marks=[80])
+        self.assertFalse(student.add_course('DATA200', 90))
+        self.assertTrue(student.has_course('DATA200'))
+        self.assertEqual(student.get_marks('DATA200'), 80)
+    
+    def test_student_duplicate_and_mismatched_courses(self):
+        """Test a repeated course is dropped with its mark and mismatched lists are rejected"""
+        student = Student('test@test.com', 'Test', 'User',
+                          courses=['CS146', 'CS146', 'DATA200'], marks=[91, 95, 72])
+        self.assertEqual(student.courses, ['CS146', 'DATA200'])
+        self.assertEqual((student.get_marks('CS146'), student.get_marks('DATA200')), (91, 72))
+        self.assertEqual(student.to_dict()['marks'], '91,72')
+        with self.assertRaises(ValueError):
+            Student('test@test.com', 'Test', 'User', courses=['CS146', 'DATA200'], marks=[91])
+        
+        path = os.path.join(self.test_data_dir, 'duplicate_courses.csv')
+        with open(path, 'w') as f:
+            f.write('email_address,first_name,last_name,courses,grades,marks\n'
+                    'a@test.com,A,Able,"CS146,CS146,DATA200",,"91,95,72"\n')
+        header, ranges = CSVHandler.chunk_ranges(path, 1)
+        record = CSVHandler.parse_student_chunk(path, header, *ranges[0])[0]
+        self.assertEqual(Student.from_record(record).get_marks('DATA200'), 72)
+    
+    # ==================== ENROLLMENT INDEX TESTS ====================
+    
+    def test_enrollment_index_follows_students(self):
+        """Test that the enrollment index tracks add/remove course and delete"""
+        repo = Repository('email_address')
+        index = EnrollmentIndex()
+        repo.add_index(index)
+        
+        for i in range(100):
+            student = Student(f"student{i}@test.com", f"First{i}", f"Last{i}")
+            student.add_course('DATA200' if i % 2 else 'CS146', 70)
+            repo.add(student)
+        
+        self.assertEqual(index.count('DATA200'), 50)
+        self.assertEqual(index.count('CS146'), 50)
+        
+        repo.get('student1@test.com').remove_course('DATA200')
+        repo.get('student1@test.com').add_course('CS149', 80)
+        removed = repo.remove('student3@test.com')
+        
+        self.assertEqual(index.count('DATA200'), 48)
+        self.assertEqual([s.email_address for s in index.students_in('CS149')],
+                         ['student1@test.com'])
+        
+        # Removed students no longer notify the index
+        removed.add_course('CS149', 90)
+        self.assertEqual(index.count('CS149'), 1)
+    
+    def test_students_share_observer_tuple(self):
+        """Test students with the same indexes share one observer tuple"""
+        index = EnrollmentIndex()
+        histogram = MarksHistogram()
+        repository = Repository('email_address')
+        repository.add_index(index)
+        repository.add_index(histogram)
+        a = Student('a@test.com', 'A', 'Able', courses=['DATA200'], marks=[80])
+        b = Student('b@test.com', 'B', 'Baker', courses=['DATA200'], marks=[90])
+        repository.add(a)
+        repository.add(b)
+        self.assertIs(a._observers, b._observers)
+        
+        repository.remove('a@test.com')
+        self.assertEqual(a._observers, ())
+        repository.add(a)
+        self.assertIs(a._observers, b._observers)
+        a.update_marks('DATA200', 70)
+        self.assertEqual(histogram.course('DATA200').mean(), 80)
+    
+    def test_enrollment_index_mark_slots(self):
+        """Test that enrollments yield the mark slot of each student"""
+        index = EnrollmentIndex()
+        student = Student('test@test.com', 'Test', 'User',
+                          courses=['CS146', 'DATA200'], marks=[80, 95])
+        index.add(student)
+        
+        (enrolled, slot), = list(index.enrollments('DATA200'))
+        self.assertIs(enrolled, student)
+        self.assertEqual(student.marks[slot], 95)
+    
+    # ==================== TRIGRAM SEARCH TESTS ====================
+    
+    def test_trigram_search_matches_scan(self):
+        """Test that indexed search returns the same students as a full scan"""
+        index = TrigramIndex()
+        for i in range(1000):
+            self.students.append(Student(f"student{i}@test.com", f"First{i}", f"Last{i % 7}"))
+            index.add(self.students[-1])
+        
+        for term in ['student500', 'LAST3', 'first99', 'st', '@test.com', 'nobody']:
+            expected = {s.email_address for s in self.students
+                        if term.lower() in s.email_address.lower()
+                        or term.lower() in s.first_name.lower()
+                        or term.lower() in s.last_name.lower()}
+            found = {s.email_address for s in index.search(term)}
+            self.assertEqual(found, expected, term)
+    
+    def test_trigram_index_follows_rename_and_delete(self):
+        """Test that rename and removal update the search index"""
+        repo = Repository('email_address')
+        index = TrigramIndex()
+        repo.add_index(index)
+        repo.add(Student('a@test.com', 'Alice', 'Johnson'))
+        repo.add(Student('b@test.com', 'Bob', 'Williams'))
+        
+        repo.get('a@test.com').rename(last_name='Martinez')
+        self.assertEqual(index.search('johnson'), [])
+        self.assertEqual([s.email_address for s in index.search('tinez')], ['a@test.com'])
+        
+        repo.remove('b@test.com')
+        self.assertEqual(index.search('william'), [])
+        self.assertEqual(len(index), 1)
+    
+    # ==================== PREFIX INDEX TESTS ====================
+    
+    def test_prefix_index_queries(self):
+        """Test prefix and range queries against a sorted index"""
+        repo = Repository('email_address')
+        index = PrefixIndex('last_name')
+        for i, last_name in enumerate(['Martin', 'Marquez', 'Miller', 'martinez', 'Smith']):
+            repo.add(Student(f"s{i}@test.com", 'Test', last_name))
+        repo.add_index(index)
+        
+        self.assertEqual([s.last_name for s in index.prefix('Mar')],
+                         ['Marquez', 'Martin', 'martinez'])
+        self.assertEqual([s.last_name for s in index.range('m', 'n')],
+                         ['Marquez', 'Martin', 'martinez', 'Miller'])
+        self.assertEqual(index.prefix('z'), [])
+    
+    def test_prefix_index_follows_changes(self):
+        """Test that the prefix index follows add, rename and remove"""
+        repo = Repository('email_address')
+        index = PrefixIndex('email_address')
+        repo.add_index(index)
+        for i in range(100):
+            repo.add(Student(f"student{i}@test.com", 'Test', 'User'))
+        repo.add(Student('smith.john@test.com', 'John', 'Smith'))
+        
+        self.assertEqual(len(index.prefix('student1')), 11)
+        self.assertEqual([s.email_address for s in index.prefix('smith.')],
+                         ['smith.john@test.com'])
+        
+        repo.remove('student10@test.com')
+        self.assertEqual(len(index.prefix('student1')), 10)
+        
+        names = PrefixIndex('first_name')
+        repo.add_index(names)
+        repo.get('smith.john@test.com').rename(first_name='Jack')
+        self.assertEqual(names.prefix('john'), [])
+        self.assertEqual(len(names.prefix('ja')), 1)
+    
+    # ==================== CACHED AGGREGATE TESTS ====================
+    
+    def test_student_aggregates_invalidated(self):
+        """Test that cached average and GPA follow every marks change"""
+        student = Student('test@test.com', 'Test', 'User')
+        student.add_course('DATA200', 90)
+        student.add_course('CS146', 70)
+        self.assertEqual(student.get_average_marks(), 80.0)
+        self.assertEqual(student.get_gpa(), 3.0)
+        
+        student.update_marks('CS146', 80)
+        self.assertEqual(student.get_average_marks(), 85.0)
+        self.assertEqual(student.get_gpa(), 3.5)
+        
+        student.remove_course('DATA200')
+        self.assertEqual(student.get_average_marks(), 80.0)
+        self.assertEqual(student.get_gpa(), 3.0)
+        self.assertEqual(student.get_course_count(), 1)
+        
+        student.add_course('CS149', 60)
+        self.assertEqual(student.get_average_marks(), 70.0)
+        self.assertEqual(student.get_gpa(), 2.0)
+    
+    # ==================== SORTED VIEW TESTS ====================
+    
+    def test_sorted_view_by_marks_follows_updates(self):
+        """Test that the average-marks view reorders on marks changes"""
+        repo = Repository('email_address')
+        view = SortedView(lambda s: s.get_average_marks())
+        repo.add_index(view)
+        for i in range(1000):
+            student = Student(f"student{i}@test.com", f"First{i}", f"Last{i}")
+            student.add_course('DATA200', 60 + (i % 40))
+            repo.add(student)
+        
+        ordered = view.students(reverse=True)
+        for i in range(len(ordered) - 1):
+            self.assertGreaterEqual(ordered[i].get_average_marks(),
+                                    ordered[i + 1].get_average_marks())
+        
+        repo.get('student0@test.com').update_marks('DATA200', 100)
+        self.assertEqual(view.students(reverse=True, limit=1)[0].email_address,
+                         'student0@test.com')
+        repo.get('student0@test.com').add_course('CS146', 0)
+        self.assertEqual(view.students(limit=1)[0].email_address, 'student0@test.com')
+        
+        repo.remove('student0@test.com')
+        self.assertEqual(len(view), 999)
+        
+        # The repository keeps insertion order
+        self.assertEqual(repo.head(1)[0].email_address, 'student1@test.com')
+    
+    def test_sorted_view_by_first_name(self):
+        """Test ascending and descending reads of a name view"""
+        view = SortedView(lambda s: s.first_name)
+        students = [Student(f"s{i}@test.com", name, 'User')
+                    for i, name in enumerate(['Carol', 'Alice', 'Bob'])]
+        view.add_all(students)
+        
+        self.assertEqual([s.first_name for s in view.students()], ['Alice', 'Bob', 'Carol'])
+        self.assertEqual([s.first_name for s in view.students(reverse=True, limit=2)],
+                         ['Carol', 'Bob'])
+        
+        students[1].rename(first_name='Dave')
+        self.assertEqual([s.first_name for s in view.students()], ['Bob', 'Carol', 'Dave'])
+    
+    # ==================== MARKS HISTOGRAM TESTS ====================
+    
+    def test_histogram_matches_statistics(self):
+        """Test that histogram statistics equal the statistics module"""
+        repo = Repository('email_address')
+        histogram = MarksHistogram()
+        repo.add_index(histogram)
+        all_marks = []
+        for i in range(1001):
+            student = Student(f"student{i}@test.com", f"First{i}", f"Last{i}")
+            student.add_course('DATA200', (i * 37) % 101)
+            repo.add(student)
+            all_marks.append((i * 37) % 101)
+        
+        overall = histogram.overall
+        self.assertAlmostEqual(overall.mean(), statistics.mean(all_marks))
+        self.assertEqual(overall.median(), statistics.median(all_marks))
+        self.assertEqual(overall.max(), max(all_marks))
+        self.assertEqual(overall.min(), min(all_marks))
+        self.assertEqual(overall.percentile(50), sorted(all_marks)[500])
+        
+        # Even count uses the mean of the two middle values
+        repo.remove('student0@test.com')
+        all_marks.remove(0)
+        self.assertEqual(overall.median(), statistics.median(all_marks))
+    
+    def test_histogram_follows_student_changes(self):
+        """Test per-course histograms after add, update and remove"""
+        histogram = MarksHistogram()
+        student = Student('test@test.com', 'Test', 'User')
+        histogram.add(student)
+        student.add_course('DATA200', 80)
+        student.add_course('CS146', 60)
+        student.update_marks('DATA200', 100)
+        student.remove_course('CS146')
+        
+        self.assertEqual(histogram.course('DATA200').mean(), 100)
+        self.assertEqual(histogram.course('CS146').count, 0)
+        self.assertEqual(histogram.overall.count, 1)
+        self.assertIsNone(histogram.course('MATH161').median())
+    
+    # ==================== ANALYTICS TESTS ====================
+    
+    @unittest.skipIf(analytics.np is None, "NumPy is not installed")
+    def test_analytics_course_statistics(self):
+        """Test vectorized course statistics against the statistics module"""
+        students = []
+        for i in range(1001):
+            student = Student(f"student{i}@test.com", f"First{i}", f"Last{i}")
+            student.add_course('DATA200', (i * 37) % 101)
+            if i % 3 == 0:
+                student.add_course('CS146', (i * 11) % 101)
+            students.append(student)
+        
+        matrix = analytics.MarksMatrix(students, [Course('DATA200', 'Data Science', 4)])
+        stats = matrix.course_statistics()
+        for course_id in ('DATA200', 'CS146'):
+            marks = [s.get_marks(course_id) for s in students if s.has_course(course_id)]
+            self.assertEqual(stats[course_id]['count'], len(marks))
+            self.assertAlmostEqual(stats[course_id]['mean'], statistics.mean(marks))
+            self.assertEqual(stats[course_id]['median'], statistics.median(marks))
+            self.assertAlmostEqual(stats[course_id]['std'], statistics.pstdev(marks))
+        
+        distribution = matrix.grade_distribution()['DATA200']
+        self.assertEqual(sum(distribution.values()), 1001)
+        self.assertEqual(distribution['A'], sum(1 for s in students if s.get_grade('DATA200') == 'A'))
+    
+    @unittest.skipIf(analytics.np is None, "NumPy is not installed")
+    def test_analytics_student_gpa(self):
+        """Test vectorized GPA and averages against Student methods"""
+        students = [Student('a@test.com', 'A', 'A', courses=['DATA200', 'CS146'], marks=[95, 72]),
+                    Student('b@test.com', 'B', 'B', courses=['CS146'], marks=[81]),
+                    Student('c@test.com', 'C', 'C')]
+        matrix = analytics.MarksMatrix(students, [Course('DATA200', 'DS', 4), Course('CS146', 'DS', 2)])
+        
+        self.assertEqual(matrix.student_gpa().tolist(), [s.get_gpa() for s in students])
+        self.assertEqual(matrix.student_averages().tolist(),
+                         [s.get_average_marks() for s in students])
+        self.assertAlmostEqual(matrix.student_gpa(weighted=True)[0], (4.0 * 4 + 2.0 * 2) / 6)
+    
+    # ==================== SNAPSHOT TESTS ====================
+    
+    def test_snapshot_round_trip(self):
+        """Test snapshots rebuild the same records and go stale with the CSV"""
+        snapshot_dir = os.path.join(self.test_data_dir, 'snapshot')
+        handler = CSVHandler(snapshot_dir)
+        snapshots = SnapshotStore(snapshot_dir)
+        students = [Student('a@test.com', 'A', 'Able', courses=['DATA200', 'CS146'], marks=[91, 67]),
+                    Student('b@test.com', 'B', 'Baker')]
+        handler.save_students(students)
+        self.assertTrue(snapshots.save('students', students, handler.students_file))
+        
+        loaded = snapshots.load('students', handler.students_file)
+        self.assertEqual([s.to_dict() for s in loaded], [s.to_dict() for s in students])
+        self.assertEqual(loaded[0].get_marks('CS146'), 67)
+        
+        # A hand-edited CSV file wins over the snapshot
+        handler.save_students(students[:1])
+        self.assertIsNone(snapshots.load('students', handler.students_file))
+    
+    def test_snapshot_startup(self):
+        """Test the app loads unchanged tables from snapshots after a save"""
+        app_dir = os.path.join(self.test_data_dir, 'snapshot_app')
+        app = CheckMyGradeApp(app_dir)
+        app.students.add(Student('a@test.com', 'A', 'Able', courses=['DATA200'], marks=[88]))
+        app.courses.add(Course('DATA200', 'Data Science', 4))
+        app.record_changes(('students', 'a@test.com', 'upsert'), ('courses', 'DATA200', 'upsert'))
+        
+        reloaded = CheckMyGradeApp(app_dir, lazy=False)
+        self.assertEqual(reloaded.stale_snapshots, {'professors', 'users'})
+        self.assertEqual(reloaded.students.get('a@test.com').to_dict(),
+                         app.students.get('a@test.com').to_dict())
+        self.assertEqual(reloaded.courses.get('DATA200').credits, 4)
+        self.assertEqual(reloaded.enrollments.count('DATA200'), 1)
+    
+    # ==================== MMAP STORE TESTS ====================
+    
+    def test_mmap_store_random_access(self):
+        """Test fixed-width records are found, updated and deleted in place"""
+        store = MmapStudentStore(os.path.join(self.test_data_dir, 'mmap'))
+        try:
+            store.save_students([Student('a@test.com', 'A', 'Able', courses=['DATA200'], marks=[91]),
+                                 Student('b@test.com', 'B', 'Baker')])
+            self.assertEqual(store.find_student('a@test.com').get_marks('DATA200'), 91)
+            self.assertIsNone(store.find_student('nobody@test.com'))
+            
+            student = store.find_student('b@test.com')
+            student.add_course('CS146', 77)
+            store.put_student(student)
+            store.put_student(Student('c@test.com', 'C', 'Cole'))
+            self.assertTrue(store.delete_student('a@test.com'))
+            store.flush()
+            
+            reopened = MmapStudentStore(store.path.rsplit(os.sep, 1)[0])
+            self.assertEqual([s.email_address for s in reopened.load_students()],
+                             ['b@test.com', 'c@test.com'])
+            self.assertEqual(reopened.find_student('b@test.com').get_grade('CS146'), 'C')
+            reopened.close()
+            
+            with self.assertRaises(ValueError):
+                store.put_student(Student('x' * 80 + '@test.com', 'X', 'X'))
+        finally:
+            store.close()
+    
+    def test_mmap_store_app(self):
+        """Test the app imports students.csv once and saves changed students in place"""
+        app_dir = os.path.join(self.test_data_dir, 'mmap_app')
+        CSVHandler(app_dir).save_students([Student('a@test.com', 'A', 'Able', courses=['DATA200'], marks=[70])])
+        app = CheckMyGradeApp(app_dir, storage='mmap')
+        app.students.get('a@test.com').update_marks('DATA200', 95)
+        app.record_change('students', 'a@test.com')
+        app.student_store.close()
+        
+        reloaded = CheckMyGradeApp(app_dir, storage='mmap')
+        self.assertEqual(reloaded.find_student('a@test.com').get_marks('DATA200'), 95)
+        reloaded.student_store.close()
+        with self.assertRaises(ValueError):
+            CheckMyGradeApp(app_dir, storage='tape')
+    
+    def test_mmap_store_failed_import_keeps_roster(self):
+        """Test a save after a failed first import writes the whole roster, not just the change"""
+        app_dir = os.path.join(self.test_data_dir, 'mmap_failed_import')
+        CSVHandler(app_dir).save_students([Student('a@test.com', 'A', 'Able'),
+                                           Student('b@test.com', 'B', 'Baker'),
+                                           Student('c@test.com', 'C' * 40, 'Cole')])
+        with contextlib.redirect_stdout(io.StringIO()):
+            app = CheckMyGradeApp(app_dir, storage='mmap')
+            self.assertFalse(app.student_store.exists())
+            self.assertEqual(len(app.students), 3)
+            self.assertTrue(app.remove_student('c@test.com'))
+            app.students.add(Student('d@test.com', 'D', 'Dale'))
+            app.record_change('students', 'd@test.com')
+        app.student_store.close()
+        
+        reloaded = CheckMyGradeApp(app_dir, storage='mmap')
+        self.assertEqual(sorted(reloaded.students.keys()), ['a@test.com', 'b@test.com', 'd@test.com'])
+        reloaded.student_store.close()
+    
+    def test_mmap_store_rejects_changes_that_do_not_fit(self):
+        """Test courses and names beyond the record size are refused before anything changes"""
+        app_dir = os.path.join(self.test_data_dir, 'mmap_limits')
+        courses = [f"C{i}" for i in range(8)]
+        CSVHandler(app_dir).save_students([Student('a@test.com', 'A', 'Able', courses=courses, marks=[50] * 8)])
+        app = CheckMyGradeApp(app_dir, storage='mmap')
+        student = app.find_student('a@test.com')
+        with self.assertRaises(ValueError):
+            app.check_storable(student, course_id='C8')
+        app.check_storable(student, course_id='C7')  # already enrolled, nothing added
+        with self.assertRaises(ValueError):
+            app.check_storable(student, last_name='L' * 33)
+        self.assertEqual((student.get_course_count(), student.last_name), (8, 'Able'))
+        app.student_store.close()
+    
+    # ==================== SQLITE TESTS ====================
+    
+    def test_sqlite_handler_round_trip(self):
+        """Test the SQLite backend loads what it saved and applies row-level changes"""
+        database = SQLiteHandler(os.path.join(self.test_data_dir, 'sqlite'))
+        try:
+            students = [Student('a@test.com', 'A', 'Able', courses=['DATA200', 'CS146'], marks=[91, 67]),
+                        Student('b@test.com', 'B', 'Baker')]
+            self.assertTrue(database.save_students(students))
+            self.assertTrue(database.save_professors([Professor('P1', 'Dr. P', 'p@test.com', 'Professor', ['DATA200'])]))
+            self.assertEqual([s.to_dict() for s in database.load_students()],
+                             [s.to_dict() for s in students])
+            self.assertEqual(database.load_professors()[0].course_ids, ['DATA200'])
+            
+            students[0].update_marks('CS146', 88)
+            self.assertTrue(database.save_changes('students', [students[0]], ['b@test.com']))
+            loaded = database.load_students()
+            self.assertEqual([s.email_address for s in loaded], ['a@test.com'])
+            self.assertEqual(loaded[0].get_marks('CS146'), 88)
+            self.assertEqual(database.find_student('a@test.com').courses, ['DATA200', 'CS146'])
+            self.assertIsNone(database.find_student('b@test.com'))
+        finally:
+            database.close()
+    
+    def test_sqlite_failed_import_changes_nothing(self):
+        """Test a failed CSV import deletes a new database and leaves an existing one intact"""
+        app_dir = os.path.join(self.test_data_dir, 'sqlite_failed_import')
+        handler = CSVHandler(app_dir)
+        handler.save_students([Student('a@test.com', 'A', 'Able')])
+        database = SQLiteHandler(app_dir)
+        self.assertEqual(database.import_csv(handler), {'students': 1, 'courses': 0, 'professors': 0, 'users': 0})
+        self.assertFalse(database.is_new)
+        
+        with open(handler.students_file, 'a') as f:
+            f.write('b@test.com,B,Baker,DATA200,,105\n')
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaises(ValueError):
+                database.import_csv(handler)
+            self.assertEqual(len(database.load_students()), 1)
+            database.close()
+            
+            fresh_dir = os.path.join(self.test_data_dir, 'sqlite_failed_new')
+            shutil.copytree(app_dir, fresh_dir)
+            os.remove(os.path.join(fresh_dir, 'checkmygrade.db'))
+            fresh = SQLiteHandler(fresh_dir)
+            with self.assertRaises(ValueError):
+                fresh.import_csv(CSVHandler(fresh_dir))
+        self.assertFalse(os.path.exists(fresh.path))
+    
+    def test_sqlite_app(self):
+        """Test the app imports the CSV files into SQLite and persists changed rows"""
+        app_dir = os.path.join(self.test_data_dir, 'sqlite_app')
+        handler = CSVHandler(app_dir)
+        handler.save_students([Student('a@test.com', 'A', 'Able', courses=['DATA200'], marks=[70])])
+        handler.save_courses([Course('DATA200', 'Data Science', 4)])
+        
+        app = CheckMyGradeApp(app_dir, storage='sqlite')
+        app.students.get('a@test.com').update_marks('DATA200', 95)
+        app.courses.remove('DATA200')
+        app.record_changes(('students', 'a@test.com', 'upsert'), ('courses', 'DATA200', 'delete'))
+        app.database.close()
+        
+        reloaded = CheckMyGradeApp(app_dir, storage='sqlite')
+        self.assertEqual(reloaded.find_student('a@test.com').get_marks('DATA200'), 95)
+        self.assertEqual(len(reloaded.courses), 0)
+        reloaded.database.close()
+    
+    # ==================== LAZY LOADING TESTS ====================
+    
+    def test_lazy_table_loading(self):
+        """Test tables load on first use, and all at once through load_all_data"""
+        app_dir = os.path.join(self.test_data_dir, 'lazy_app')
+        handler = CSVHandler(app_dir)
+        handler.save_students([Student('a@test.com', 'A', 'Able', courses=['DATA200'], marks=[70])])
+        handler.save_courses([Course('DATA200', 'Data Science', 4)])
+        
+        app = CheckMyGradeApp(app_dir)
+        self.assertEqual(app.loaded_tables, set())
+        self.assertEqual(app.find_course('DATA200').credits, 4)
+        self.assertEqual(app.loaded_tables, {'courses'})
+        self.assertEqual(app.enrollments.count('DATA200'), 1)
+        self.assertEqual(app.loaded_tables, {'courses', 'students'})
+        
+        app.load_all_data()
+        self.assertEqual(app.loaded_tables, set(CheckMyGradeApp.TABLES))
+        self.assertEqual(set(app.load_times), set(CheckMyGradeApp.TABLES))
+        with self.assertRaises(AttributeError):
+            app.no_such_attribute
+    
+    def test_lazy_loading_replays_journal(self):
+        """Test tables with journaled changes are loaded and replayed at startup"""
+        app_dir = os.path.join(self.test_data_dir, 'lazy_journal')
+        app = CheckMyGradeApp(app_dir, journaled=True)
+        app.courses.add(Course('CS146', 'Data Structures', 3))
+        app.record_change('courses', 'CS146')
+        
+        reloaded = CheckMyGradeApp(app_dir, journaled=True)
+        self.assertEqual(reloaded.loaded_tables, {'courses'})
+        self.assertIn('CS146', reloaded.courses)
+        self.assertEqual(reloaded.dirty['courses'], {'CS146'})
+    
+    # ==================== PARALLEL PARSING TESTS ====================
+    
+    def test_chunk_ranges_are_record_aligned(self):
+        """Test byte ranges start at record boundaries and cover every row once"""
+        handler = CSVHandler(os.path.join(self.test_data_dir, 'chunks'))
+        handler.save_students(Student(f"s{i}@test.com", f"F{i}", f"L{i}", courses=['DATA200', 'CS146'],
+                                      marks=[i % 101, 50]) for i in range(500))
+        header, ranges = handler.chunk_ranges(handler.students_file, 7)
+        self.assertEqual(header[0], 'email_address')
+        self.assertGreater(len(ranges), 1)
+        
+        emails = []
+        for start, end in ranges:
+            emails.extend(r[0] for r in handler.parse_student_chunk(handler.students_file, header, start, end))
+        self.assertEqual(emails, [f"s{i}@test.com" for i in range(500)])
+    
+    def test_parallel_load_students(self):
+        """Test the process pool load matches the sequential load in order"""
+        handler = CSVHandler(os.path.join(self.test_data_dir, 'parallel'), workers=2)
+        students = [Student(f"s{i}@test.com", f"F{i}", f"L{i}", courses=['DATA200'], marks=[i % 101])
+                    for i in range(300)]
+        handler.save_students(students)
+        
+        loaded = handler.load_students_parallel(2)
+        self.assertEqual([s.to_dict() for s in loaded], [s.to_dict() for s in students])
+        self.assertEqual(len(handler.load_students()), 300)
+        
+        # Both loaders parse rows the same way, including empty course entries
+        with open(handler.students_file, 'a') as f:
+            f.write('x@test.com,X,Xu,"DATA200,,CS146",,"70,80"\n')
+        parallel = handler.load_students_parallel(2)
+        sequential = handler.load_students()
+        self.assertEqual([s.to_dict() for s in parallel], [s.to_dict() for s in sequential])
+        self.assertEqual(sequential[-1].courses, ['DATA200', 'CS146'])
+        self.assertEqual(handler.load_errors['students'], [])
+    
+    def test_parallel_load_never_returns_partial_roster(self):
+        """Test blank lines are skipped and a bad row falls back to the sequential loader"""
+        handler = CSVHandler(os.path.join(self.test_data_dir, 'parallel_bad'), workers=2)
+        handler.save_students(Student(f"s{i}@test.com", 'F', 'L', courses=['DATA200'], marks=[70])
+                              for i in range(300))
+        with open(handler.students_file) as f:
+            lines = f.readlines()
+        lines.insert(100, '\n')
+        with open(handler.students_file, 'w') as f:
+            f.writelines(lines)
+        self.assertEqual(len(handler.load_students_parallel(2)), 300)
+        
+        lines[200] = lines[200].replace(',70', ',105')
+        with open(handler.students_file, 'w') as f:
+            f.writelines(lines)
+        with contextlib.redirect_stdout(io.StringIO()):
+            loaded = handler.load_students_parallel(2)
+        self.assertEqual(len(loaded), 299)
+        self.assertEqual(len(handler.load_errors['students']), 1)
+    
+    # ==================== BULK IMPORT TESTS ====================
+    
+    def test_import_students_csv(self):
+        """Test a CSV import adds valid rows, reports rejected ones and persists once"""
+        app_dir = os.path.join(self.test_data_dir, 'import_csv')
+        CSVHandler(app_dir).save_courses([Course('DATA200', 'Data Science', 4), Course('CS146', 'DS', 3)])
+        app = CheckMyGradeApp(app_dir)
+        app.students.add(Student('old@test.com', 'Old', 'Student'))
+        
+        path = os.path.join(app_dir, 'import.csv')
+        with open(path, 'w') as f:
+            f.write("email_address,first_name,last_name,courses,marks,password\n"
+                    'a@test.com,A,Able,"DATA200,CS146","90,70",pw1\n'
+                    "b@test.com,B,Baker,DATA200,85,\n"
+                    "old@test.com,O,Dup,,,pw\n"
+                    "a@test.com,A,Again,,,pw\n"
+                    "c@test.com,C,Bad,DATA200,150,pw\n"
+                    "d@test.com,D,Unknown,MATH161,50,pw\n"
+                    "not-an-email,E,E,,,pw\n")
+        report = app.import_students(path, default_password='default')
+        self.assertEqual((report['rows'], report['imported']), (7, 2))
+        self.assertEqual([line for line, _, _ in report['rejected']], [4, 5, 6, 7, 8])
+        self.assertIn('Duplicate', report['rejected'][0][2])
+        self.assertGreater(report['rows_per_second'], 0)
+        self.assertEqual([s.email_address for s in app.sorted_views['email'].students()],
+                         ['a@test.com', 'b@test.com', 'old@test.com'])
+        
+        reloaded = CheckMyGradeApp(app_dir)
+        self.assertEqual(reloaded.find_student('a@test.com').get_marks('CS146'), 70)
+        self.assertEqual(reloaded.enrollments.count('DATA200'), 2)
+        self.assertTrue(LoginUser.verify_password('default', reloaded.users.get('b@test.com').password))
+    
+    def test_import_students_jsonl(self):
+        """Test a JSON-lines import with list fields, a malformed line and a missing password"""
+        app_dir = os.path.join(self.test_data_dir, 'import_jsonl')
+        CSVHandler(app_dir).save_courses([Course('DATA200', 'Data Science', 4)])
+        app = CheckMyGradeApp(app_dir)
+        
+        path = os.path.join(app_dir, 'import.jsonl')
+        with open(path, 'w') as f:
+            f.write('{"email_address": "a@test.com", "first_name": "A", "last_name": "Able", '
+                    '"courses": ["DATA200"], "marks": [88], "password": "pw"}\n'
+                    '{not json\n'
+                    '{"email_address": "b@test.com", "first_name": "B", "last_name": "Baker"}\n')
+        report = app.import_students(path, workers=2)
+        self.assertEqual(report['imported'], 1)
+        self.assertEqual([(line, reason) for line, _, reason in report['rejected']],
+                         [(2, 'Malformed JSON'), (3, 'Missing password')])
+        self.assertEqual(app.find_student('a@test.com').get_marks('DATA200'), 88)
+        self.assertIsNone(app.import_students(os.path.join(app_dir, 'missing.csv')))
+    
+    # ==================== MARKS UPLOAD TESTS ====================
+    
+    def test_sorted_view_deferred_refresh(self):
+        """Test a deferred batch of key changes ends in the same order as single refreshes"""
+        view = SortedView(lambda s: s.get_average_marks())
+        students = [Student(f"s{i}@test.com", 'F', 'L', courses=['DATA200'], marks=[i]) for i in range(100)]
+        view.add_all(students)
+        with view.deferred():
+            for i, student in enumerate(students):
+                student.update_marks('DATA200', 99 - i)
+            self.assertEqual(view.students()[0].email_address, 's0@test.com')
+        self.assertEqual([s.email_address for s in view.students(limit=2)], ['s99@test.com', 's98@test.com'])
+        self.assertEqual(len(view), 100)
+    
+    def test_upload_course_marks(self):
+        """Test a marks file updates enrolled students in one commit and reports the rest"""
+        app_dir = os.path.join(self.test_data_dir, 'upload_marks')
+        handler = CSVHandler(app_dir)
+        handler.save_courses([Course('DATA200', 'Data Science', 4)])
+        handler.save_students([Student('a@test.com', 'A', 'Able', courses=['DATA200'], marks=[50]),
+                               Student('b@test.com', 'B', 'Baker', courses=['DATA200'], marks=[60]),
+                               Student('c@test.com', 'C', 'Cole', courses=['CS146'], marks=[70])])
+        path = os.path.join(app_dir, 'marks.csv')
+        with open(path, 'w') as f:
+            f.write("email,marks\na@test.com,95\nb@test.com,101\nc@test.com,80\n"
+                    "x@test.com,90\nb@test.com,85\n")
+        
+        app = CheckMyGradeApp(app_dir)
+        self.assertIsNone(app.upload_course_marks('NOPE', path))
+        summary = app.upload_course_marks('DATA200', path)
+        self.assertEqual((summary['rows'], summary['updated']), (5, 2))
+        self.assertEqual(summary['unknown'], ['x@test.com'])
+        self.assertEqual(summary['unenrolled'], ['c@test.com'])
+        self.assertEqual([line for line, _, _ in summary['invalid']], [3])
+        self.assertEqual(summary['grades'], {'A': 1, 'B': 1})
+        self.assertEqual(app.sorted_students('average_marks', reverse=True)[0].email_address, 'a@test.com')
+        
+        reloaded = CheckMyGradeApp(app_dir)
+        self.assertEqual(reloaded.find_student('b@test.com').get_marks('DATA200'), 85)
+        self.assertEqual(reloaded.find_student('a@test.com').get_grade('DATA200'), 'A')
+        
+        # Without a header the first row is data, and a bad one is reported
+        with open(path, 'w') as f:
+            f.write("a@test.com,abc\nb@test.com,70\n")
+        summary = reloaded.upload_course_marks('DATA200', path)
+        self.assertEqual((summary['rows'], summary['updated']), (2, 1))
+        self.assertEqual(summary['invalid'], [(1, 'a@test.com', "Invalid marks: 'abc'")])
+    
+    # ==================== COMMAND LINE TESTS ====================
+    
+    def test_point_lookup_without_loading(self):
+        """Test one-shot lookups and scans leave the students table unloaded"""
+        app_dir = os.path.join(self.test_data_dir, 'point_lookup')
+        handler = CSVHandler(app_dir)
+        handler.save_students([Student('a@test.com', 'A', 'Able', courses=['DATA200'], marks=[70]),
+                               Student('b@test.com', 'B', 'Baker', courses=['CS146'], marks=[90])])
+        handler.save_courses([Course('DATA200', 'Data Science', 4)])
+        
+        app = CheckMyGradeApp(app_dir)
+        self.assertEqual(app.lookup_student('b@test.com').get_marks('CS146'), 90)
+        self.assertIsNone(app.lookup_student('x@test.com'))
+        self.assertEqual([s.email_address for s in app.iter_students()], ['a@test.com', 'b@test.com'])
+        self.assertTrue(app.print_course_report('DATA200'))
+        self.assertEqual(app.loaded_tables, {'courses'})
+    
+    def test_cli_commands(self):
+        """Test subcommands run one operation and return an exit status"""
+        app_dir = os.path.join(self.test_data_dir, 'cli')
+        handler = CSVHandler(app_dir)
+        handler.save_students([Student('a@test.com', 'A', 'Able', courses=['DATA200'], marks=[70])])
+        handler.save_courses([Course('DATA200', 'Data Science', 4)])
+        path = os.path.join(app_dir, 'new.jsonl')
+        with open(path, 'w') as f:
+            f.write('{"email": "b@test.com", "first_name": "B", "last_name": "Baker"}\n')
+        
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(cli.main(['--data-dir', app_dir, 'student', 'get', 'a@test.com']), 0)
+            self.assertEqual(cli.main(['--data-dir', app_dir, 'student', 'get', 'x@test.com']), 1)
+            self.assertEqual(cli.main(['--data-dir', app_dir, 'course', 'report', 'DATA200']), 0)
+            self.assertEqual(cli.main(['--data-dir', app_dir, 'stats']), 0)
+            self.assertEqual(cli.main(['--data-dir', app_dir, 'import', path, '--password', 'pw']), 0)
+        self.assertIn('Able', output.getvalue())
+        self.assertIn('Total Students: 1', output.getvalue())
+        self.assertIsNotNone(CSVHandler(app_dir).find_student('b@test.com'))
+    
+    # ==================== HTTP SERVER TESTS ====================
+    
+    def serve(self, name, scenario):
+        """Run scenario(request) against a GradeServer over a fresh data directory"""
+        app_dir = os.path.join(self.test_data_dir, name)
+        handler = CSVHandler(app_dir)
+        handler.save_students([Student('a@test.com', 'A', 'Able', courses=['DATA200'], marks=[70]),
+                               Student('b@test.com', 'B', 'Baker', courses=['DATA200'], marks=[90])])
+        handler.save_courses([Course('DATA200', 'Data Science', 4)])
+        handler.save_users([LoginUser('a@test.com', LoginUser.encrypt_password('pw'), 'student'),
+                            LoginUser('p@test.com', LoginUser.encrypt_password('secret'), 'professor')])
+        server = GradeServer(CheckMyGradeApp(app_dir, save_delay=None))
+        
+        async def run():
+            port = await server.start('127.0.0.1', 0)
+            
+            async def request(method, path, body=None, token=None):
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                data = json.dumps(body).encode() if body is not None else b''
+                head = f"{method} {path} HTTP/1.1\r\nContent-Length: {len(data)}\r\nConnection: close\r\n"
+                if token:
+                    head += f"Authorization: Bearer {token}\r\n"
+                writer.write(head.encode() + b"\r\n" + data)
+                response = await reader.read()
+                writer.close()
+                status_line, _, payload = response.partition(b"\r\n\r\n")
+                return int(status_line.split()[1]), json.loads(payload)
+            
+            try:
+                await scenario(request)
+            finally:
+                await server.stop()
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            asyncio.run(run())
+        return server, app_dir
+    
+    def test_server_reads(self):
+        """Test the read endpoints answer concurrently from memory"""
+        async def scenario(request):
+            results = await asyncio.gather(request('GET', '/students/a%40test.com'),
+                                           request('GET', '/students/a@test.com/grades'),
+                                           request('GET', '/courses/DATA200'),
+                                           request('GET', '/stats'),
+                                           request('GET', '/students/x@test.com'),
+                                           request('DELETE', '/stats'))
+            (_, student), (_, grades), (_, course), (_, stats), missing, not_allowed = results
+            self.assertEqual(student['courses'], [{'course_id': 'DATA200', 'marks': 70, 'grade': 'C'}])
+            self.assertEqual(grades['grades'], {'DATA200': 'C'})
+            self.assertEqual(len(course['students']), 2)
+            self.assertEqual(stats['average_marks'], 80)
+            self.assertEqual(missing[0], 404)
+            self.assertEqual(not_allowed[0], 405)
+        
+        server, _ = self.serve('server_reads', scenario)
+        self.assertEqual(server.requests, 6)
+    
+    def test_server_writes(self):
+        """Test writes need a professor login and are committed through the writer task"""
+        async def scenario(request):
+            self.assertEqual((await request('PUT', '/students/a@test.com/marks',
+                                            {'course_id': 'DATA200', 'marks': 95}))[0], 401)
+            status, _ = await request('POST', '/login', {'email': 'p@test.com', 'password': 'wrong'})
+            self.assertEqual(status, 401)
+            _, student_login = await request('POST', '/login', {'email': 'a@test.com', 'password': 'pw'})
+            self.assertEqual((await request('PUT', '/students/a@test.com/marks',
+                                            {'course_id': 'DATA200', 'marks': 95},
+                                            student_login['token']))[0], 403)
+            
+            _, login = await request('POST', '/login', {'email': 'p@test.com', 'password': 'secret'})
+            token = login['token']
+            results = await asyncio.gather(
+                request('PUT', '/students/a@test.com/marks', {'course_id': 'DATA200', 'marks': 95}, token),
+                request('PUT', '/students/b@test.com/marks', {'course_id': 'DATA200', 'marks': 150}, token),
+                request('PUT', '/students/b@test.com/marks', {'course_id': 'CS146', 'marks': 50}, token),
+                request('POST', '/students', {'email_address': 'c@test.com', 'first_name': 'C',
+                                              'last_name': 'Cole', 'courses': ['DATA200'],
+                                              'marks': [60], 'password': 'pw'}, token),
+                request('POST', '/students', {'email_address': 'a@test.com', 'password': 'pw'}, token))
+            self.assertEqual([status for status, _ in results], [200, 400, 404, 201, 409])
+            self.assertEqual(results[0][1]['courses'][0]['grade'], 'A')
+        
+        server, app_dir = self.serve('server_writes', scenario)
+        self.assertGreaterEqual(server.commits, 1)
+        reloaded = CheckMyGradeApp(app_dir)
+        self.assertEqual(reloaded.find_student('a@test.com').get_marks('DATA200'), 95)
+        self.assertEqual(reloaded.find_student('b@test.com').get_marks('DATA200'), 90)
+        self.assertEqual(reloaded.enrollments.count('DATA200'), 3)
+        self.assertIn('c@test.com', reloaded.users)
+    
+    # ==================== CONCURRENCY TESTS ====================
+    
+    def test_read_write_lock(self):
+        """Test readers share the lock, writers exclude them, and both are reentrant"""
+        lock = ReadWriteLock()
+        with lock.read(), lock.read():
+            with self.assertRaises(RuntimeError):
+                lock.acquire_write()
+        
+        entered = threading.Event()
+        def reader():
+            with lock.read():
+                entered.set()
+        with lock.write(), lock.write(), lock.read():
+            thread = threading.Thread(target=reader)
+            thread.start()
+            self.assertFalse(entered.wait(0.1))
+        self.assertTrue(entered.wait(5))
+        thread.join()
+    
+    def test_thread_safe_app(self):
+        """Test readers never fail while another thread deletes, re-adds, re-enrolls and regrades students"""
+        app_dir = os.path.join(self.test_data_dir, 'thread_safe')
+        handler = CSVHandler(app_dir)
+        handler.save_courses([Course('DATA200', 'Data Science', 4)])
+        handler.save_students(Student(f"s{i}@test.com", f"First{i}", f"Last{i}",
+                                      courses=['DATA200'], marks=[i % 101]) for i in range(200))
+        app = CheckMyGradeApp(app_dir, save_delay=None, thread_safe=True)
+        self.assertEqual(app.loaded_tables, set(CheckMyGradeApp.TABLES))
+        
+        errors = []
+        done = threading.Event()
+        def read_loop():
+            try:
+                while not done.is_set():
+                    ranked = app.sorted_students('average_marks', reverse=True)
+                    self.assertTrue(all(a.get_average_marks() is not None for a in ranked))
+                    for student in app.students:
+                        student.get_average_marks()
+                    app.find_students('First1')
+                    app.prefix_search('email', 's1')
+                    app.print_course_report('DATA200')
+                    app.print_student_report('s1@test.com')
+                    with app.reading():
+                        for student in app.enrollments.students_in('DATA200'):
+                            self.assertIsNotNone(student.get_marks('DATA200'))
+            except Exception as e:
+                errors.append(e)
+        
+        readers = [threading.Thread(target=read_loop) for _ in range(4)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            for thread in readers:
+                thread.start()
+            try:
+                for i in range(300):
+                    email = f"s{i % 200}@test.com"
+                    student = app.find_student(email)
+                    self.assertTrue(app.remove_student(email))
+                    with app.writing():
+                        app.students.add(student)
+                        student.remove_course('DATA200')
+                        student.add_course('DATA200', i % 101)
+                    app.record_changes(('students', email, 'upsert'))
+                    self.assertTrue(app.set_marks(email, 'DATA200', (i * 7) % 101))
+            finally:
+                done.set()
+                for thread in readers:
+                    thread.join()
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(len(app.students), 200)
+        self.assertEqual(len(app.sorted_views['average_marks']), 200)
+        self.assertEqual(app.marks_histogram.overall.count, 200)
+        self.assertEqual(app.find_student('s7@test.com').get_marks('DATA200'), 35)
+    
+    # ==================== GRADE SCALE TESTS ====================
+    
+    def test_grade_scale_default_bands(self):
+        """Test the default scale matches the fixed A-F thresholds"""
+        scale = GradeScale.default()
+        for marks in range(101):
+            expected = 'A' if marks >= 90 else 'B' if marks >= 80 else 'C' if marks >= 70 \
+                else 'D' if marks >= 60 else 'F'
+            self.assertEqual(scale.grade_for(marks), expected)
+        
+        letters, points = scale.grade_many([100, 89, 70, 59])
+        self.assertEqual(list(letters), ['A', 'B', 'C', 'F'])
+        self.assertEqual(list(points), [4.0, 3.0, 2.0, 0.0])
+    
+    def test_grade_scale_rejects_gaps(self):
+        """Test grade bands must cover 0-100 without gaps or overlaps"""
+        with self.assertRaises(ValueError):
+            GradeScale([Grades('P', 'P', 50, 100, 4.0), Grades('F', 'F', 0, 40, 0.0)])
+        with self.assertRaises(ValueError):
+            GradeScale([Grades('P', 'P', 50, 100, 4.0), Grades('F', 'F', 0, 50, 0.0)])
+        with self.assertRaises(ValueError):
+            GradeScale([Grades('P', 'P', 50, 90, 4.0), Grades('F', 'F', 0, 49, 0.0)])
+    
+    def test_grade_scale_regrade(self):
+        """Test loading a new scale from grades.csv regrades every student"""
+        app_dir = os.path.join(self.test_data_dir, 'grade_scale')
+        app = CheckMyGradeApp(app_dir)
+        app.students.add(Student('a@test.com', 'A', 'A', courses=['DATA200'], marks=[75]))
+        self.assertEqual(app.students.get('a@test.com').get_gpa(), 2.0)
+        
+        app.csv_handler.save_grades([Grades('P', 'P', 50, 100, 4.0), Grades('F', 'F', 0, 49, 0.0)])
+        app.apply_grade_scale(app.load_grade_scale())
+        student = app.students.get('a@test.com')
+        self.assertEqual(student.grades, ['P'])
+        self.assertEqual(student.get_gpa(), 4.0)
+        self.assertEqual(next(app.csv_handler.iter_students(['grades']))['grades'], ['P'])
+        
+        # An app without grades.csv uses the default scale, not the one loaded before
+        other = CheckMyGradeApp(os.path.join(self.test_data_dir, 'grade_scale_default'))
+        other.students.add(Student('b@test.com', 'B', 'B', courses=['DATA200'], marks=[95]))
+        self.assertEqual(other.students.get('b@test.com').grades, ['A'])
+        self.assertEqual(student.get_gpa(), 2.0)
 
 def run_tests():
     """Run all tests with verbose output"""
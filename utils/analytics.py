@@ -0,0 +1,108 @@
+"""
+Vectorized roster analytics over a student x course marks matrix.
+
+NumPy is an optional dependency: importing this module always works, but
+building a MarksMatrix raises ImportError when NumPy is not installed.
+"""
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+from models.grades import Grades
+
+def histogram_statistics(counts, percentiles=()):
+    """Summary statistics from bin counts of marks 0-100"""
+    values = np.arange(len(counts))
+    count = int(counts.sum())
+    cumulative = np.cumsum(counts)
+    mean = float(counts @ values) / count
+    
+    def kth(k):
+        return int(np.searchsorted(cumulative, k, side='right'))
+    
+    middle = count // 2
+    median = kth(middle) if count % 2 else (kth(middle - 1) + kth(middle)) / 2
+    present = np.flatnonzero(counts)
+    stats = {
+        'count': count,
+        'mean': mean,
+        'median': float(median),
+        'std': float(np.sqrt(counts @ (values - mean) ** 2 / count)),
+        'min': float(present[0]),
+        'max': float(present[-1]),
+    }
+    for p in percentiles:
+        # Nearest-rank percentile, same as Histogram.percentile
+        stats[f"p{p}"] = float(kth(max(1, -(-p * count // 100)) - 1))
+    return stats
+
+class MarksMatrix:
+    """Dense student x course marks matrix with an enrollment mask"""
+    
+    def __init__(self, students, courses=None):
+        if np is None:
+            raise ImportError("NumPy is required for analytics (pip install numpy)")
+        
+        students = list(students)
+        credits = {c.course_id: c.credits for c in courses} if courses else {}
+        
+        # One column per catalogue course, then any other course a student takes
+        columns = {course_id: j for j, course_id in enumerate(credits)}
+        rows, cols, values = [], [], []
+        for i, student in enumerate(students):
+            for course_id, marks in zip(student.courses, student.marks):
+                j = columns.get(course_id)
+                if j is None:
+                    j = columns[course_id] = len(columns)
+                rows.append(i)
+                cols.append(j)
+                values.append(marks)
+        
+        self.emails = [s.email_address for s in students]
+        self.course_ids = list(columns)
+        self.marks = np.zeros((len(students), len(columns)), dtype=np.uint8)
+        self.mask = np.zeros((len(students), len(columns)), dtype=bool)
+        if values:
+            self.marks[rows, cols] = values
+            self.mask[rows, cols] = True
+        self.credits = np.array([credits.get(c, 3) for c in self.course_ids], dtype=np.float64)
+    
+    def grade_index(self):
+        """Index into the active scale's letters/points for every cell"""
+        return Grades.scale.bucket(self.marks)
+    
+    def course_statistics(self, percentiles=(25, 75, 90)):
+        """Per-course count, mean, median, std, min, max and percentiles"""
+        result = {}
+        for j, course_id in enumerate(self.course_ids):
+            column = self.marks[self.mask[:, j], j]
+            if column.size:
+                # Marks are 0-100, so every statistic comes from 101 bin counts
+                counts = np.bincount(column, minlength=101)
+                result[course_id] = histogram_statistics(counts, percentiles)
+        return result
+    
+    def grade_distribution(self):
+        """Per-course count of each letter grade"""
+        grades = self.grade_index()
+        letters = Grades.scale.letters
+        result = {}
+        for j, course_id in enumerate(self.course_ids):
+            counts = np.bincount(grades[self.mask[:, j], j], minlength=len(letters))
+            result[course_id] = dict(zip(letters, counts.tolist()))
+        return result
+    
+    def student_averages(self):
+        """Average marks per student (0 for students without courses)"""
+        counts = self.mask.sum(axis=1)
+        totals = np.where(self.mask, self.marks, 0).sum(axis=1, dtype=np.float64)
+        return np.divide(totals, counts, out=np.zeros(len(counts)), where=counts > 0)
+    
+    def student_gpa(self, weighted=False):
+        """GPA per student, optionally weighted by course credits"""
+        points = np.asarray(Grades.scale.points)[self.grade_index()]
+        weights = self.mask * (self.credits if weighted else 1.0)
+        totals = (points * weights).sum(axis=1)
+        denominators = weights.sum(axis=1)
+        return np.divide(totals, denominators, out=np.zeros(len(totals)),
+                         where=denominators > 0)
\ No newline at end of file
@@ -0,0 +1,88 @@
+import csv
+import json
+from models.student import Student
+from models.login_user import LoginUser
+
+def iter_import_rows(path):
+    """Yield (line number, row dict) from a CSV or JSON-lines student file
+    
+    Files ending in .jsonl or .ndjson are read as one JSON object per
+    line; anything else as CSV with a header row. A line that is not
+    valid JSON is yielded with row None so it can be reported.
+    """
+    with open(path, 'r', newline='', encoding='utf-8') as file:
+        if path.endswith(('.jsonl', '.ndjson')):
+            for line_no, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    row = None
+                yield line_no, row if isinstance(row, dict) else None
+        else:
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row
+
+def _split(value):
+    """A list field given either as a list or as a comma-separated string"""
+    if isinstance(value, list):
+        return value
+    return [v.strip() for v in str(value or '').split(',') if v.strip()]
+
+def student_from_row(row):
+    """Build (Student, password) from an import row; raises ValueError if invalid"""
+    email = str(row.get('email_address') or row.get('email') or '').strip()
+    if '@' not in email:
+        raise ValueError("Invalid email address")
+    
+    courses = _split(row.get('courses'))
+    marks = _split(row.get('marks'))
+    if len(courses) != len(marks):
+        raise ValueError("Courses and marks do not match")
+    if len(set(courses)) != len(courses):
+        raise ValueError("Duplicate course")
+    
+    # Student validates that marks are integers between 0 and 100
+    student = Student(email, str(row.get('first_name') or '').strip(),
+                      str(row.get('last_name') or '').strip(), courses=courses, marks=marks)
+    return student, row.get('password') or None
+
+def hash_passwords(passwords, workers=1):
+    """Encrypt passwords in order, in a process pool when workers > 1"""
+    if workers <= 1 or len(passwords) < 2 * workers:
+        return [LoginUser.encrypt_password(p) for p in passwords]
+    from utils.process_pool import process_pool
+    with process_pool(workers) as pool:
+        # Large chunks: one hash is far cheaper than one inter-process message
+        chunksize = max(1, len(passwords) // (workers * 4))
+        return list(pool.map(LoginUser.encrypt_password, passwords, chunksize=chunksize))
+
+def iter_marks_rows(path):
+    """Yield (line number, email, marks) from a CSV or JSON-lines marks file
+    
+    CSV files have email and marks in the first two columns; a first row
+    naming them (email or email_address, then marks) is a header and is
+    skipped, any other first row is data. Malformed JSON lines are yielded
+    with email None.
+    """
+    if path.endswith(('.jsonl', '.ndjson')):
+        for line_no, row in iter_import_rows(path):
+            if row is None:
+                yield line_no, None, None
+            else:
+                yield line_no, str(row.get('email_address') or row.get('email') or '').strip(), row.get('marks')
+        return
+    
+    with open(path, 'r', newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        for row in reader:
+            if not row or not any(field.strip() for field in row):
+                continue
+            email = row[0].strip()
+            marks = row[1].strip() if len(row) > 1 else ''
+            if (reader.line_num == 1 and email.lower() in ('email', 'email_address')
+                    and marks.lower() == 'marks'):
+                continue  # header
+            yield reader.line_num, email, marks
\ No newline at end of file
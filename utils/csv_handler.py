@@ -1,65 +1,320 @@
 import csv
+import io
 import os
+from itertools import repeat
 from models.student import Student
 from models.course import Course
 from models.professor import Professor
 from models.login_user import LoginUser
 from models.grades import Grades
 
+def sync_directory(path):
+    """fsync a directory so renames inside it survive a crash (no-op where unsupported)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # e.g. Windows cannot fsync a directory
+    finally:
+        os.close(fd)
+
 class CSVHandler:
     """Utility class to handle CSV file operations"""
     
-    def __init__(self, data_dir='data'):
+    # Files smaller than this are parsed in-process even when workers > 1
+    PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+    
+    def __init__(self, data_dir='data', workers=1):
         self.data_dir = data_dir
+        self.workers = workers  # processes used to parse large students.csv files
         self.students_file = os.path.join(data_dir, 'students.csv')
         self.courses_file = os.path.join(data_dir, 'courses.csv')
         self.professors_file = os.path.join(data_dir, 'professors.csv')
         self.login_file = os.path.join(data_dir, 'login.csv')
+        self.grades_file = os.path.join(data_dir, 'grades.csv')
+        
+        # Per-table write counters: saves, rows and bytes (cumulative and last save)
+        self.write_stats = {}
+        # Per-table rows skipped by the last load: (row number, reason)
+        self.load_errors = {}
         
         # Create data directory if it doesn't exist
         if not os.path.exists(data_dir):
             os.makedirs(data_dir)
     
+    # ==================== WRITE STATISTICS ====================
+    
+    def _record_write(self, table, path, rows):
+        """Update write counters after a table file was rewritten"""
+        written = os.path.getsize(path)
+        stats = self.write_stats.setdefault(
+            table, {'saves': 0, 'rows': 0, 'bytes': 0, 'last_rows': 0, 'last_bytes': 0})
+        stats['saves'] += 1
+        stats['rows'] += rows
+        stats['bytes'] += written
+        stats['last_rows'] = rows
+        stats['last_bytes'] = written
+    
+    def get_write_stats(self, table=None):
+        """Return write counters for one table or all tables"""
+        if table is not None:
+            return self.write_stats.get(
+                table, {'saves': 0, 'rows': 0, 'bytes': 0, 'last_rows': 0, 'last_bytes': 0})
+        return self.write_stats
+    
+    def _write_table(self, table, path, fieldnames, items):
+        """Durably replace a table's CSV file with items' rows
+        
+        Rows go to a temporary file that is fsynced and renamed over the old
+        one, so a crash leaves either the old or the new file on disk; the
+        journal is only truncated after this returns.
+        """
+        temp_path = path + '.tmp'
+        try:
+            with open(temp_path, 'w', newline='', encoding='utf-8') as file:
+                writer = csv.DictWriter(file, fieldnames=fieldnames)
+                
+                writer.writeheader()
+                rows = 0
+                for item in items:
+                    writer.writerow(item.to_dict())
+                    rows += 1
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        sync_directory(self.data_dir)
+        self._record_write(table, path, rows)
+    
+    # ==================== STREAMING ====================
+    
+    def _iter_rows(self, path, columns=None):
+        """Yield raw CSV rows as dicts, keeping only the given columns if any"""
+        if not os.path.exists(path):
+            return
+        
+        with open(path, 'r', newline='', encoding='utf-8') as file:
+            if columns is None:
+                yield from csv.DictReader(file)
+                return
+            
+            reader = csv.reader(file)
+            header = next(reader, [])
+            missing = [c for c in columns if c not in header]
+            if missing:
+                raise ValueError(f"Unknown column(s) in {path}: {', '.join(missing)}")
+            
+            positions = [(column, header.index(column)) for column in columns]
+            for values in reader:
+                yield {column: values[i] if i < len(values) else '' for column, i in positions}
+    
+    def _convert_rows(self, table, path, convert):
+        """Yield convert(row) for each CSV row, skipping and reporting rows that fail"""
+        errors = self.load_errors[table] = []
+        for number, row in enumerate(self._iter_rows(path), start=1):
+            try:
+                item = convert(row)
+            except (KeyError, TypeError, ValueError) as e:
+                errors.append((number, str(e)))
+                print(f"Skipping {table} row {number}: {e}")
+                continue
+            yield item
+    
+    @staticmethod
+    def parse_field(column, value):
+        """Convert a raw CSV field to the type used by the models"""
+        if column in ('courses', 'grades', 'course_ids'):
+            return [v.strip() for v in value.split(',') if v.strip()]
+        if column == 'marks':
+            return [int(m) for m in value.split(',') if m]
+        if column == 'credits':
+            return int(value) if value else 3
+        return value
+    
+    # ==================== ROW CONVERSION ====================
+    
+    @staticmethod
+    def student_record(email_address, first_name, last_name, courses, marks):
+        """Student.to_record() tuple from raw CSV fields, validated like Student()
+        
+        Shared by the sequential and parallel loaders; empty entries in the
+        comma-separated courses and marks fields are ignored. Grades are
+        derived from marks, so their column is never read.
+        """
+        if not email_address:
+            raise ValueError("Email address cannot be null or empty")
+        slots, kept = Student.pair_courses([c for c in (courses or '').split(',') if c],
+                                           [m for m in (marks or '').split(',') if m])
+        return (email_address, first_name, last_name, tuple(slots), bytes(kept))
+    
+    @staticmethod
+    def row_to_student(row):
+        """Build a Student from a CSV row dictionary"""
+        return Student.from_record(CSVHandler.student_record(
+            row['email_address'], row['first_name'], row['last_name'], row['courses'], row['marks']))
+    
+    @staticmethod
+    def row_to_course(row):
+        """Build a Course from a CSV row dictionary"""
+        return Course(
+            course_id=row['course_id'],
+            course_name=row['course_name'],
+            credits=int(row.get('credits', 3)),
+            description=row.get('description', '')
+        )
+    
+    @staticmethod
+    def row_to_professor(row):
+        """Build a Professor from a CSV row dictionary"""
+        course_ids = row.get('course_ids', '').split(',') if row.get('course_ids') else []
+        course_ids = [c.strip() for c in course_ids if c.strip()]
+        
+        return Professor(
+            professor_id=row['professor_id'],
+            name=row['name'],
+            email_address=row['email_address'],
+            rank=row['rank'],
+            course_ids=course_ids
+        )
+    
+    @staticmethod
+    def row_to_user(row):
+        """Build a LoginUser from a CSV row dictionary"""
+        return LoginUser(
+            email_id=row['email_id'],
+            password=row['password'],  # Already encrypted
+            role=row.get('role', 'student')
+        )
+    
+    @staticmethod
+    def row_to_grade(row):
+        """Build a Grades band from a CSV row dictionary"""
+        return Grades(
+            grade_id=row['grade_id'],
+            grade=row['grade'],
+            min_marks=int(row['min_marks']),
+            max_marks=int(row['max_marks']),
+            grade_points=float(row.get('grade_points') or 0)
+        )
+    
     # ==================== STUDENT OPERATIONS ====================
     
+    def iter_students(self, columns=None):
+        """Lazily yield Student objects, or dicts of only the given columns"""
+        if columns is None:
+            yield from self._convert_rows('students', self.students_file, self.row_to_student)
+        else:
+            for row in self._iter_rows(self.students_file, columns):
+                yield {column: self.parse_field(column, value) for column, value in row.items()}
+    
+    def find_student(self, email):
+        """Scan the file for one student by email, building only that row, or None"""
+        for row in self._iter_rows(self.students_file):
+            if row['email_address'] == email:
+                return self.row_to_student(row)
+        return None
+    
     def load_students(self):
         """Load students from CSV file"""
+        if (self.workers > 1 and os.path.exists(self.students_file)
+                and os.path.getsize(self.students_file) >= self.PARALLEL_MIN_BYTES):
+            return self.load_students_parallel(self.workers)
+        return self._load_students_sequential()
+    
+    def _load_students_sequential(self):
+        """Load students in this process, skipping and reporting bad rows"""
         students = []
+        try:
+            for student in self.iter_students():
+                students.append(student)
+        except Exception as e:
+            self.load_errors.setdefault('students', []).append((None, str(e)))
+            print(f"Error loading students: {e}")
+        
+        return students
+    
+    @staticmethod
+    def chunk_ranges(path, chunks):
+        """Split a CSV file after its header into about `chunks` record-aligned byte ranges
+        
+        Each boundary is moved forward to the start of the next line, so no
+        record is split (fields written by this handler never contain newlines).
+        Returns the parsed header and a list of (start, end) offsets.
+        """
+        size = os.path.getsize(path)
+        with open(path, 'rb') as file:
+            header = next(csv.reader([file.readline().decode('utf-8')]), [])
+            bounds = [file.tell()]
+            step = max(1, (size - bounds[0]) // chunks)
+            for i in range(1, chunks):
+                position = bounds[0] + i * step
+                if position <= bounds[-1]:
+                    continue
+                file.seek(position)
+                file.readline()  # skip to the end of the record containing position
+                if file.tell() >= size:
+                    break
+                if file.tell() > bounds[-1]:
+                    bounds.append(file.tell())
+            bounds.append(size)
+        return header, list(zip(bounds, bounds[1:]))
+    
+    @staticmethod
+    def parse_student_chunk(path, header, start, end):
+        """Student.to_record() tuples for the rows in bytes [start, end) of a students CSV"""
+        with open(path, 'rb') as file:
+            file.seek(start)
+            data = file.read(end - start).decode('utf-8')
+        
+        # Build the records directly; Student.from_record turns them into objects
+        positions = [header.index(c) for c in (
+            'email_address', 'first_name', 'last_name', 'courses', 'marks')]
+        record = CSVHandler.student_record
+        records = []
+        for values in csv.reader(io.StringIO(data, newline='')):
+            if not values:
+                continue  # blank line, skipped like csv.DictReader does
+            records.append(record(*[values[i] for i in positions]))
+        return records
+    
+    def load_students_parallel(self, workers=None):
+        """Load students by parsing record-aligned chunks of the CSV in a process pool
+        
+        If any chunk fails, the whole file is parsed again sequentially, which
+        skips and reports the bad rows; a partial roster is never returned.
+        """
+        # Imported here: the process pool pulls in multiprocessing, which most runs never use
+        from utils.process_pool import process_pool
+        workers = workers or os.cpu_count() or 1
+        students = []
+        self.load_errors['students'] = []
         if not os.path.exists(self.students_file):
             return students
-        
         try:
-            with open(self.students_file, 'r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    courses = row['courses'].split(',') if row['courses'] else []
-                    grades = row['grades'].split(',') if row['grades'] else []
-                    marks = [int(m) for m in row['marks'].split(',') if m] if row['marks'] else []
-                    
-                    student = Student(
-                        email_address=row['email_address'],
-                        first_name=row['first_name'],
-                        last_name=row['last_name'],
-                        courses=courses,
-                        grades=grades,
-                        marks=marks
-                    )
-                    students.append(student)
+            # Several chunks per worker keep the pool busy when chunks parse unevenly
+            header, ranges = self.chunk_ranges(self.students_file, workers * 4)
+            with process_pool(workers) as pool:
+                # map() yields chunk results in file order
+                for records in pool.map(self.parse_student_chunk, repeat(self.students_file),
+                                        repeat(header), *zip(*ranges)):
+                    students.extend(map(Student.from_record, records))
         except Exception as e:
-            print(f"Error loading students: {e}")
+            print(f"Error loading students in parallel ({e}), loading them sequentially")
+            return self._load_students_sequential()
         
         return students
     
     def save_students(self, students):
         """Save students to CSV file"""
         try:
-            with open(self.students_file, 'w', newline='', encoding='utf-8') as file:
-                fieldnames = ['email_address', 'first_name', 'last_name', 'courses', 'grades', 'marks']
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                for student in students:
-                    writer.writerow(student.to_dict())
+            fieldnames = ['email_address', 'first_name', 'last_name', 'courses', 'grades', 'marks']
+            self._write_table('students', self.students_file, fieldnames, students)
             return True
         except Exception as e:
             print(f"Error saving students: {e}")
@@ -67,24 +322,22 @@ class CSVHandler:
     
     # ==================== COURSE OPERATIONS ====================
     
+    def iter_courses(self, columns=None):
+        """Lazily yield Course objects, or dicts of only the given columns"""
+        if columns is None:
+            yield from self._convert_rows('courses', self.courses_file, self.row_to_course)
+        else:
+            for row in self._iter_rows(self.courses_file, columns):
+                yield {column: self.parse_field(column, value) for column, value in row.items()}
+    
     def load_courses(self):
         """Load courses from CSV file"""
         courses = []
-        if not os.path.exists(self.courses_file):
-            return courses
-        
         try:
-            with open(self.courses_file, 'r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    course = Course(
-                        course_id=row['course_id'],
-                        course_name=row['course_name'],
-                        credits=int(row.get('credits', 3)),
-                        description=row.get('description', '')
-                    )
-                    courses.append(course)
+            for course in self.iter_courses():
+                courses.append(course)
         except Exception as e:
+            self.load_errors.setdefault('courses', []).append((None, str(e)))
             print(f"Error loading courses: {e}")
         
         return courses
@@ -92,13 +345,8 @@ class CSVHandler:
     def save_courses(self, courses):
         """Save courses to CSV file"""
         try:
-            with open(self.courses_file, 'w', newline='', encoding='utf-8') as file:
-                fieldnames = ['course_id', 'course_name', 'credits', 'description']
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                for course in courses:
-                    writer.writerow(course.to_dict())
+            fieldnames = ['course_id', 'course_name', 'credits', 'description']
+            self._write_table('courses', self.courses_file, fieldnames, courses)
             return True
         except Exception as e:
             print(f"Error saving courses: {e}")
@@ -106,28 +354,22 @@ class CSVHandler:
     
     # ==================== PROFESSOR OPERATIONS ====================
     
+    def iter_professors(self, columns=None):
+        """Lazily yield Professor objects, or dicts of only the given columns"""
+        if columns is None:
+            yield from self._convert_rows('professors', self.professors_file, self.row_to_professor)
+        else:
+            for row in self._iter_rows(self.professors_file, columns):
+                yield {column: self.parse_field(column, value) for column, value in row.items()}
+    
     def load_professors(self):
         """Load professors from CSV file"""
         professors = []
-        if not os.path.exists(self.professors_file):
-            return professors
-        
         try:
-            with open(self.professors_file, 'r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    course_ids = row.get('course_ids', '').split(',') if row.get('course_ids') else []
-                    course_ids = [c.strip() for c in course_ids if c.strip()]
-                    
-                    professor = Professor(
-                        professor_id=row['professor_id'],
-                        name=row['name'],
-                        email_address=row['email_address'],
-                        rank=row['rank'],
-                        course_ids=course_ids
-                    )
-                    professors.append(professor)
+            for professor in self.iter_professors():
+                professors.append(professor)
         except Exception as e:
+            self.load_errors.setdefault('professors', []).append((None, str(e)))
             print(f"Error loading professors: {e}")
         
         return professors
@@ -135,13 +377,8 @@ class CSVHandler:
     def save_professors(self, professors):
         """Save professors to CSV file"""
         try:
-            with open(self.professors_file, 'w', newline='', encoding='utf-8') as file:
-                fieldnames = ['professor_id', 'name', 'email_address', 'rank', 'course_ids']
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                for professor in professors:
-                    writer.writerow(professor.to_dict())
+            fieldnames = ['professor_id', 'name', 'email_address', 'rank', 'course_ids']
+            self._write_table('professors', self.professors_file, fieldnames, professors)
             return True
         except Exception as e:
             print(f"Error saving professors: {e}")
@@ -149,23 +386,22 @@ class CSVHandler:
     
     # ==================== LOGIN OPERATIONS ====================
     
+    def iter_users(self, columns=None):
+        """Lazily yield LoginUser objects, or dicts of only the given columns"""
+        if columns is None:
+            yield from self._convert_rows('users', self.login_file, self.row_to_user)
+        else:
+            for row in self._iter_rows(self.login_file, columns):
+                yield {column: self.parse_field(column, value) for column, value in row.items()}
+    
     def load_users(self):
         """Load users from CSV file"""
         users = []
-        if not os.path.exists(self.login_file):
-            return users
-        
         try:
-            with open(self.login_file, 'r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    user = LoginUser(
-                        email_id=row['email_id'],
-                        password=row['password'],  # Already encrypted
-                        role=row.get('role', 'student')
-                    )
-                    users.append(user)
+            for user in self.iter_users():
+                users.append(user)
         except Exception as e:
+            self.load_errors.setdefault('users', []).append((None, str(e)))
             print(f"Error loading users: {e}")
         
         return users
@@ -173,14 +409,32 @@ class CSVHandler:
     def save_users(self, users):
         """Save users to CSV file"""
         try:
-            with open(self.login_file, 'w', newline='', encoding='utf-8') as file:
-                fieldnames = ['email_id', 'password', 'role']
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                for user in users:
-                    writer.writerow(user.to_dict())
+            fieldnames = ['email_id', 'password', 'role']
+            self._write_table('users', self.login_file, fieldnames, users)
             return True
         except Exception as e:
             print(f"Error saving users: {e}")
+            return False
+    
+    # ==================== GRADE SCALE OPERATIONS ====================
+    
+    def load_grades(self):
+        """Load grade bands from CSV file (empty list if there is none)"""
+        grades = []
+        try:
+            for row in self._iter_rows(self.grades_file):
+                grades.append(self.row_to_grade(row))
+        except Exception as e:
+            print(f"Error loading grades: {e}")
+        
+        return grades
+    
+    def save_grades(self, grades):
+        """Save grade bands to CSV file"""
+        try:
+            fieldnames = ['grade_id', 'grade', 'min_marks', 'max_marks', 'grade_points']
+            self._write_table('grades', self.grades_file, fieldnames, grades)
+            return True
+        except Exception as e:
+            print(f"Error saving grades: {e}")
             return False
\ No newline at end of file
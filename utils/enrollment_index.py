@@ -0,0 +1,53 @@
+from models.student import StudentObserver
+
+class EnrollmentIndex(StudentObserver):
+    """Inverted index from course ID to the students enrolled in it
+    
+    Attach it to the students Repository; it then follows add_course and
+    remove_course on every indexed student.
+    """
+    
+    def __init__(self):
+        self._by_course = {}  # course_id -> {email: student}
+    
+    def add(self, student):
+        """Index all enrollments of a student"""
+        for course_id in student.courses:
+            self._by_course.setdefault(course_id, {})[student.email_address] = student
+        student.attach(self)
+    
+    def remove(self, student):
+        """Drop all enrollments of a student"""
+        for course_id in student.courses:
+            self._discard(course_id, student)
+        student.detach(self)
+    
+    def _discard(self, course_id, student):
+        enrolled = self._by_course.get(course_id)
+        if enrolled is not None:
+            enrolled.pop(student.email_address, None)
+            if not enrolled:
+                del self._by_course[course_id]
+    
+    def on_course_added(self, student, course_id, marks):
+        self._by_course.setdefault(course_id, {})[student.email_address] = student
+    
+    def on_course_removed(self, student, course_id, marks):
+        self._discard(course_id, student)
+    
+    def students_in(self, course_id):
+        """Return the students enrolled in a course"""
+        return list(self._by_course.get(course_id, {}).values())
+    
+    def enrollments(self, course_id):
+        """Yield (student, mark slot) pairs for a course"""
+        for student in self._by_course.get(course_id, {}).values():
+            yield student, student.course_slot(course_id)
+    
+    def count(self, course_id):
+        """Number of students enrolled in a course"""
+        return len(self._by_course.get(course_id, ()))
+    
+    def course_ids(self):
+        """Course IDs with at least one enrolled student"""
+        return list(self._by_course)
\ No newline at end of file
@@ -0,0 +1,17 @@
+import gc
+from contextlib import contextmanager
+
+@contextmanager
+def paused_gc():
+    """Suspend cyclic garbage collection for the block, restoring the previous state
+    
+    For bulk loads and batches that allocate many objects but create no
+    cyclic garbage, where collector passes would repeatedly rescan them.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
\ No newline at end of file
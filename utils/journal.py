@@ -0,0 +1,72 @@
+import json
+import os
+
+class Journal:
+    """Append-only write-ahead log of single-record changes
+    
+    Each line is a JSON record: {"table", "op", "key", "record"} where op is
+    'upsert' (record holds the entity's to_dict()) or 'delete'. The log is
+    replayed on top of the last CSV snapshot at startup and truncated once
+    the CSV files have been rewritten (compaction).
+    """
+    
+    def __init__(self, path, sync=True):
+        self.path = path
+        self.sync = sync  # fsync after every append
+        self.record_count = 0
+        
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                self.record_count = sum(1 for line in file if line.strip())
+    
+    def append(self, table, op, key, record=None):
+        """Append one change record to the log"""
+        return self.append_many([(table, op, key, record)])
+    
+    def append_many(self, changes):
+        """Append (table, op, key, record) change records with one write; return bytes written"""
+        lines = []
+        for table, op, key, record in changes:
+            entry = {'table': table, 'op': op, 'key': key}
+            if record is not None:
+                entry['record'] = record
+            lines.append(json.dumps(entry, separators=(',', ':')) + '\n')
+        data = ''.join(lines)
+        
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(data)
+            file.flush()
+            if self.sync:
+                os.fsync(file.fileno())
+        self.record_count += len(lines)
+        return len(data)
+    
+    def flush(self):
+        """Force appended records to disk (used for group commits)"""
+        if os.path.exists(self.path):
+            with open(self.path, 'a', encoding='utf-8') as file:
+                os.fsync(file.fileno())
+    
+    def replay(self):
+        """Yield logged change records in the order they were written"""
+        if not os.path.exists(self.path):
+            return
+        
+        with open(self.path, 'r', encoding='utf-8') as file:
+            for line_no, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn write can only affect the tail of the log
+                    print(f"Warning: skipping corrupt journal record at line {line_no}")
+    
+    def truncate(self):
+        """Discard all records after they have been durably folded into the CSV files"""
+        with open(self.path, 'w', encoding='utf-8') as file:
+            os.fsync(file.fileno())  # even when appends are group-committed
+        self.record_count = 0
+    
+    def __len__(self):
+        return self.record_count
\ No newline at end of file
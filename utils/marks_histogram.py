@@ -0,0 +1,114 @@
+from models.student import StudentObserver
+
+class Histogram:
+    """Counts of marks 0-100 with constant-time summary statistics"""
+    
+    def __init__(self):
+        self.counts = [0] * 101
+        self.count = 0
+        self.total = 0
+    
+    def add(self, marks):
+        self.counts[marks] += 1
+        self.count += 1
+        self.total += marks
+    
+    def remove(self, marks):
+        self.counts[marks] -= 1
+        self.count -= 1
+        self.total -= marks
+    
+    def copy(self):
+        """Independent copy, for reading statistics outside the table lock"""
+        other = Histogram()
+        other.counts = self.counts[:]
+        other.count = self.count
+        other.total = self.total
+        return other
+    
+    def mean(self):
+        """Average marks, None if empty"""
+        return self.total / self.count if self.count else None
+    
+    def min(self):
+        """Lowest marks, None if empty"""
+        for marks, n in enumerate(self.counts):
+            if n:
+                return marks
+        return None
+    
+    def max(self):
+        """Highest marks, None if empty"""
+        for marks in range(100, -1, -1):
+            if self.counts[marks]:
+                return marks
+        return None
+    
+    def kth(self, k):
+        """The k-th smallest marks (0-based)"""
+        seen = 0
+        for marks, n in enumerate(self.counts):
+            seen += n
+            if seen > k:
+                return marks
+        raise IndexError("k out of range")
+    
+    def median(self):
+        """Median marks, same result as statistics.median; None if empty"""
+        if not self.count:
+            return None
+        middle = self.count // 2
+        if self.count % 2:
+            return self.kth(middle)
+        return (self.kth(middle - 1) + self.kth(middle)) / 2
+    
+    def percentile(self, p):
+        """Nearest-rank p-th percentile (0-100); None if empty"""
+        if not self.count:
+            return None
+        rank = max(1, -(-p * self.count // 100))  # ceil(p/100 * count)
+        return self.kth(int(rank) - 1)
+
+class MarksHistogram(StudentObserver):
+    """Live histograms of all marks and of marks per course"""
+    
+    def __init__(self):
+        self.overall = Histogram()
+        self._by_course = {}  # course_id -> Histogram
+    
+    def course(self, course_id):
+        """Histogram for one course (empty if nobody is enrolled)"""
+        return self._by_course.get(course_id) or Histogram()
+    
+    def _add(self, course_id, marks):
+        self.overall.add(marks)
+        histogram = self._by_course.get(course_id)
+        if histogram is None:
+            histogram = self._by_course[course_id] = Histogram()
+        histogram.add(marks)
+    
+    def _remove(self, course_id, marks):
+        self.overall.remove(marks)
+        self._by_course[course_id].remove(marks)
+    
+    def add(self, student):
+        """Count all marks of a student"""
+        for course_id, marks in zip(student.courses, student.marks):
+            self._add(course_id, marks)
+        student.attach(self)
+    
+    def remove(self, student):
+        """Uncount all marks of a student"""
+        for course_id, marks in zip(student.courses, student.marks):
+            self._remove(course_id, marks)
+        student.detach(self)
+    
+    def on_course_added(self, student, course_id, marks):
+        self._add(course_id, marks)
+    
+    def on_course_removed(self, student, course_id, marks):
+        self._remove(course_id, marks)
+    
+    def on_marks_updated(self, student, course_id, old_marks, new_marks):
+        self._remove(course_id, old_marks)
+        self._add(course_id, new_marks)
\ No newline at end of file
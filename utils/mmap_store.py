@@ -0,0 +1,331 @@
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from models.student import Student
+from utils.csv_handler import sync_directory
+
+class MmapStudentStore:
+    """Fixed-width binary student file read and updated in place through mmap
+    
+    students.dat is a header followed by one fixed-size record per student:
+    a live flag, email, first and last name, then MAX_COURSES enrollment
+    slots of (course ID, marks). Record i lives at HEADER_SIZE + i *
+    RECORD_SIZE, so reading or rewriting one student touches one record.
+    
+    students.idx is an open-addressing hash table on disk mapping the CRC-32
+    of an email to its record number (linear probing, stored as row + 1 so
+    0 means empty). It is mapped as well, so a lookup needs neither a CSV
+    parse nor an index build. Updates overwrite a record where it is; new
+    students are appended, and deleted ones are flagged until the next full
+    save compacts both files.
+    """
+    
+    MAGIC = b'CMGS'
+    INDEX_MAGIC = b'CMGI'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHHI')  # magic, version, record size, record count
+    HEADER_SIZE = HEADER.size
+    INDEX_HEADER = struct.Struct('<4sIII')  # magic, capacity, records covered, used slots
+    MIN_CAPACITY = 1024
+    
+    EMAIL_SIZE = 64
+    NAME_SIZE = 32
+    COURSE_ID_SIZE = 12
+    MAX_COURSES = 8
+    
+    STUDENT = struct.Struct(f'<B{EMAIL_SIZE}s{NAME_SIZE}s{NAME_SIZE}sB')  # live, names, course count
+    ENROLLMENT = struct.Struct(f'<{COURSE_ID_SIZE}sB')  # course ID, marks
+    RECORD_SIZE = STUDENT.size + MAX_COURSES * ENROLLMENT.size
+    
+    def __init__(self, data_dir='data'):
+        self.path = os.path.join(data_dir, 'students.dat')
+        self.index_path = os.path.join(data_dir, 'students.idx')
+        self._file = None
+        self._map = None
+        self._index_file = None
+        self._index_map = None
+        self._slots = None  # uint32 view of the index slots
+        self.capacity = 0
+        self.used = 0  # occupied index slots, including deleted records
+        self.count = 0  # records in students.dat, including deleted ones
+        self.live = 0  # records not flagged as deleted
+        
+        if not os.path.exists(data_dir):
+            os.makedirs(data_dir)
+        if os.path.exists(self.path):
+            self._open()
+    
+    # ==================== FILE MAPPING ====================
+    
+    def exists(self):
+        """True if the store file has been written"""
+        return self._map is not None
+    
+    def _open(self):
+        self._file = open(self.path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, version, record_size, self.count = self.HEADER.unpack_from(self._map, 0)
+        if magic != self.MAGIC or version != self.VERSION or record_size != self.RECORD_SIZE:
+            self.close()
+            raise ValueError(f"{self.path} is not a version {self.VERSION} student store")
+        # Every record's first byte is its live flag
+        self.live = self.count - self._map[self.HEADER_SIZE::self.RECORD_SIZE].count(0)
+        self._open_index()
+    
+    def _open_index(self):
+        """Map students.idx, rebuilding it if it is missing or out of date"""
+        if os.path.exists(self.index_path):
+            self._index_file = open(self.index_path, 'r+b')
+            self._index_map = mmap.mmap(self._index_file.fileno(), 0)
+            magic, self.capacity, covered, self.used = self.INDEX_HEADER.unpack_from(self._index_map, 0)
+            if magic == self.INDEX_MAGIC and covered == self.count:
+                self._slots = memoryview(self._index_map)[self.INDEX_HEADER.size:].cast('I')
+                return
+            self._close_index()
+        self._rebuild_index()
+    
+    def _close_index(self):
+        if self._slots is not None:
+            self._slots.release()
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_file.close()
+        self._slots = None
+        self._index_map = None
+        self._index_file = None
+    
+    def close(self):
+        """Unmap and close the store files"""
+        self._close_index()
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+        self._map = None
+        self._file = None
+    
+    def flush(self):
+        """Write modified pages of both files back to disk"""
+        if self._map is not None:
+            self._map.flush()
+        if self._index_map is not None:
+            self._index_map.flush()
+    
+    def _offset(self, row):
+        return self.HEADER_SIZE + row * self.RECORD_SIZE
+    
+    # ==================== EMAIL INDEX ====================
+    
+    def _rebuild_index(self):
+        """Write a fresh students.idx for the live records, at most half full"""
+        self._close_index()
+        capacity = self.MIN_CAPACITY
+        while capacity < 2 * (self.live + 1):
+            capacity *= 2
+        mask = capacity - 1
+        slots = array('I', bytes(4 * capacity))
+        
+        used = 0
+        if self.count:
+            email_field = struct.Struct(f'<B{self.EMAIL_SIZE}s{self.RECORD_SIZE - 1 - self.EMAIL_SIZE}x')
+            with memoryview(self._map)[self.HEADER_SIZE:self._offset(self.count)] as records:
+                for row, (live, email) in enumerate(email_field.iter_unpack(records)):
+                    if live:
+                        i = zlib.crc32(email.rstrip(b'\0')) & mask
+                        while slots[i]:
+                            i = (i + 1) & mask
+                        slots[i] = row + 1
+                        used += 1
+        
+        temp_path = self.index_path + '.tmp'
+        with open(temp_path, 'wb') as file:
+            file.write(self.INDEX_HEADER.pack(self.INDEX_MAGIC, capacity, self.count, used))
+            file.write(slots.tobytes())
+        os.replace(temp_path, self.index_path)
+        self._open_index()
+    
+    def _find_offset(self, email):
+        """Byte offset of a live student's record, or None"""
+        if self._slots is None:
+            return None
+        key = email.encode('utf-8')
+        if len(key) > self.EMAIL_SIZE:
+            return None
+        data = self._map
+        slots = self._slots
+        mask = self.capacity - 1
+        i = zlib.crc32(key) & mask
+        while slots[i]:
+            offset = self._offset(slots[i] - 1)
+            if data[offset] and data[offset + 1:offset + 1 + self.EMAIL_SIZE].rstrip(b'\0') == key:
+                return offset
+            i = (i + 1) & mask
+        return None
+    
+    def _index_insert(self, key, row):
+        """Add a just-appended record to the index, growing it past half full"""
+        if 2 * (self.used + 1) > self.capacity:
+            self._rebuild_index()
+            return
+        mask = self.capacity - 1
+        i = zlib.crc32(key) & mask
+        while self._slots[i]:
+            i = (i + 1) & mask
+        self._slots[i] = row + 1
+        self.used += 1
+        self.INDEX_HEADER.pack_into(self._index_map, 0, self.INDEX_MAGIC, self.capacity,
+                                    self.count, self.used)
+    
+    # ==================== RECORD ENCODING ====================
+    
+    @classmethod
+    def _encode_text(cls, value, size, field):
+        data = (value or '').encode('utf-8')
+        if len(data) > size:
+            raise ValueError(f"{field} is longer than {size} bytes")
+        return data
+    
+    @classmethod
+    def check(cls, email_address, first_name, last_name, courses):
+        """Raise ValueError if a student with these fields does not fit in one record"""
+        if len(courses) > cls.MAX_COURSES:
+            raise ValueError(f"Students can have at most {cls.MAX_COURSES} courses in this store")
+        cls._encode_text(email_address, cls.EMAIL_SIZE, 'Email address')
+        cls._encode_text(first_name, cls.NAME_SIZE, 'First name')
+        cls._encode_text(last_name, cls.NAME_SIZE, 'Last name')
+        for course_id in courses:
+            cls._encode_text(course_id, cls.COURSE_ID_SIZE, 'Course ID')
+    
+    @classmethod
+    def encode(cls, student):
+        """Fixed-width bytes for one student"""
+        courses = student.courses
+        if len(courses) > cls.MAX_COURSES:
+            raise ValueError(f"Students can have at most {cls.MAX_COURSES} courses in this store")
+        
+        record = bytearray(cls.RECORD_SIZE)
+        cls.STUDENT.pack_into(
+            record, 0, 1,
+            cls._encode_text(student.email_address, cls.EMAIL_SIZE, 'Email address'),
+            cls._encode_text(student.first_name, cls.NAME_SIZE, 'First name'),
+            cls._encode_text(student.last_name, cls.NAME_SIZE, 'Last name'),
+            len(courses))
+        offset = cls.STUDENT.size
+        for course_id, marks in zip(courses, student.marks):
+            cls.ENROLLMENT.pack_into(
+                record, offset,
+                cls._encode_text(course_id, cls.COURSE_ID_SIZE, 'Course ID'), marks)
+            offset += cls.ENROLLMENT.size
+        return record
+    
+    @classmethod
+    def decode(cls, data, offset=0):
+        """Student from the record at offset in data"""
+        _, email, first_name, last_name, num_courses = cls.STUDENT.unpack_from(data, offset)
+        offset += cls.STUDENT.size
+        courses = []
+        marks = array('B')
+        for _ in range(num_courses):
+            course_id, mark = cls.ENROLLMENT.unpack_from(data, offset)
+            courses.append(sys.intern(course_id.rstrip(b'\0').decode('utf-8')))
+            marks.append(mark)
+            offset += cls.ENROLLMENT.size
+        return Student.from_record((email.rstrip(b'\0').decode('utf-8'),
+                                    first_name.rstrip(b'\0').decode('utf-8'),
+                                    last_name.rstrip(b'\0').decode('utf-8'),
+                                    courses, marks))
+    
+    # ==================== LOAD / SAVE ====================
+    
+    def iter_students(self):
+        """Lazily yield every live student in file order"""
+        if self._map is None:
+            return
+        data = self._map
+        for row in range(self.count):
+            offset = self._offset(row)
+            if data[offset]:
+                yield self.decode(data, offset)
+    
+    def load_students(self):
+        """Load all live students from the store file"""
+        students = []
+        try:
+            for student in self.iter_students():
+                students.append(student)
+        except Exception as e:
+            print(f"Error loading student store: {e}")
+        
+        return students
+    
+    def save_students(self, students):
+        """Rewrite the store with exactly these students, dropping deleted records"""
+        self.close()
+        temp_path = self.path + '.tmp'
+        try:
+            rows = 0
+            with open(temp_path, 'wb') as file:
+                file.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.RECORD_SIZE, 0))
+                for student in students:
+                    file.write(self.encode(student))
+                    rows += 1
+                file.seek(0)
+                file.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.RECORD_SIZE, rows))
+                file.flush()
+                os.fsync(file.fileno())  # the journal is truncated once this returns
+            os.replace(temp_path, self.path)
+            sync_directory(os.path.dirname(self.path) or '.')
+            return True
+        except Exception as e:
+            print(f"Error saving student store: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+        finally:
+            if os.path.exists(self.path):
+                self._open()
+    
+    # ==================== RANDOM ACCESS ====================
+    
+    def find_student(self, email):
+        """Read one student by email, or None"""
+        offset = self._find_offset(email)
+        if offset is None:
+            return None
+        return self.decode(self._map, offset)
+    
+    def put_student(self, student):
+        """Overwrite a student's record in place, appending it if it is new"""
+        record = self.encode(student)
+        offset = self._find_offset(student.email_address)
+        if offset is not None:
+            self._map[offset:offset + self.RECORD_SIZE] = record
+            return
+        
+        if self._map is None:
+            self.save_students([])
+        row = self.count
+        offset = self._offset(row)
+        self._map.resize(offset + self.RECORD_SIZE)
+        self._map[offset:offset + self.RECORD_SIZE] = record
+        self.count += 1
+        self.live += 1
+        self.HEADER.pack_into(self._map, 0, self.MAGIC, self.VERSION, self.RECORD_SIZE, self.count)
+        self._index_insert(student.email_address.encode('utf-8'), row)
+    
+    def delete_student(self, email):
+        """Flag a student's record as deleted; return False if there is none"""
+        offset = self._find_offset(email)
+        if offset is None:
+            return False
+        self._map[offset] = 0
+        self.live -= 1
+        return True
+    
+    def __contains__(self, email):
+        return self._find_offset(email) is not None
+    
+    def __len__(self):
+        return self.live
\ No newline at end of file
@@ -0,0 +1,37 @@
+from bisect import bisect_left
+from utils.sorted_view import SortedView
+
+# Sorts after any character that can appear in a key
+_MAX_CHAR = '\U0010ffff'
+
+class PrefixIndex(SortedView):
+    """Sorted, case-insensitive index over one student attribute
+    
+    Entries are (lowercased value, email) tuples kept in order, so prefix
+    and range queries cost O(log n + k) with bisect.
+    """
+    
+    def __init__(self, attr):
+        super().__init__(lambda student: getattr(student, attr).lower())
+        self.attr = attr  # 'email_address', 'first_name' or 'last_name'
+    
+    # Enrollment changes never affect email or names
+    def on_course_added(self, student, course_id, marks):
+        pass
+    
+    def on_course_removed(self, student, course_id, marks):
+        pass
+    
+    def on_marks_updated(self, student, course_id, old_marks, new_marks):
+        pass
+    
+    def range(self, low, high):
+        """Return students with low <= value < high (case-insensitive)"""
+        start = bisect_left(self._entries, (low.lower(),))
+        end = bisect_left(self._entries, (high.lower(),))
+        return [self._students[email] for _, email in self._entries[start:end]]
+    
+    def prefix(self, prefix):
+        """Return students whose value starts with prefix (case-insensitive)"""
+        prefix = prefix.lower()
+        return self.range(prefix, prefix + _MAX_CHAR)
\ No newline at end of file
@@ -0,0 +1,13 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+def process_pool(workers):
+    """ProcessPoolExecutor whose workers are never forked from this process
+    
+    Pools are started from threads (table loads, the save timer, the
+    server), and forking a multi-threaded process can copy a lock some other
+    thread holds. Workers come from a forkserver where available, otherwise
+    they are spawned.
+    """
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
\ No newline at end of file
@@ -0,0 +1,173 @@
+from utils.rw_lock import ReadWriteLock
+
+class Repository:
+    """In-memory collection of entities indexed by a unique key attribute"""
+    
+    def __init__(self, key_attr, items=None):
+        self.key_attr = key_attr
+        self._index = {}  # key -> entity, keeps insertion order
+        self.indexes = []  # secondary indexes with add(item)/remove(item)
+        
+        if items:
+            for item in items:
+                self.add(item)
+    
+    def key_of(self, item):
+        """Return the index key of an entity"""
+        return getattr(item, self.key_attr)
+    
+    def add(self, item):
+        """Add an entity, returns False if the key already exists"""
+        key = self.key_of(item)
+        if key in self._index:
+            return False
+        self._index[key] = item
+        for index in self.indexes:
+            index.add(item)
+        return True
+    
+    def add_all(self, items):
+        """Add entities whose keys are new, updating each index in one batch
+        
+        Returns the number added. Indexes with add_all (such as sorted views)
+        take the whole batch at once instead of one insert per entity.
+        """
+        added = []
+        for item in items:
+            key = self.key_of(item)
+            if key not in self._index:
+                self._index[key] = item
+                added.append(item)
+        for index in self.indexes:
+            if hasattr(index, 'add_all'):
+                index.add_all(added)
+            else:
+                for item in added:
+                    index.add(item)
+        return len(added)
+    
+    def put(self, item):
+        """Insert or replace an entity, keeping its position if it exists"""
+        key = self.key_of(item)
+        old = self._index.get(key)
+        self._index[key] = item
+        for index in self.indexes:
+            if old is not None:
+                index.remove(old)
+            index.add(item)
+    
+    def remove(self, key):
+        """Remove an entity by key, returns the removed entity or None"""
+        item = self._index.pop(key, None)
+        if item is not None:
+            for index in self.indexes:
+                index.remove(item)
+        return item
+    
+    def add_index(self, index):
+        """Attach a secondary index and fill it with the current entities"""
+        self.indexes.append(index)
+        if hasattr(index, 'add_all'):
+            index.add_all(self._index.values())
+        else:
+            for item in self._index.values():
+                index.add(item)
+    
+    def get(self, key):
+        """Find an entity by key in O(1)"""
+        return self._index.get(key)
+    
+    def keys(self):
+        """Return all keys in insertion order"""
+        return self._index.keys()
+    
+    def head(self, n):
+        """Return the first n entities"""
+        items = []
+        for item in self._index.values():
+            if len(items) >= n:
+                break
+            items.append(item)
+        return items
+    
+    def clear(self):
+        """Remove all entities"""
+        for item in self._index.values():
+            for index in self.indexes:
+                index.remove(item)
+        self._index.clear()
+    
+    def __contains__(self, key):
+        return key in self._index
+    
+    def __iter__(self):
+        return iter(self._index.values())
+    
+    def __len__(self):
+        return len(self._index)
+    
+    def __repr__(self):
+        return f"Repository('{self.key_attr}', {len(self._index)} items)"
+
+class SynchronizedRepository(Repository):
+    """Repository guarded by a ReadWriteLock shared with its indexes
+    
+    Lookups take the lock shared and changes take it exclusively, so index
+    updates are never seen half done. Iteration and keys() return a
+    snapshot taken under the lock: a reader walking the roster is not
+    invalidated when a writer adds or deletes entities meanwhile.
+    """
+    
+    def __init__(self, key_attr, items=None, lock=None):
+        self.lock = lock or ReadWriteLock()
+        super().__init__(key_attr)
+        if items:
+            self.add_all(items)
+    
+    def add(self, item):
+        with self.lock.write():
+            return super().add(item)
+    
+    def add_all(self, items):
+        items = list(items)
+        with self.lock.write():
+            return super().add_all(items)
+    
+    def put(self, item):
+        with self.lock.write():
+            super().put(item)
+    
+    def remove(self, key):
+        with self.lock.write():
+            return super().remove(key)
+    
+    def add_index(self, index):
+        with self.lock.write():
+            super().add_index(index)
+    
+    def clear(self):
+        with self.lock.write():
+            super().clear()
+    
+    def get(self, key):
+        with self.lock.read():
+            return self._index.get(key)
+    
+    def keys(self):
+        with self.lock.read():
+            return list(self._index)
+    
+    def head(self, n):
+        with self.lock.read():
+            return super().head(n)
+    
+    def __contains__(self, key):
+        with self.lock.read():
+            return key in self._index
+    
+    def __iter__(self):
+        with self.lock.read():
+            return iter(list(self._index.values()))
+    
+    def __repr__(self):
+        return f"SynchronizedRepository('{self.key_attr}', {len(self._index)} items)"
\ No newline at end of file
@@ -0,0 +1,85 @@
+import threading
+from contextlib import contextmanager
+
+class ReadWriteLock:
+    """Many concurrent readers or one exclusive writer
+    
+    Waiting writers block new readers, so a steady stream of reads cannot
+    starve a writer. Both sides are reentrant per thread: a reader may
+    read again, and the writer may read or write again while it holds the
+    lock (a reader cannot upgrade to writing).
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0  # threads holding the read lock
+        self._writer = None  # ident of the thread holding the write lock
+        self._write_depth = 0
+        self._writers_waiting = 0
+        self._local = threading.local()  # per-thread read depth
+    
+    def acquire_read(self):
+        local = self._local
+        depth = getattr(local, 'depth', 0)
+        if depth or self._writer == threading.get_ident():
+            # Already reading, or writing: no need to wait for anyone
+            local.depth = depth + 1
+            return
+        with self._cond:
+            while self._writer is not None or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        local.depth = 1
+    
+    def release_read(self):
+        local = self._local
+        local.depth -= 1
+        if local.depth or self._writer == threading.get_ident():
+            return
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+    
+    def acquire_write(self):
+        me = threading.get_ident()
+        if self._writer == me:
+            self._write_depth += 1
+            return
+        if getattr(self._local, 'depth', 0):
+            raise RuntimeError("Cannot upgrade a read lock to a write lock")
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+    
+    def release_write(self):
+        self._write_depth -= 1
+        if self._write_depth:
+            return
+        with self._cond:
+            self._writer = None
+            self._cond.notify_all()
+    
+    @contextmanager
+    def read(self):
+        """Hold the lock shared for the duration of the block"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+    
+    @contextmanager
+    def write(self):
+        """Hold the lock exclusively for the duration of the block"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
\ No newline at end of file
@@ -0,0 +1,94 @@
+import threading
+import time
+
+class SaveScheduler:
+    """Coalesce mutations into group commits
+    
+    A commit runs once max_ops operations are pending or max_delay seconds
+    after the first pending operation, whichever comes first. With the
+    defaults (max_delay=0, max_ops=1) every operation is committed at once;
+    with max_delay=0 and max_ops > 1 only full batches are committed and the
+    rest waits for flush(); with max_delay=None nothing is committed until
+    flush() is called, for callers that run their own commit loop.
+    """
+    
+    def __init__(self, commit_fn, max_delay=0.0, max_ops=1):
+        self.commit_fn = commit_fn
+        self.max_delay = max_delay
+        self.max_ops = max(1, max_ops)
+        self.lock = threading.RLock()
+        
+        self.pending = 0
+        self._first_pending_at = None
+        self._timer = None
+        
+        # Commit statistics
+        self.commits = 0
+        self.operations = 0
+        self.max_batch = 0
+        self.total_latency = 0.0  # first pending operation -> durable commit
+        self.max_latency = 0.0
+        self.total_write_time = 0.0
+    
+    def notify(self, count=1):
+        """Register pending operations and commit if the batch is full"""
+        with self.lock:
+            self.pending += count
+            if self._first_pending_at is None:
+                self._first_pending_at = time.perf_counter()
+            
+            if self.max_delay is None:
+                return
+            if self.pending >= self.max_ops:
+                self.flush()
+            elif self.max_delay > 0 and self._timer is None:
+                self._timer = threading.Timer(self.max_delay, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+    
+    def flush(self):
+        """Commit all pending operations now, returns False if nothing was pending"""
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self.pending == 0:
+                return False
+            
+            # If commit_fn raises, the operations stay pending and the error propagates
+            write_start = time.perf_counter()
+            self.commit_fn()
+            done = time.perf_counter()
+            
+            latency = done - self._first_pending_at
+            self.commits += 1
+            self.operations += self.pending
+            self.max_batch = max(self.max_batch, self.pending)
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            self.total_write_time += done - write_start
+            
+            self.pending = 0
+            self._first_pending_at = None
+            return True
+    
+    def _flush_on_timer(self):
+        """Timer callback; a failed commit keeps its operations pending for the next one"""
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Error committing changes: {e}")
+    
+    def stats(self):
+        """Return commit count, batch sizes and latencies (ms)"""
+        commits = self.commits or 1
+        return {
+            'commits': self.commits,
+            'operations': self.operations,
+            'pending': self.pending,
+            'avg_batch': self.operations / commits,
+            'max_batch': self.max_batch,
+            'avg_latency_ms': self.total_latency / commits * 1000,
+            'max_latency_ms': self.max_latency * 1000,
+            'avg_write_ms': self.total_write_time / commits * 1000,
+        }
\ No newline at end of file
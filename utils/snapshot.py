@@ -0,0 +1,82 @@
+import os
+import pickle
+from models.student import Student
+from models.course import Course
+from models.professor import Professor
+from models.login_user import LoginUser
+from utils.gc_pause import paused_gc
+
+class SnapshotStore:
+    """Binary per-table snapshots that make startup skip CSV parsing
+    
+    Each table is pickled as a list of model to_record() tuples, next to its
+    CSV file. The header stores the size and modification time of the CSV
+    file the snapshot was written with; a snapshot is only used while that
+    CSV file is unchanged, so the CSV files stay the source of truth and
+    can still be edited by hand.
+    """
+    
+    FORMAT_VERSION = 1
+    MODELS = {
+        'students': Student,
+        'courses': Course,
+        'professors': Professor,
+        'users': LoginUser,
+    }
+    
+    def __init__(self, data_dir='data'):
+        self.data_dir = data_dir
+    
+    def path(self, table):
+        """Snapshot file for a table"""
+        return os.path.join(self.data_dir, f"{table}.snapshot")
+    
+    @staticmethod
+    def _source_stamp(source):
+        """(size, mtime) of a CSV file, or None if it does not exist"""
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+    
+    def save(self, table, items, source):
+        """Write a snapshot of items matching the just-written CSV file source"""
+        stamp = self._source_stamp(source)
+        if stamp is None:
+            return False
+        
+        path = self.path(table)
+        temp_path = path + '.tmp'
+        try:
+            header = (self.FORMAT_VERSION, table, stamp)
+            records = [item.to_record() for item in items]
+            with open(temp_path, 'wb') as file:
+                pickle.dump(header, file, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(records, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+            return True
+        except Exception as e:
+            print(f"Error saving {table} snapshot: {e}")
+            return False
+    
+    def load(self, table, source):
+        """Return the table's items from its snapshot, or None if it is missing or stale"""
+        path = self.path(table)
+        stamp = self._source_stamp(source)
+        if stamp is None or not os.path.exists(path):
+            return None
+        
+        # Loading allocates millions of objects and no garbage; pause the
+        # cyclic collector so it does not rescan them over and over
+        try:
+            with paused_gc(), open(path, 'rb') as file:
+                # The header alone decides staleness, before the records are read
+                if pickle.load(file) != (self.FORMAT_VERSION, table, stamp):
+                    return None
+                records = pickle.load(file)
+                from_record = self.MODELS[table].from_record
+                return [from_record(record) for record in records]
+        except Exception as e:
+            print(f"Warning: ignoring unreadable {table} snapshot: {e}")
+            return None
\ No newline at end of file
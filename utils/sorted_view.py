@@ -0,0 +1,119 @@
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from itertools import islice
+from models.student import StudentObserver
+
+class SortedView(StudentObserver):
+    """Students kept ordered by key(student), updated as students change
+    
+    Entries are (key, email) tuples in ascending order; descending reads walk
+    the list backwards. Inserts, deletes and key changes find their position
+    with bisect, so a single change never triggers a full re-sort; large
+    batches of changes made inside deferred() are merged with one sort.
+    """
+    
+    # Batches larger than this rebuild the entry list instead of moving entries one by one
+    REBUILD_THRESHOLD = 64
+    
+    def __init__(self, key):
+        self.key = key
+        self._entries = []
+        self._keys = {}  # email -> key currently stored in _entries
+        self._students = {}  # email -> student
+        self._pending = None  # email -> student awaiting refresh inside deferred()
+    
+    def add(self, student):
+        """Insert a student at its sorted position"""
+        key = self.key(student)
+        self._students[student.email_address] = student
+        self._keys[student.email_address] = key
+        insort(self._entries, (key, student.email_address))
+        student.attach(self)
+    
+    def add_all(self, students):
+        """Bulk insert with a single sort instead of one insort per student"""
+        for student in students:
+            key = self.key(student)
+            self._students[student.email_address] = student
+            self._keys[student.email_address] = key
+            self._entries.append((key, student.email_address))
+            student.attach(self)
+        self._entries.sort()
+    
+    def remove(self, student):
+        """Remove a student from the view"""
+        key = self._keys.pop(student.email_address, None)
+        if student.email_address in self._students:
+            self._discard((key, student.email_address))
+            del self._students[student.email_address]
+        student.detach(self)
+    
+    def _discard(self, entry):
+        idx = bisect_left(self._entries, entry)
+        if idx < len(self._entries) and self._entries[idx] == entry:
+            del self._entries[idx]
+    
+    def refresh(self, student):
+        """Move a student whose key may have changed"""
+        email = student.email_address
+        if self._pending is not None:
+            self._pending[email] = student
+            return
+        old_key = self._keys.get(email)
+        new_key = self.key(student)
+        if new_key != old_key:
+            self._discard((old_key, email))
+            self._keys[email] = new_key
+            insort(self._entries, (new_key, email))
+    
+    def refresh_all(self, students):
+        """Move many students at once, with one sort for a large batch"""
+        changed = {}
+        for student in students:
+            if student.email_address not in self._students:
+                continue  # removed since the change was made
+            new_key = self.key(student)
+            if new_key != self._keys.get(student.email_address):
+                changed[student.email_address] = new_key
+        if len(changed) <= self.REBUILD_THRESHOLD:
+            for email in changed:
+                self.refresh(self._students[email])
+            return
+        
+        entries = [entry for entry in self._entries if entry[1] not in changed]
+        entries.extend((key, email) for email, key in changed.items())
+        entries.sort()
+        self._entries = entries
+        self._keys.update(changed)
+    
+    @contextmanager
+    def deferred(self):
+        """Collect refreshes made inside the block and apply them together at the end"""
+        self._pending = {}
+        try:
+            yield self
+        finally:
+            pending, self._pending = self._pending, None
+            self.refresh_all(pending.values())
+    
+    def on_course_added(self, student, course_id, marks):
+        self.refresh(student)
+    
+    def on_course_removed(self, student, course_id, marks):
+        self.refresh(student)
+    
+    def on_marks_updated(self, student, course_id, old_marks, new_marks):
+        self.refresh(student)
+    
+    def on_renamed(self, student, old_first_name, old_last_name):
+        self.refresh(student)
+    
+    def students(self, reverse=False, limit=None):
+        """Return students in key order (descending if reverse)"""
+        entries = reversed(self._entries) if reverse else iter(self._entries)
+        if limit is not None:
+            entries = islice(entries, limit)
+        return [self._students[email] for _, email in entries]
+    
+    def __len__(self):
+        return len(self._entries)
\ No newline at end of file
@@ -0,0 +1,275 @@
+import os
+import sqlite3
+from models.student import Student
+from models.course import Course
+from models.professor import Professor
+from models.login_user import LoginUser
+
+class SQLiteHandler:
+    """SQLite storage with the CSVHandler load/save surface plus row-level changes
+    
+    Students and their enrollments are separate tables, so updating one
+    student's marks rewrites a handful of rows inside one transaction
+    instead of the whole students file. Primary keys index students by
+    email, courses by course ID and professors by professor ID; enrollments
+    are also indexed by course ID.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS students (
+            email_address TEXT PRIMARY KEY,
+            first_name TEXT NOT NULL,
+            last_name TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS enrollments (
+            email_address TEXT NOT NULL REFERENCES students(email_address) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            course_id TEXT NOT NULL,
+            marks INTEGER NOT NULL CHECK (marks BETWEEN 0 AND 100),
+            PRIMARY KEY (email_address, position)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS enrollments_by_course ON enrollments(course_id);
+        CREATE TABLE IF NOT EXISTS courses (
+            course_id TEXT PRIMARY KEY,
+            course_name TEXT NOT NULL,
+            credits INTEGER NOT NULL,
+            description TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS professors (
+            professor_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            email_address TEXT NOT NULL,
+            rank TEXT NOT NULL,
+            course_ids TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS professors_by_email ON professors(email_address);
+        CREATE TABLE IF NOT EXISTS users (
+            email_id TEXT PRIMARY KEY,
+            password TEXT NOT NULL,
+            role TEXT NOT NULL
+        );
+    """
+    
+    # table -> (key column, columns in insert order)
+    TABLES = {
+        'students': ('email_address', ('email_address', 'first_name', 'last_name')),
+        'courses': ('course_id', ('course_id', 'course_name', 'credits', 'description')),
+        'professors': ('professor_id', ('professor_id', 'name', 'email_address', 'rank', 'course_ids')),
+        'users': ('email_id', ('email_id', 'password', 'role')),
+    }
+    
+    def __init__(self, data_dir='data'):
+        if not os.path.exists(data_dir):
+            os.makedirs(data_dir)
+        self.path = os.path.join(data_dir, 'checkmygrade.db')
+        self.is_new = not os.path.exists(self.path)
+        # Group commits may run on the save scheduler's timer thread
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(self.SCHEMA)
+    
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+    
+    # ==================== ROW CONVERSION ====================
+    
+    @staticmethod
+    def _row(table, item):
+        """Column values for one model object"""
+        if table == 'students':
+            return (item.email_address, item.first_name, item.last_name)
+        if table == 'professors':
+            return (item.professor_id, item.name, item.email_address, item.rank,
+                    ','.join(item.course_ids))
+        return tuple(item.to_dict().values())
+    
+    def _insert(self, table, items, replace=False):
+        """Insert items into table (and students' enrollments); return the row count"""
+        key, columns = self.TABLES[table]
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        if replace:
+            # Update in place so rows keep their rowid, and with it their load order
+            updates = ', '.join(f"{c} = excluded.{c}" for c in columns if c != key)
+            sql += f" ON CONFLICT({key}) DO UPDATE SET {updates}"
+        items = list(items)
+        self.conn.executemany(sql, (self._row(table, item) for item in items))
+        
+        if table == 'students':
+            if replace:
+                self.conn.executemany("DELETE FROM enrollments WHERE email_address = ?",
+                                      ((s.email_address,) for s in items))
+            self.conn.executemany(
+                "INSERT INTO enrollments (email_address, position, course_id, marks) "
+                "VALUES (?, ?, ?, ?)",
+                ((s.email_address, position, course_id, marks)
+                 for s in items
+                 for position, (course_id, marks) in enumerate(zip(s.courses, s.marks))))
+        return len(items)
+    
+    # ==================== ROW-LEVEL CHANGES ====================
+    
+    def upsert(self, table, items):
+        """Insert or update items by primary key in one transaction"""
+        with self.conn:
+            return self._insert(table, items, replace=True)
+    
+    def delete(self, table, keys):
+        """Delete rows by primary key in one transaction"""
+        key, _ = self.TABLES[table]
+        with self.conn:
+            self.conn.executemany(f"DELETE FROM {table} WHERE {key} = ?", ((k,) for k in keys))
+    
+    def save_changes(self, table, items, deleted_keys):
+        """Upsert items and delete deleted_keys atomically; return True on success"""
+        key, _ = self.TABLES[table]
+        try:
+            with self.conn:
+                self._insert(table, items, replace=True)
+                self.conn.executemany(f"DELETE FROM {table} WHERE {key} = ?",
+                                      ((k,) for k in deleted_keys))
+            return True
+        except sqlite3.Error as e:
+            print(f"Error saving {table}: {e}")
+            return False
+    
+    def _replace_all(self, table, items):
+        """Make table contain exactly items; return True on success"""
+        try:
+            with self.conn:
+                self._replace_rows(table, items)
+            return True
+        except sqlite3.Error as e:
+            print(f"Error saving {table}: {e}")
+            return False
+    
+    def _replace_rows(self, table, items):
+        """Delete every row of table and insert items, inside the caller's transaction"""
+        if table == 'students':
+            self.conn.execute("DELETE FROM enrollments")
+        self.conn.execute(f"DELETE FROM {table}")
+        self._insert(table, items)
+    
+    # ==================== STUDENT OPERATIONS ====================
+    
+    def load_students(self):
+        """Load students with their enrollments in enrollment order"""
+        students = []
+        try:
+            enrollments = {}
+            for email, course_id, marks in self.conn.execute(
+                    "SELECT email_address, course_id, marks FROM enrollments "
+                    "ORDER BY email_address, position"):
+                courses = enrollments.get(email)
+                if courses is None:
+                    courses = enrollments[email] = ([], bytearray())
+                courses[0].append(course_id)
+                courses[1].append(marks)
+            for email, first_name, last_name in self.conn.execute(
+                    "SELECT email_address, first_name, last_name FROM students ORDER BY rowid"):
+                course_ids, marks = enrollments.get(email, ((), b''))
+                students.append(Student.from_record((email, first_name, last_name, course_ids, marks)))
+        except sqlite3.Error as e:
+            print(f"Error loading students: {e}")
+        
+        return students
+    
+    def find_student(self, email):
+        """Load one student by email, or None"""
+        row = self.conn.execute(
+            "SELECT first_name, last_name FROM students WHERE email_address = ?", (email,)).fetchone()
+        if row is None:
+            return None
+        enrollments = self.conn.execute(
+            "SELECT course_id, marks FROM enrollments WHERE email_address = ? ORDER BY position",
+            (email,)).fetchall()
+        return Student.from_record((email, row[0], row[1], [c for c, _ in enrollments],
+                                    bytes(m for _, m in enrollments)))
+    
+    def save_students(self, students):
+        """Replace all students and enrollments"""
+        return self._replace_all('students', students)
+    
+    # ==================== COURSE OPERATIONS ====================
+    
+    def load_courses(self):
+        """Load courses"""
+        try:
+            return [Course(*row) for row in self.conn.execute(
+                "SELECT course_id, course_name, credits, description FROM courses ORDER BY rowid")]
+        except sqlite3.Error as e:
+            print(f"Error loading courses: {e}")
+            return []
+    
+    def save_courses(self, courses):
+        """Replace all courses"""
+        return self._replace_all('courses', courses)
+    
+    # ==================== PROFESSOR OPERATIONS ====================
+    
+    def load_professors(self):
+        """Load professors"""
+        professors = []
+        try:
+            for professor_id, name, email, rank, course_ids in self.conn.execute(
+                    "SELECT professor_id, name, email_address, rank, course_ids "
+                    "FROM professors ORDER BY rowid"):
+                professors.append(Professor(professor_id, name, email, rank,
+                                            [c for c in course_ids.split(',') if c]))
+        except sqlite3.Error as e:
+            print(f"Error loading professors: {e}")
+        
+        return professors
+    
+    def save_professors(self, professors):
+        """Replace all professors"""
+        return self._replace_all('professors', professors)
+    
+    # ==================== LOGIN OPERATIONS ====================
+    
+    def load_users(self):
+        """Load login users"""
+        try:
+            return [LoginUser(*row) for row in self.conn.execute(
+                "SELECT email_id, password, role FROM users ORDER BY rowid")]
+        except sqlite3.Error as e:
+            print(f"Error loading users: {e}")
+            return []
+    
+    def save_users(self, users):
+        """Replace all login users"""
+        return self._replace_all('users', users)
+    
+    # ==================== MIGRATION ====================
+    
+    def import_csv(self, csv_handler):
+        """Replace the database contents with the tables in csv_handler's CSV files
+        
+        All tables are replaced in one transaction. On failure ValueError is
+        raised and the database is left as it was, except that a database
+        created for this import is deleted, so a later start never takes it
+        for a migrated one.
+        """
+        try:
+            tables = {'students': csv_handler.load_students(),
+                      'courses': csv_handler.load_courses(),
+                      'professors': csv_handler.load_professors(),
+                      'users': csv_handler.load_users()}
+            # Importing a table with skipped rows would lose them once the database takes over
+            skipped = [f"{len(errors)} {table}" for table, errors in csv_handler.load_errors.items() if errors]
+            if skipped:
+                raise ValueError(f"Not imported, bad CSV rows skipped: {', '.join(skipped)}")
+            try:
+                with self.conn:
+                    for table, items in tables.items():
+                        self._replace_rows(table, items)
+            except sqlite3.Error as e:
+                raise ValueError(f"Not imported: {e}")
+        except ValueError:
+            if self.is_new:
+                self.close()
+                os.remove(self.path)
+            raise
+        self.is_new = False
+        return {table: len(items) for table, items in tables.items()}
\ No newline at end of file
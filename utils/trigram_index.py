@@ -0,0 +1,99 @@
+from models.student import StudentObserver
+
+def trigrams(text):
+    """Return the set of 3-character substrings of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class TrigramIndex(StudentObserver):
+    """Substring search over lowercased email, first and last name
+    
+    Every trigram maps to the emails of the students containing it, so a
+    query only checks students that have all of the query's trigrams.
+    Queries shorter than three characters, or whose rarest trigram is shared
+    by more than SCAN_FRACTION of all students, fall back to a scan.
+    """
+    
+    SCAN_FRACTION = 0.1
+    
+    def __init__(self):
+        self._postings = {}  # trigram -> set of emails
+        self._students = {}  # email -> student
+    
+    @staticmethod
+    def _fields(student, first_name=None, last_name=None):
+        first_name = student.first_name if first_name is None else first_name
+        last_name = student.last_name if last_name is None else last_name
+        return (student.email_address.lower(), first_name.lower(), last_name.lower())
+    
+    def _grams(self, fields):
+        grams = set()
+        for field in fields:
+            grams |= trigrams(field)
+        return grams
+    
+    def _post(self, email, grams):
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(email)
+    
+    def _unpost(self, email, grams):
+        for gram in grams:
+            emails = self._postings.get(gram)
+            if emails is not None:
+                emails.discard(email)
+                if not emails:
+                    del self._postings[gram]
+    
+    def add(self, student):
+        """Index a student's email and names"""
+        self._students[student.email_address] = student
+        self._post(student.email_address, self._grams(self._fields(student)))
+        student.attach(self)
+    
+    def remove(self, student):
+        """Drop a student from the index"""
+        self._students.pop(student.email_address, None)
+        self._unpost(student.email_address, self._grams(self._fields(student)))
+        student.detach(self)
+    
+    def on_renamed(self, student, old_first_name, old_last_name):
+        old = self._grams(self._fields(student, old_first_name, old_last_name))
+        new = self._grams(self._fields(student))
+        self._unpost(student.email_address, old - new)
+        self._post(student.email_address, new - old)
+    
+    def candidates(self, term):
+        """Emails of students containing every trigram of term, None if not selective"""
+        postings = []
+        for gram in trigrams(term):
+            emails = self._postings.get(gram)
+            if not emails:
+                return set()
+            postings.append(emails)
+        
+        postings.sort(key=len)
+        if not postings or len(postings[0]) > self.SCAN_FRACTION * len(self._students):
+            return None
+        
+        result = set(postings[0])
+        for emails in postings[1:]:
+            result &= emails
+            if not result:
+                break
+        return result
+    
+    def search(self, term):
+        """Return students whose email, first or last name contains term"""
+        term = term.lower()
+        emails = self.candidates(term)
+        if emails is None:
+            pool = self._students.values()
+        else:
+            pool = [self._students[email] for email in sorted(emails)]
+        
+        return [student for student in pool
+                if term in student.email_address.lower()
+                or term in student.first_name.lower()
+                or term in student.last_name.lower()]
+    
+    def __len__(self):
+        return len(self._students)
\ No newline at end of file